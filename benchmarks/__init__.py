@@ -0,0 +1,6 @@
+"""
+Performance benchmarks for the linstor client.
+
+These are not unit tests, they do not need a real controller and are not part of the
+test suite. Run them with "python -m benchmarks.<module> --help".
+"""
@@ -0,0 +1,151 @@
+"""
+A local stand-in for the LINSTOR controller REST api.
+
+It answers the list calls the client issues with canned data from benchmarks.fixtures
+and acknowledges every modifying request with a success reply. It only exists to take
+the real controller and network out of client benchmarks.
+"""
+
+import json
+import re
+import threading
+import time
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import parse_qs
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import parse_qs
+
+from benchmarks import fixtures
+
+_ROUTES = [
+    (re.compile(r'^/v1/controller/version$'), 'version'),
+    (re.compile(r'^/v1/controller/properties$'), 'controller-properties'),
+    (re.compile(r'^/v1/nodes$'), 'nodes'),
+    (re.compile(r'^/v1/view/storage-pools$'), 'storage-pools'),
+    (re.compile(r'^/v1/storage-pool-definitions$'), 'storage-pool-definitions'),
+    (re.compile(r'^/v1/resource-definitions$'), 'resource-definitions'),
+    (re.compile(r'^/v1/view/resources$'), 'resources'),
+    (re.compile(r'^/v1/resource-groups$'), 'resource-groups'),
+    (re.compile(r'^/v1/view/snapshots$'), 'snapshots'),
+    (re.compile(r'^/v1/error-reports$'), 'error-reports'),
+]
+
+# views answering the nodes filter of the query, like the controller
+_NODE_FILTERED = {'storage-pools', 'resources'}
+
+_RSC_DFN_SUB = re.compile(r'^/v1/resource-definitions/([^/]+)/(volume-definitions|snapshots)$')
+_VLM_GRP = re.compile(r'^/v1/resource-groups/[^/]+/volume-groups$')
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def handle_error(self, request, client_address):
+        pass  # clients exit without closing their keep-alive connection
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real controller
+    disable_nagle_algorithm = True  # headers and body are written separately
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, data, status=200):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _list_data(self, path, query):
+        data = self.server.data
+        for regex, key in _ROUTES:
+            if regex.match(path):
+                nodes = set(x.lower() for x in query.get('nodes', []))
+                if nodes and key in _NODE_FILTERED:
+                    return [x for x in data[key] if x['node_name'].lower() in nodes]
+                return data[key]
+
+        m = _RSC_DFN_SUB.match(path)
+        if m:
+            rsc_name, sub = m.groups()
+            if sub == 'snapshots':
+                return [x for x in data['snapshots'] if x['resource_name'] == rsc_name]
+            for rsc_dfn in data['resource-definitions']:
+                if rsc_dfn['name'] == rsc_name:
+                    return rsc_dfn['volume_definitions']
+            return []
+        if _VLM_GRP.match(path):
+            return [{"volume_number": 0, "props": {}, "flags": []}]
+        return None
+
+    def do_GET(self):
+        path, _, query = self.path.partition('?')
+        self.server.requests.append(('GET', path))
+        data = self._list_data(path, parse_qs(query))
+        if data is None:
+            self._send_json([{"ret_code": -4611686018427387904, "message": "stand-in: unknown path " + path}], 404)
+        else:
+            self._send_json(data)
+
+    def _acknowledge(self):
+        self.server.requests.append((self.command, self.path))
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        time.sleep(self.server.delay)
+        self._send_json(fixtures.success_reply("stand-in controller: {m} {p} accepted".format(
+            m=self.command, p=self.path)))
+
+    do_POST = _acknowledge
+    do_PUT = _acknowledge
+    do_PATCH = _acknowledge
+    do_DELETE = _acknowledge
+
+
+class StandInController(object):
+    """
+    Serves synthetic controller data on a local port in a background thread.
+
+    Usable as context manager, the uri property is suitable for --controllers. Modifying requests
+    are answered after delay seconds, like a controller waiting for its satellites.
+    """
+    def __init__(self, count=100, node_count=None, host='127.0.0.1', port=0, delay=0):
+        self._server = _ThreadingHTTPServer((host, port), _Handler)
+        self._server.data = fixtures.controller_data(count, node_count)
+        self._server.delay = delay
+        self._server.requests = []  # (method, path) of all requests, for tests
+        self._thread = None
+
+    @property
+    def uri(self):
+        host, port = self._server.server_address[:2]
+        return "linstor://{h}:{p}".format(h=host, p=port)
+
+    @property
+    def requests(self):
+        return self._server.requests
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
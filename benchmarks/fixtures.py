@@ -0,0 +1,185 @@
+"""
+Synthetic controller REST data.
+
+All generators are deterministic, so runs with the same object count are comparable.
+"""
+
+DISK_STATES = ['UpToDate', 'UpToDate', 'UpToDate', 'Diskless', 'Inconsistent', 'DUnknown']
+CONNECTION_STATES = ['ONLINE', 'ONLINE', 'ONLINE', 'OFFLINE', 'CONNECTED']
+
+CONTROLLER_VERSION = {
+    "version": "1.0.1",
+    "git_hash": "0000000000000000000000000000000000000000",
+    "build_time": "2019-01-01T00:00:00+00:00",
+    "rest_api_version": "1.0.9"
+}
+
+
+def node_name(idx):
+    return "node{i:04d}".format(i=idx)
+
+
+def resource_name(idx):
+    return "rsc{i:06d}".format(i=idx)
+
+
+def nodes(count):
+    return [{
+        "name": node_name(i),
+        "type": "SATELLITE",
+        "props": {"CurStltConnName": "default"},
+        "flags": [],
+        "net_interfaces": [{
+            "name": "default",
+            "address": "10.0.{a}.{b}".format(a=i // 250, b=i % 250 + 1),
+            "satellite_port": 3366,
+            "satellite_encryption_type": "PLAIN",
+            "is_active": True
+        }],
+        "connection_status": CONNECTION_STATES[i % len(CONNECTION_STATES)]
+    } for i in range(count)]
+
+
+def storage_pools(node_count):
+    pools = []
+    for i in range(node_count):
+        pools.append({
+            "storage_pool_name": "DfltDisklessStorPool",
+            "node_name": node_name(i),
+            "provider_kind": "DISKLESS",
+            "props": {},
+            "static_traits": {"SupportsSnapshots": "false"},
+            "free_space_mgr_name": node_name(i) + ":DfltDisklessStorPool"
+        })
+        pools.append({
+            "storage_pool_name": "pool",
+            "node_name": node_name(i),
+            "provider_kind": "LVM_THIN",
+            "props": {"StorDriver/LvmVg": "vg", "StorDriver/ThinPool": "thin"},
+            "static_traits": {"SupportsSnapshots": "true"},
+            "free_capacity": 1024 * 1024 * (i + 1),
+            "total_capacity": 1024 * 1024 * 1024,
+            "free_space_mgr_name": node_name(i) + ":pool"
+        })
+    return pools
+
+
+def resource_definitions(count):
+    return [{
+        "name": resource_name(i),
+        "external_name": resource_name(i),
+        "props": {},
+        "flags": ["DELETE"] if i % 97 == 96 else [],
+        "resource_group_name": "DfltRscGrp",
+        "layer_data": [{"type": "DRBD", "data": {"port": 7000 + i % 1000, "secret": "s3cr3t"}}],
+        "volume_definitions": volume_definitions(i)
+    } for i in range(count)]
+
+
+def volume_definitions(rsc_idx):
+    return [{
+        "volume_number": 0,
+        "size_kib": 1024 * 1024,
+        "props": {},
+        "flags": [],
+        "layer_data": [{"type": "DRBD", "data": {"volume_number": 0, "minor_number": 1000 + rsc_idx}}]
+    }]
+
+
+def resources(count, node_count, replicas=3):
+    """
+    Generates `count` resources, each deployed on `replicas` of the given nodes.
+    """
+    rscs = []
+    for i in range(count):
+        for r in range(min(replicas, node_count)):
+            state = DISK_STATES[(i + r) % len(DISK_STATES)]
+            rscs.append({
+                "name": resource_name(i),
+                "node_name": node_name((i + r) % node_count),
+                "props": {},
+                "flags": ["DISKLESS"] if state == 'Diskless' else [],
+                "state": {"in_use": r == 0 and i % 2 == 0},
+                "volumes": [{
+                    "volume_number": 0,
+                    "storage_pool_name": "DfltDisklessStorPool" if state == 'Diskless' else "pool",
+                    "provider_kind": "DISKLESS" if state == 'Diskless' else "LVM_THIN",
+                    "device_path": "/dev/drbd{m}".format(m=1000 + i),
+                    "allocated_size_kib": 0 if state == 'Diskless' else 1024 * (i % 1024 + 1),
+                    "props": {},
+                    "flags": [],
+                    "state": {"disk_state": state},
+                    "layer_data_list": [{
+                        "type": "DRBD",
+                        "data": {
+                            "drbd_volume_definition": {
+                                "volume_number": 0,
+                                "minor_number": 1000 + i,
+                                "resource_name_suffix": ""
+                            },
+                            "device_path": "/dev/drbd{m}".format(m=1000 + i),
+                            "allocated_size_kib": 1024,
+                            "usable_size_kib": 1024
+                        }
+                    }]
+                }]
+            })
+    return rscs
+
+
+def resource_groups(count):
+    return [{
+        "name": "DfltRscGrp" if i == 0 else "rg{i:04d}".format(i=i),
+        "description": "",
+        "props": {},
+        "select_filter": {"place_count": 2, "storage_pool": "pool"}
+    } for i in range(count)]
+
+
+def snapshots(count, node_count):
+    return [{
+        "name": "snap{i:06d}".format(i=i),
+        "resource_name": resource_name(i),
+        "nodes": [node_name(i % node_count)],
+        "props": {},
+        "flags": ["SUCCESSFUL"] if i % 5 else [],
+        "volume_definitions": [{"volume_number": 0, "size_kib": 1024 * 1024}]
+    } for i in range(count)]
+
+
+def error_reports(count, node_count):
+    return [{
+        "node_name": node_name(i % node_count),
+        "error_time": 1546300800000 + i * 1000,
+        "filename": "ErrorReport-5C2B{i:04X}-00000-{i:06d}.log".format(i=i),
+        "module": "CONTROLLER",
+        "text": "ERROR REPORT {i}".format(i=i)
+    } for i in range(count)]
+
+
+def success_reply(message="stand-in controller: request accepted"):
+    return [{"ret_code": 0, "message": message}]
+
+
+def controller_data(count, node_count=None):
+    """
+    Builds the REST answers of a cluster with `count` resources.
+
+    :param int count: number of resources, snapshots and error reports
+    :param int node_count: number of nodes, defaults to a tenth of count
+    :return: dict of REST list name to JSON compatible data
+    :rtype: dict[str, Any]
+    """
+    node_count = node_count or max(3, count // 10)
+    return {
+        "version": CONTROLLER_VERSION,
+        "nodes": nodes(node_count),
+        "storage-pools": storage_pools(node_count),
+        "storage-pool-definitions": [{"storage_pool_name": "DfltDisklessStorPool"}, {"storage_pool_name": "pool"}],
+        "resource-definitions": resource_definitions(count),
+        "resources": resources(count, node_count),
+        "resource-groups": resource_groups(max(1, count // 100)),
+        "snapshots": snapshots(count, node_count),
+        "error-reports": error_reports(count, node_count),
+        "controller-properties": {"DrbdOptions/Net/protocol": "C", "TcpPortAutoRange": "7000-7999"}
+    }
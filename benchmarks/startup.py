@@ -0,0 +1,262 @@
+"""
+Startup and per phase latency benchmark of the linstor client.
+
+Every command runs in a fresh interpreter against a local stand-in controller, the
+way scripts invoke the client. The child process reports the time spent in:
+
+  import     importing linstor_client_main
+  construct  LinStorCLI()
+  parse      LinStorCLI.parse()
+  connect    connecting to the controller
+  dispatch   executing the command function, excluding connect and render
+  render     table and tree output
+  process    wall time of the whole process as seen by the caller
+
+Medians per phase are appended to a JSON history file and compared to the median of
+the previous runs with the same python version and dataset size. A phase that got
+slower than the given thresholds is reported as regression and makes the benchmark
+exit with 1.
+
+usage: python -m benchmarks.startup [--repeat N] [--count N] [--history FILE] [COMMAND ...]
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+timer = getattr(time, 'perf_counter', time.time)
+
+PHASES = ['import', 'construct', 'parse', 'connect', 'dispatch', 'render', 'process']
+
+# (name, argv) of the measured commands, top level commands and their common subcommands
+COMMANDS = [
+    ('list-commands', ['list-commands']),
+    ('help', ['help', 'resource']),
+    ('controller version', ['controller', 'version']),
+    ('controller list-properties', ['controller', 'list-properties']),
+    ('node list', ['node', 'list']),
+    ('node describe', ['node', 'describe', 'node0000']),
+    ('node interface list', ['node', 'interface', 'list', 'node0000']),
+    ('node list-properties', ['node', 'list-properties', 'node0000']),
+    ('resource list', ['resource', 'list']),
+    ('resource list-volumes', ['resource', 'list-volumes']),
+    ('resource delete', ['resource', 'delete', 'node0000', 'rsc000000']),
+    ('resource-definition list', ['resource-definition', 'list']),
+    ('resource-definition drbd-options', ['resource-definition', 'drbd-options', '--protocol', 'C', 'rsc000000']),
+    ('resource-group list', ['resource-group', 'list']),
+    ('volume-group list', ['volume-group', 'list', 'DfltRscGrp']),
+    ('volume list', ['volume', 'list']),
+    ('volume-definition list', ['volume-definition', 'list']),
+    ('storage-pool list', ['storage-pool', 'list']),
+    ('storage-pool-definition list', ['storage-pool-definition', 'list']),
+    ('snapshot list', ['snapshot', 'list']),
+    ('error-reports list', ['error-reports', 'list']),
+]
+
+
+def _child(result_path, argv):
+    """
+    Runs a single client invocation and writes the phase timings to result_path.
+    """
+    results = dict((phase, 0.0) for phase in PHASES)
+
+    start = timer()
+    import linstor_client_main
+    results['import'] = timer() - start
+
+    import linstor
+    import linstor_client
+    from linstor_client.tree import TreeNode
+
+    def timed(phase, func):
+        def wrapper(*args, **kwargs):
+            t = timer()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                results[phase] += timer() - t
+        return wrapper
+
+    linstor.Linstor.connect = timed('connect', linstor.Linstor.connect)
+    linstor_client.Table.show = timed('render', linstor_client.Table.show)
+    TreeNode.print_node = timed('render', TreeNode.print_node)
+
+    t = timer()
+    cli = linstor_client_main.LinStorCLI()
+    results['construct'] = timer() - t
+
+    cli.parse = timed('parse', cli.parse)
+
+    rc = None
+    t = timer()
+    try:
+        rc = cli.parse_and_execute(argv)
+    except SystemExit as se:  # help output
+        rc = se.code
+    results['dispatch'] = timer() - t - results['parse'] - results['connect'] - results['render']
+    results['rc'] = rc
+
+    with open(result_path, 'w') as result_file:
+        json.dump(results, result_file)
+
+
+def run_command(argv, controller_uri):
+    """
+    Runs the client in a new interpreter and returns its phase timings in seconds.
+    """
+    fd, result_path = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    try:
+        cmd = [sys.executable, '-m', 'benchmarks.startup', '--child', result_path, '--',
+               '--disable-config', '--no-color', '--controllers', controller_uri] + argv
+        with open(os.devnull, 'w') as devnull:
+            t = timer()
+            subprocess.call(cmd, stdout=devnull, stderr=devnull)
+            process = timer() - t
+        with open(result_path) as result_file:
+            results = json.load(result_file)
+        results['process'] = process
+        return results
+    except ValueError:
+        raise RuntimeError("benchmark child failed: " + " ".join(cmd))
+    finally:
+        os.remove(result_path)
+
+
+def _median(values):
+    values = sorted(values)
+    mid = len(values) // 2
+    return values[mid] if len(values) % 2 else (values[mid - 1] + values[mid]) / 2.0
+
+
+def measure(commands, controller_uri, repeat):
+    """
+    :return: dict of command name to dict of phase to median milliseconds
+    :rtype: dict[str, dict[str, float]]
+    """
+    measured = {}
+    for name, argv in commands:
+        runs = [run_command(argv, controller_uri) for _ in range(repeat)]
+        if any(run['rc'] not in (0, None) for run in runs):
+            sys.stderr.write("warning: '{c}' returned {rc}\n".format(c=name, rc=runs[0]['rc']))
+        measured[name] = dict((phase, round(_median([run[phase] for run in runs]) * 1000.0, 3)) for phase in PHASES)
+    return measured
+
+
+def load_history(path):
+    try:
+        with open(path) as history_file:
+            return json.load(history_file)
+    except (IOError, OSError):
+        return {'runs': []}
+
+
+def save_history(path, history):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as history_file:
+        json.dump(history, history_file, indent=2, sort_keys=True)
+    os.rename(tmp_path, path)
+
+
+def baseline(history, python_version, count, window):
+    """
+    Median per command and phase over the last `window` comparable runs.
+    """
+    runs = [run for run in history['runs'] if run['python'] == python_version and run['count'] == count][-window:]
+    base = {}
+    for run in runs:
+        for cmd, phases in run['results'].items():
+            for phase, value in phases.items():
+                base.setdefault(cmd, {}).setdefault(phase, []).append(value)
+    return dict((cmd, dict((phase, _median(vals)) for phase, vals in phases.items())) for cmd, phases in base.items())
+
+
+def find_regressions(measured, base, threshold, min_delta):
+    """
+    :return: list of (command, phase, baseline ms, measured ms)
+    """
+    regressions = []
+    for cmd, phases in sorted(measured.items()):
+        for phase in PHASES:
+            old = base.get(cmd, {}).get(phase)
+            new = phases[phase]
+            if old is not None and new > old * (1.0 + threshold) and new - old > min_delta:
+                regressions.append((cmd, phase, old, new))
+    return regressions
+
+
+def print_results(measured, base):
+    name_width = max(len(cmd) for cmd in measured)
+    print(" ".join([" " * name_width] + ["{p:>10}".format(p=p) for p in PHASES]))
+    for cmd in sorted(measured):
+        cells = []
+        for phase in PHASES:
+            cells.append("{v:10.1f}".format(v=measured[cmd][phase]))
+        print(" ".join([cmd.ljust(name_width)] + cells))
+        if cmd in base:
+            print(" ".join(["  baseline".ljust(name_width)] +
+                           ["{v:10.1f}".format(v=base[cmd].get(p, 0.0)) for p in PHASES]))
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == '--child':
+        return _child(argv[1], argv[3:])
+
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.startup', description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeat', '-r', type=int, default=5, help='Runs per command, the median is recorded')
+    parser.add_argument('--count', '-c', type=int, default=100, help='Number of resources of the stand-in cluster')
+    parser.add_argument('--history', default='benchmark-startup.json', help='JSON history file')
+    parser.add_argument('--window', type=int, default=5, help='Number of previous runs forming the baseline')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Relative slowdown of a phase that counts as regression (default: 0.2)')
+    parser.add_argument('--min-delta', type=float, default=2.0,
+                        help='Absolute slowdown in ms a regression must exceed (default: 2.0)')
+    parser.add_argument('--no-save', action='store_true', help='Do not append this run to the history')
+    parser.add_argument('commands', nargs='*', metavar='COMMAND',
+                        help='Only run the named commands, e.g. "node list"')
+    args = parser.parse_args(argv)
+
+    commands = [(name, cmd) for name, cmd in COMMANDS if not args.commands or name in args.commands]
+    if not commands:
+        parser.error("no such command, choose from: " + ", ".join(name for name, _ in COMMANDS))
+
+    from benchmarks.controller import StandInController
+    from linstor_client.consts import VERSION, GITHASH
+
+    with StandInController(args.count) as controller:
+        measured = measure(commands, controller.uri, args.repeat)
+
+    python_version = platform.python_version()
+    history = load_history(args.history)
+    base = baseline(history, python_version, args.count, args.window)
+    print_results(measured, base)
+
+    regressions = find_regressions(measured, base, args.threshold, args.min_delta)
+    for cmd, phase, old, new in regressions:
+        print("REGRESSION: {c} {p}: {o:.1f}ms -> {n:.1f}ms".format(c=cmd, p=phase, o=old, n=new))
+
+    if not args.no_save:
+        history['runs'].append({
+            'timestamp': int(time.time()),
+            'version': VERSION,
+            'githash': GITHASH,
+            'python': python_version,
+            'count': args.count,
+            'repeat': args.repeat,
+            'results': measured
+        })
+        save_history(args.history, history)
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,296 @@
+"""
+Rendering benchmark of tables, trees and the output functions of the list commands.
+
+Every case runs in-process on synthetic data of each given size, with the output going
+to a sink instead of a terminal. Three groups of cases are measured:
+
+  table      Table.show() of rows like the ones of resource list, plain, grouped by two
+             columns with separators and with multi line cells (the _row_expand path)
+  tree       TreeNode.print_node() of a two level tree like the one of node describe
+  command    the output function of each list command, usually its show() classmethod,
+             given the responses of a local stand-in controller; the list call itself is
+             issued before the measurement, calls made by the output function are part of it
+
+Each case runs with colors on and off and with utf8 and ascii frames. Note that tables
+only draw utf8 frames if the locale is UTF-8.
+
+The median time of the runs is reported, the time spent in Table.show() and
+TreeNode.print_node() separately as render. The peak of memory allocated during one more
+run is measured with tracemalloc, which is not available on python 2.
+
+usage: python -m benchmarks.tables [--repeat N] [--sizes N,N,..] [CASE ...]
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import sys
+import time
+
+timer = getattr(time, 'perf_counter', time.time)
+
+SIZES = [1000, 10000, 100000]
+
+# (name, argv) of the list commands whose output function is measured
+COMMANDS = [
+    ('node list', ['node', 'list']),
+    ('resource list', ['resource', 'list']),
+    ('resource list -g', ['resource', 'list', '-g', 'Node', 'State']),
+    ('resource list-volumes', ['resource', 'list-volumes']),
+    ('volume list', ['volume', 'list']),
+    ('storage-pool list', ['storage-pool', 'list']),
+    ('storage-pool-definition list', ['storage-pool-definition', 'list']),
+    ('resource-definition list', ['resource-definition', 'list']),
+    ('resource-group list', ['resource-group', 'list']),
+    ('volume-definition list', ['volume-definition', 'list']),
+    ('snapshot list', ['snapshot', 'list']),
+    ('error-reports list', ['error-reports', 'list']),
+]
+
+TABLE_LAYOUTS = ['plain', 'group-by', 'multi-line']
+
+# (name, colors, utf8)
+STYLES = [
+    ('color utf8', True, True),
+    ('color ascii', True, False),
+    ('no-color utf8', False, True),
+    ('no-color ascii', False, False),
+]
+
+
+class _Sink(object):
+    """
+    Stands in for stdout, discards the output.
+    """
+    def write(self, data):
+        pass
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+
+class _RenderTimer(object):
+    """
+    Accumulates the time spent in Table.show() and TreeNode.print_node().
+    """
+    def __init__(self):
+        self.elapsed = 0.0
+
+    def wrap(self, func):
+        def wrapper(*args, **kwargs):
+            t = timer()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.elapsed += timer() - t
+        return wrapper
+
+
+def table_case(size, layout, colors, utf8):
+    """
+    :return: function rendering a table of `size` rows
+    """
+    from linstor_client import Table, TableHeader
+    from linstor_client.consts import Color
+    from benchmarks import fixtures
+
+    states = [(x, Color.DARKGREEN if x == 'UpToDate' else Color.RED) for x in fixtures.DISK_STATES]
+    rows = []
+    for i in range(size):
+        usage = "InUse" if i % 2 == 0 else "Unused"
+        if layout == 'multi-line' and i % 10 == 0:
+            usage += "\nsince " + str(i)
+        rows.append([fixtures.resource_name(i // 3), fixtures.node_name(i % 97), str(7000 + i % 1000), usage,
+                     states[i % len(states)]])
+
+    def run():
+        tbl = Table(colors=colors, utf8=utf8)
+        tbl.add_header(TableHeader("ResourceName"))
+        tbl.add_header(TableHeader("Node"))
+        tbl.add_header(TableHeader("Port"))
+        tbl.add_header(TableHeader("Usage", Color.DARKGREEN))
+        tbl.add_header(TableHeader("State", Color.DARKGREEN, alignment_text=TableHeader.ALIGN_RIGHT))
+        for name, node, port, usage, (state, color) in rows:
+            tbl.add_row([name, node, port, usage, tbl.color_cell(state, color)])
+        if layout == 'group-by':
+            tbl.set_groupby(["Node", "ResourceName"])
+            tbl.set_show_separators(True)
+        tbl.show()
+    return run
+
+
+def tree_case(size, colors, utf8):
+    """
+    :return: function printing a tree of `size` leaves, ten per inner node
+    """
+    from linstor_client.consts import Color
+    from linstor_client.tree import TreeNode
+    from benchmarks import fixtures
+
+    root = TreeNode('cluster', 'root', Color.RED)
+    for i in range(0, size, 10):
+        node = TreeNode(fixtures.node_name(i // 10), 'node', Color.RED)
+        for j in range(i, min(i + 10, size)):
+            node.add_child(TreeNode(fixtures.resource_name(j), 'resource', Color.BLUE))
+        root.add_child(node)
+
+    def run():
+        root.print_node(not utf8, not colors)
+    return run
+
+
+def command_case(controller_uri, argv, colors, utf8):
+    """
+    Issues the list call of a command and captures its output function instead of running it.
+
+    :return: function running the output function of the command
+    """
+    import linstor_client_main
+    from linstor_client.commands import Commands
+    from linstor_client.consts import ExitCode
+
+    captured = []
+
+    def capture(cls, args, replies, output_func, single_item=True):
+        captured.append((output_func, args, replies[0] if single_item else replies))
+        return ExitCode.OK
+
+    flags = ([] if colors else ['--no-color']) + ([] if utf8 else ['--no-utf8'])
+    original = Commands.__dict__['output_list']
+    Commands.output_list = classmethod(capture)
+    try:
+        cli = linstor_client_main.LinStorCLI()
+        # interactive keeps the connection for the calls of the output function
+        rc = cli.parse_and_execute(['--disable-config', '--controllers', controller_uri] + flags + argv,
+                                   is_interactive=True)
+    finally:
+        Commands.output_list = original
+    if rc != ExitCode.OK or not captured:
+        raise RuntimeError("list call failed: " + " ".join(argv))
+    output_func, args, payload = captured[0]
+
+    def run():
+        output_func(args, payload)
+    return run
+
+
+def measure(func, repeat, render_timer):
+    """
+    :return: median total and render milliseconds, peak KiB allocated or None
+    :rtype: (float, float, float)
+    """
+    totals = []
+    renders = []
+    stdout = sys.stdout
+    try:
+        for _ in range(repeat):
+            sys.stdout = _Sink()
+            render_timer.elapsed = 0.0
+            t = timer()
+            func()
+            totals.append(timer() - t)
+            renders.append(render_timer.elapsed)
+
+        peak = None
+        try:
+            import tracemalloc
+        except ImportError:
+            tracemalloc = None
+        if tracemalloc is not None:
+            sys.stdout = _Sink()
+            tracemalloc.start()
+            try:
+                func()
+                peak = tracemalloc.get_traced_memory()[1] / 1024.0
+            finally:
+                tracemalloc.stop()
+    finally:
+        sys.stdout = stdout
+    return _median(totals) * 1000.0, _median(renders) * 1000.0, peak
+
+
+def _median(values):
+    values = sorted(values)
+    mid = len(values) // 2
+    return values[mid] if len(values) % 2 else (values[mid - 1] + values[mid]) / 2.0
+
+
+def cases(size, controller_uri):
+    """
+    :return: (name, function returning the run function) of all cases of a size
+    :rtype: list[(str, function)]
+    """
+    result = []
+    for style, colors, utf8 in STYLES:
+        for layout in TABLE_LAYOUTS:
+            result.append(('table ' + layout + ' ' + style,
+                           lambda layout=layout, colors=colors, utf8=utf8: table_case(size, layout, colors, utf8)))
+        result.append(('tree ' + style, lambda colors=colors, utf8=utf8: tree_case(size, colors, utf8)))
+    for name, argv in COMMANDS:
+        for style, colors, utf8 in [STYLES[0], STYLES[-1]]:
+            result.append((
+                'command ' + name + ' ' + style,
+                lambda argv=argv, colors=colors, utf8=utf8: command_case(controller_uri, argv, colors, utf8)
+            ))
+    return result
+
+
+def print_result(name, size, total, render, peak, name_width):
+    print("{n} {s:>7} {t:10.1f} {r:10.1f} {p:>10}".format(
+        n=name.ljust(name_width), s=size, t=total, r=render,
+        p='-' if peak is None else "{p:.0f}".format(p=peak)))
+    sys.stdout.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.tables', description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeat', '-r', type=int, default=3, help='Runs per case, the median is reported')
+    parser.add_argument('--sizes', default=','.join(str(x) for x in SIZES),
+                        help='Comma separated numbers of rows, tree leaves and resources (default: %(default)s)')
+    parser.add_argument('cases', nargs='*', metavar='CASE',
+                        help='Only run the cases whose name contains one of these, e.g. "group-by" or "command"')
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    sizes = [int(x) for x in args.sizes.split(',') if x]
+
+    import linstor_client
+    from linstor_client.tree import TreeNode
+    from benchmarks.controller import StandInController
+
+    os.environ.setdefault('COLUMNS', '110')  # same table width on every terminal
+    os.environ.setdefault('LINES', '50')
+    render_timer = _RenderTimer()
+    linstor_client.Table.show = render_timer.wrap(linstor_client.Table.show)
+    TreeNode.print_node = render_timer.wrap(TreeNode.print_node)
+
+    name_width = max(len(name) for name, _ in cases(0, None))
+    print("{n} {s:>7} {t:>10} {r:>10} {p:>10}".format(
+        n='case'.ljust(name_width), s='size', t='ms', r='render ms', p='peak KiB'))
+    for size in sizes:
+        names = [name for name, _ in cases(size, None) if not args.cases or any(x in name for x in args.cases)]
+        controller = None
+        if any(name.startswith('command ') for name in names):
+            controller = StandInController(size)
+            controller.start()
+        try:
+            for name, setup in cases(size, controller.uri if controller else None):
+                if name not in names:
+                    continue
+                try:
+                    func = setup()
+                except Exception as e:  # e.g. commands unsupported by the installed python-linstor
+                    sys.stderr.write("warning: '{c}' skipped: {e!r}\n".format(c=name, e=e))
+                    continue
+                total, render, peak = measure(func, args.repeat, render_timer)
+                print_result(name, size, total, render, peak, name_width)
+        finally:
+            if controller is not None:
+                controller.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
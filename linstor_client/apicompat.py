@@ -0,0 +1,81 @@
+"""
+Access to internals of python-linstor that its public api does not offer.
+
+Everything the client needs beyond the public linstor.Linstor api goes through this module,
+so a change of python-linstor only has to be followed here. Checked against python-linstor 1.6.0,
+where a Linstor object keeps its timeout in `_timeout`, its http(s) connection in `_rest_conn` and
+the state set by Linstor.connect() in `_ctrl_version` and `_connected`. The standard library keeps
+the SSL context of a HTTPSConnection in `_context` (Python 2.7.9 and later, all Python 3 versions).
+"""
+
+
+def set_timeout(api, timeout):
+    """
+    Changes the socket timeout of a client, also of its already open connection.
+
+    Linstor only takes the timeout in its constructor, a client connected with a short connect timeout
+    keeps it for all later requests otherwise.
+
+    :param linstor.Linstor api: connected or not yet connected client
+    :param float timeout: socket timeout in seconds
+    """
+    api._timeout = timeout
+    rest_conn = getattr(api, '_rest_conn', None)
+    if rest_conn is not None:
+        rest_conn.timeout = timeout
+        if rest_conn.sock is not None:
+            rest_conn.sock.settimeout(timeout)
+
+
+def rest_connection(api):
+    """
+    :param linstor.Linstor api: client
+    :return: the http(s) connection of the client, None if it never connected
+    :rtype: HTTPConnection
+    """
+    return getattr(api, '_rest_conn', None)
+
+
+def ssl_context(rest_conn):
+    """
+    :param HTTPConnection rest_conn: connection of a client, see rest_connection()
+    :return: the SSL context the https connection was created with, None if it is no https connection
+        or the context is not available
+    :rtype: ssl.SSLContext
+    """
+    return getattr(rest_conn, '_context', None)
+
+
+def connect_through(api, rest_conn):
+    """
+    Connects a client like Linstor.connect() does, but through the given not yet connected http(s)
+    connection instead of one Linstor.connect() creates itself, e.g. one resuming a TLS session.
+    The controller version is checked the same way.
+
+    :param linstor.Linstor api: not yet connected client
+    :param HTTPConnection rest_conn: connection to the controller of api
+    """
+    import socket
+    import linstor
+    from linstor.linstorapi import API_VERSION_MIN
+
+    api._rest_conn = rest_conn
+    try:
+        rest_conn.connect()
+        ctrl_version = api.controller_version()
+    except socket.error as err:
+        raise linstor.LinstorNetworkError(
+            "Unable to connect to {hp}: {err}".format(hp=api.controller_host(), err=err))
+    if not ctrl_version.rest_api_version.startswith("1") or \
+            _version_tuple(API_VERSION_MIN) > _version_tuple(ctrl_version.rest_api_version):
+        rest_conn.close()
+        raise linstor.LinstorApiCallError(
+            "Client doesn't support Controller rest api version: " + ctrl_version.rest_api_version +
+            "; Minimal version needed: " + API_VERSION_MIN
+        )
+    api._ctrl_version = ctrl_version
+    api._connected = True
+
+
+def _version_tuple(version):
+    return tuple(int(x) if x.isdigit() else 0 for x in version.split('.'))
@@ -0,0 +1,180 @@
+"""
+Batch execution of linstor command lines, see linstor --batch.
+
+Every line is executed by LinStorCLI.parse_and_execute(is_interactive=True), so all lines share
+the connection of the client. With more than one job, every worker thread uses its own client
+and connection, the output of the lines is collected and printed in the order of the file.
+"""
+
+from __future__ import print_function
+
+import json
+import shlex
+import sys
+import threading
+
+from linstor_client.consts import ExitCode
+from linstor_client.utils import LinstorClientError
+
+
+def parse_lines(lines):
+    """
+    Splits the lines of a batch file into commands, empty lines and comments are skipped.
+
+    :param list[str] lines: lines of the batch file
+    :return: list of (line number, command line, argv)
+    :rtype: list[tuple[int, str, list[str]]]
+    """
+    commands = []
+    for lineno, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        try:
+            argv = shlex.split(line)
+        except ValueError as err:
+            raise LinstorClientError("Line {n}: {err}".format(n=lineno, err=err), ExitCode.ARGPARSE_ERROR)
+        # remove linstor if cmd started with it, like interactive mode
+        if argv[0] == 'linstor':
+            argv = argv[1:]
+        commands.append((lineno, line, argv))
+    return commands
+
+
+class ThreadOutput(object):
+    """
+    Replaces sys.stdout/sys.stderr while batch jobs run, writes of capturing threads go to their own buffer.
+    """
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+
+    def capture(self):
+        self._local.buffer = []
+
+    def release(self):
+        data = ''.join(self._local.buffer)
+        self._local.buffer = None
+        return data
+
+    def write(self, data):
+        buf = getattr(self._local, 'buffer', None)
+        if buf is None:
+            self._stream.write(data)
+        else:
+            buf.append(data)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class BatchRunner(object):
+    def __init__(self, cli, global_pargs, jobs=1, machine_readable=False):
+        """
+        :param LinStorCLI cli: client executing the lines, used by the first job
+        :param list[str] global_pargs: global options prepended to every line
+        :param int jobs: number of lines executed concurrently
+        :param bool machine_readable: report every line as json object
+        """
+        if jobs < 1:
+            raise LinstorClientError("Error: --jobs has to be at least 1", ExitCode.ARGPARSE_ERROR)
+        self._cli = cli
+        self._global_pargs = global_pargs
+        self._jobs = jobs
+        self._machine_readable = machine_readable
+
+    def run(self, lines):
+        """
+        Executes the lines and reports their output and exit code.
+
+        :param list[str] lines: lines of the batch file
+        :return: exit code of the first failed line, ExitCode.OK if all succeeded
+        :rtype: int
+        """
+        commands = parse_lines(lines)
+        if self._jobs == 1 and not self._machine_readable:
+            rcs = self._run_sequential(commands)
+        else:
+            rcs = self._run_captured(commands)
+        return next((rc for rc in rcs if rc != ExitCode.OK), ExitCode.OK)
+
+    def _execute(self, cli, argv):
+        try:
+            rc = cli.parse_and_execute(self._global_pargs + argv, is_interactive=True)
+        except SystemExit as se:  # argparse errors and help
+            rc = se.code if isinstance(se.code, int) or se.code is None else ExitCode.UNKNOWN_ERROR
+        except Exception as exc:
+            sys.stderr.write("Error: {exc}\n".format(exc=exc))
+            rc = ExitCode.UNKNOWN_ERROR
+        return rc or ExitCode.OK
+
+    def _run_sequential(self, commands):
+        rcs = []
+        for lineno, line, argv in commands:
+            print("[{n}] {cmd}".format(n=lineno, cmd=line))
+            sys.stdout.flush()
+            rc = self._execute(self._cli, argv)
+            sys.stderr.flush()
+            print("[{n}] exit code {rc}".format(n=lineno, rc=rc))
+            rcs.append(rc)
+        return rcs
+
+    def _report(self, command, rc, stdout, stderr):
+        lineno, line, _ = command
+        if self._machine_readable:
+            print(json.dumps({'line': lineno, 'command': line, 'exit_code': rc, 'stdout': stdout, 'stderr': stderr}))
+        else:
+            print("[{n}] {cmd}".format(n=lineno, cmd=line))
+            sys.stdout.write(stdout)
+            sys.stdout.flush()
+            sys.stderr.write(stderr)
+            sys.stderr.flush()
+            print("[{n}] exit code {rc}".format(n=lineno, rc=rc))
+        sys.stdout.flush()
+
+    def _run_captured(self, commands):
+        results = [None] * len(commands)
+        finished = [threading.Event() for _ in commands]
+        next_index = [0]
+        lock = threading.Lock()
+        stdout, stderr = ThreadOutput(sys.stdout), ThreadOutput(sys.stderr)
+
+        def worker(cli):
+            while True:
+                with lock:
+                    idx = next_index[0]
+                    next_index[0] += 1
+                if idx >= len(commands):
+                    break
+                stdout.capture()
+                stderr.capture()
+                rc = self._execute(cli, commands[idx][2])
+                results[idx] = (rc, stdout.release(), stderr.release())
+                finished[idx].set()
+            if cli is not self._cli:
+                cli.disconnect()
+
+        workers = []
+        for job in range(min(self._jobs, len(commands))):
+            if job == 0:
+                cli = self._cli
+            else:
+                cli = self._cli.__class__(keep_alive=True)
+                cli.share_cache(self._cli)
+            thread = threading.Thread(target=worker, args=(cli,))
+            thread.daemon = True
+            workers.append(thread)
+
+        sys.stdout, sys.stderr = stdout, stderr
+        try:
+            for thread in workers:
+                thread.start()
+            for idx, command in enumerate(commands):
+                while not finished[idx].wait(1.0):  # a timeout keeps ctrl-c working on python2
+                    pass
+                self._report(command, *results[idx])
+        finally:
+            sys.stdout, sys.stderr = stdout._stream, stderr._stream
+        for thread in workers:
+            thread.join()
+        return [result[0] for result in results]
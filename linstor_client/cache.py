@@ -0,0 +1,166 @@
+"""
+Controller responses cached for the lifetime of an interactive or batch session.
+
+List calls are answered from the cache if the same call with the same filters was issued before.
+Every other call of the api is treated as a modification: it drops the cached lists of the object
+types it may change, e.g. creating a resource drops the resource, volume and storage pool lists.
+Calls of unknown type drop the whole cache.
+"""
+
+import threading
+
+# cached list calls and the object types their answer depends on
+READ_CALLS = {
+    'node_list': {'node'},
+    'node_list_raise': {'node'},
+    'net_interface_list': {'node'},
+    'storage_pool_list': {'storage_pool'},
+    'storage_pool_list_raise': {'storage_pool'},
+    'storage_pool_dfn_list': {'storage_pool_dfn'},
+    'resource_dfn_list': {'resource_dfn', 'volume_dfn'},
+    'resource_dfn_list_raise': {'resource_dfn', 'volume_dfn'},
+    'resource_group_list_raise': {'resource_group'},
+    'volume_group_list_raise': {'volume_group'},
+    'resource_list': {'resource'},
+    'resource_list_raise': {'resource'},
+    'volume_list': {'resource', 'volume'},
+    'volume_list_raise': {'resource', 'volume'},
+    'resource_conn_list': {'resource_conn'},
+    'resource_conn_list_raise': {'resource_conn'},
+    'snapshot_dfn_list': {'snapshot'},
+    'snapshot_dfn_list_raise': {'snapshot'},
+    'controller_props': {'controller'},
+}
+
+# calls that neither read cached data nor modify anything
+NEUTRAL_CALLS = {
+    'connect', 'disconnect', 'connected', 'controller_host', 'controller_version', 'controller_info',
+    'api_version_smaller', 'filter_api_call_response', 'filter_api_call_response_errors',
+    'all_api_responses_no_error', 'all_api_responses_success', 'return_if_error', 'return_if_failure',
+    'parse_volume_size_to_kib', 'has_linstor_https', 'is_secure_connection', 'node_types', 'error_report_list',
+    'space_reporting_query', 'storage_pool_dfn_max_vlm_sizes', 'resource_group_qmvs', 'physical_storage_list',
+    'layer_list', 'provider_list', 'stats'
+}
+
+# modifying calls by name prefix, first match wins, and the object types they change
+MODIFYING_PREFIXES = [
+    ('node_', {'node', 'storage_pool', 'resource', 'volume', 'resource_conn', 'snapshot'}),
+    ('netinterface_', {'node'}),
+    ('storage_pool_dfn_', {'storage_pool_dfn', 'storage_pool'}),
+    ('storage_pool_', {'storage_pool'}),
+    ('resource_dfn_', {'resource_dfn', 'volume_dfn', 'resource', 'volume', 'resource_conn', 'snapshot',
+                       'storage_pool'}),
+    ('resource_group_', {'resource_group', 'volume_group', 'resource_dfn', 'volume_dfn', 'resource', 'volume',
+                         'storage_pool'}),
+    ('resource_conn_', {'resource_conn'}),
+    ('resource_', {'resource', 'volume', 'resource_dfn', 'storage_pool'}),
+    ('volume_dfn_', {'volume_dfn', 'resource_dfn', 'resource', 'volume', 'storage_pool'}),
+    ('volume_group_', {'volume_group'}),
+    ('volume_', {'resource', 'volume'}),
+    ('snapshot_', {'snapshot', 'resource_dfn', 'volume_dfn', 'resource', 'volume', 'storage_pool'}),
+    ('controller_', {'controller'}),
+    ('drbd_proxy_', {'resource_conn'}),
+]
+
+
+def modified_types(call):
+    """
+    :param str call: name of an api call
+    :return: the object types the call may modify, None if unknown
+    :rtype: set[str]
+    """
+    for prefix, types in MODIFYING_PREFIXES:
+        if call.startswith(prefix):
+            return types
+    return None
+
+
+class ResponseCache(object):
+    """
+    Answers of the list calls, shared by all clients of a session, see CachedApi.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}  # (call, arguments) -> answer
+        self._generation = 0  # changes on every invalidation, answers fetched meanwhile are not stored
+
+    def call(self, name, func, args, kwargs):
+        """
+        Returns the cached answer of a list call, or issues the call and caches its answer.
+
+        :param str name: name of the api call, a key of READ_CALLS
+        :param func: the api call
+        :return: the answer of the call
+        """
+        import linstor
+        key = (name, repr((args, sorted(kwargs.items()))))
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key]
+            generation = self._generation
+
+        answer = func(*args, **kwargs)
+        if isinstance(answer, list) and answer and isinstance(answer[0], linstor.ApiCallResponse):
+            return answer  # errors are not cached
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = answer
+        return answer
+
+    def invalidate(self, call):
+        """
+        Drops the cached answers a call may have changed.
+
+        :param str call: name of the issued api call
+        """
+        types = modified_types(call)
+        with self._lock:
+            self._generation += 1
+            if types is None:
+                self._entries = {}
+            else:
+                self._entries = dict((k, v) for k, v in self._entries.items() if not READ_CALLS[k[0]] & types)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class CachedApi(object):
+    """
+    Wraps a linstor.Linstor, list calls are answered by the cache, all others invalidate it.
+    """
+    def __init__(self, api, cache):
+        """
+        :param linstor.Linstor api: connected client
+        :param ResponseCache cache: cache of the session
+        """
+        self._api = api
+        self._cache = cache
+
+    @property
+    def uncached(self):
+        """
+        :return: the wrapped client
+        :rtype: linstor.Linstor
+        """
+        return self._api
+
+    def __getattr__(self, name):
+        attr = getattr(self._api, name)
+        if name in READ_CALLS:
+            def cached_call(*args, **kwargs):
+                return self._cache.call(name, attr, args, kwargs)
+            return cached_call
+        if callable(attr) and name not in NEUTRAL_CALLS and not name.startswith('_'):
+            def modifying_call(*args, **kwargs):
+                try:
+                    return attr(*args, **kwargs)
+                finally:
+                    self._cache.invalidate(name)
+            return modifying_call
+        return attr
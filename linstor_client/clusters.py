@@ -0,0 +1,218 @@
+"""
+Fan-out of list commands to several clusters, see linstor --clusters.
+
+A cluster profile is a section of the client config file named cluster.<name>, its entries are global
+options like in the global section, e.g.:
+
+    [cluster.prod]
+    controllers=ctrl-a,ctrl-b
+
+Every cluster is queried by its own client in a thread. The tables and machine readable output of the
+command are collected instead of printed and merged into one table, or JSON document, with the cluster
+name as additional column.
+"""
+
+from __future__ import print_function
+
+import json
+import sys
+import threading
+
+from linstor_client.batch import ThreadOutput
+from linstor_client.consts import ExitCode
+from linstor_client.table import Table, TableHeader
+from linstor_client.utils import LinstorClientError, config_section
+
+# command functions that only list data and therefore may run on several clusters
+LIST_COMMANDS = [
+    'list', 'list_volumes', 'list_netinterfaces', 'path_list', 'print_props', 'query_max_volume_size',
+    'cmd_list_error_reports', 'cmd_print_controller_props'
+]
+
+CLUSTER_COLUMN = 'Cluster'
+
+_local = threading.local()
+
+
+class _Collector(object):
+    def __init__(self):
+        self.tables = []  # list[Table]
+        self.data = []  # machine readable output, list of lists
+
+
+def collector():
+    """
+    :return: the collector of the current thread if it runs a command for --clusters, otherwise None
+    :rtype: _Collector
+    """
+    return getattr(_local, 'collector', None)
+
+
+def profile_arguments(name):
+    """
+    :param str name: cluster name
+    :return: the global options of the cluster profile as command line arguments
+    :rtype: list[str]
+    """
+    entries = config_section('cluster.' + name)
+    if not entries:
+        raise LinstorClientError(
+            "Error: no section [cluster.{n}] found in the config file".format(n=name), ExitCode.ARGPARSE_ERROR)
+    pargs = []
+    for key, val in entries.items():
+        pargs.append("--" + key)
+        if val:
+            pargs.append(val)
+    return pargs
+
+
+def _with_cluster(item, name):
+    if isinstance(item, dict):
+        item = dict(item)
+        item['cluster'] = name
+    return item
+
+
+def merge_data(outputs):
+    """
+    Merges the machine readable output of several clusters, list entries get a 'cluster' key.
+
+    :param list[(str, list)] outputs: cluster name and its output
+    :return: the merged output
+    :rtype: list
+    """
+    merged = []
+    for name, data in outputs:
+        for idx, entry in enumerate(data):
+            if isinstance(entry, list):
+                entry = [_with_cluster(x, name) for x in entry]
+            elif isinstance(entry, dict):
+                entry = dict((k, [_with_cluster(x, name) for x in v] if isinstance(v, list) else v)
+                             for k, v in entry.items())
+
+            if idx >= len(merged):
+                merged.append(entry)
+            elif isinstance(entry, list) and isinstance(merged[idx], list):
+                merged[idx] += entry
+            elif isinstance(entry, dict) and isinstance(merged[idx], dict):
+                for key, value in entry.items():
+                    if isinstance(value, list) and isinstance(merged[idx].get(key), list):
+                        merged[idx][key] += value
+                    else:
+                        merged[idx].setdefault(key, value)
+    return merged
+
+
+def merge_tables(tables):
+    """
+    Merges the tables of several clusters into one with the cluster as first column.
+
+    :param list[(str, Table)] tables: cluster name and its table, all of the same command
+    :return: the merged table
+    :rtype: Table
+    """
+    for _, table in tables:
+        table.project_header()  # tables without rows still have all columns
+    first = tables[0][1]
+    merged = Table(colors=first.colors, utf8=first.utf8)
+    merged.maxwidth = first.maxwidth
+    merged.add_header(TableHeader(CLUSTER_COLUMN))
+    merged.header += [dict(h) for h in first.header]
+    merged.r_just = first.r_just
+    merged.got_row = True
+    merged.groups = list(first.groups)
+    merged.sortby = list(first.sortby)
+    merged.set_window(first.offset, first.limit, first.page)
+    merged.showseps = first.showseps
+    merged.view = [CLUSTER_COLUMN] + first.view if first.view else None
+    names = [h['name'] for h in first.header]
+
+    for cluster, table in tables:
+        columns = [h['name'] for h in table.header]
+        overrides = iter(table.coloroverride)
+        for row in table.table:
+            if row[0] is None:  # separator, they have no color overrides
+                merged.table.append([None])
+                continue
+            cells = dict(zip(columns, row))
+            colors = dict(zip(columns, next(overrides)))
+            merged.table.append([Table.to_unicode(cluster)] + [cells.get(x, u'') for x in names])
+            merged.coloroverride.append([None] + [colors.get(x) for x in names])
+    return merged
+
+
+class ClusterRunner(object):
+    def __init__(self, cli_class, names):
+        """
+        :param cli_class: client class, every cluster gets its own client
+        :param list[str] names: cluster names
+        """
+        self._cli_class = cli_class
+        self._names = names
+
+    def run(self, pargs):
+        """
+        Runs the command on all clusters and prints the merged output.
+
+        :param list[str] pargs: command line without the --clusters option
+        :return: exit code of the first failed cluster, ExitCode.OK if all succeeded
+        :rtype: int
+        """
+        jobs = [(name, ['--clusters='] + profile_arguments(name) + pargs) for name in self._names]
+        results = [None] * len(jobs)
+        stdout, stderr = ThreadOutput(sys.stdout), ThreadOutput(sys.stderr)
+
+        def worker(idx, name, cluster_pargs):
+            _local.collector = _Collector()
+            stdout.capture()
+            stderr.capture()
+            cli = None
+            try:
+                cli = self._cli_class(env_controllers=False)  # LS_CONTROLLERS would mix up the clusters
+                rc = cli.parse_and_execute(cluster_pargs, is_interactive=True)
+            except SystemExit as se:  # argparse errors, --help and --version
+                if se.code is None:
+                    rc = ExitCode.OK
+                else:
+                    rc = se.code if isinstance(se.code, int) else ExitCode.UNKNOWN_ERROR
+            except Exception as exc:  # printed with the cluster prefix, the other clusters are still shown
+                sys.stderr.write("Error: {e}\n".format(e=exc))
+                _local.collector = _Collector()  # drop the partial output of the failed command
+                rc = ExitCode.UNKNOWN_ERROR
+            finally:
+                if cli is not None:
+                    cli.disconnect()
+            results[idx] = (rc or ExitCode.OK, _local.collector, stdout.release(), stderr.release())
+
+        threads = [threading.Thread(target=worker, args=(idx,) + job) for idx, job in enumerate(jobs)]
+        sys.stdout, sys.stderr = stdout, stderr
+        try:
+            for thread in threads:
+                thread.daemon = True
+                thread.start()
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(1.0)  # a timeout keeps ctrl-c working on python2
+        finally:
+            sys.stdout, sys.stderr = stdout._stream, stderr._stream
+
+        self._print_results(results)
+        return next((result[0] for result in results if result[0] != ExitCode.OK), ExitCode.OK)
+
+    def _print_results(self, results):
+        data = [(name, result[1].data) for name, result in zip(self._names, results) if result[1].data]
+        if data:
+            print(json.dumps(merge_data(data), indent=2))
+
+        table_count = max(len(result[1].tables) for result in results)
+        for idx in range(table_count):
+            tables = [(name, result[1].tables[idx]) for name, result in zip(self._names, results)
+                      if idx < len(result[1].tables)]
+            merge_tables(tables).show()
+
+        # anything else, e.g. replies of the controllers or connection errors
+        for name, (_, _, out, err) in zip(self._names, results):
+            for stream, text in ((sys.stdout, out), (sys.stderr, err)):
+                for line in text.splitlines():
+                    stream.write("[{n}] {line}\n".format(n=name, line=line))
+        sys.stdout.flush()
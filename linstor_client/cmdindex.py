@@ -0,0 +1,410 @@
+"""
+Serialized index of the command tree.
+
+Shell completion, "list-commands --tree" and "help" only need the names, options and help texts of
+the commands, but building all argparse parsers for them is the most expensive part of a client start.
+The index holds this information for the whole tree and is cached in the user cache directory. It is
+rebuilt from the parser once the client, python-linstor or the python version changes.
+"""
+
+import os
+import sys
+import tempfile
+
+import linstor_client.argparse.argparse as argparse
+from linstor_client.argcomplete import CompletionFinder
+from linstor_client.consts import VERSION
+from linstor_client.utils import cache_dir
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+INDEX_FORMAT = 2
+
+# argparse formats help for COLUMNS - 2 characters, 80 - 2 if COLUMNS is not set
+HELP_WIDTH = 78
+
+
+def package_dir(name):
+    """
+    :param str name: top level package
+    :return: the directory of the package, None if not found
+    :rtype: str
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return os.path.dirname(os.path.abspath(module.__file__))
+    # find the package without importing it, importing python-linstor is slow
+    for entry in sys.path:
+        path = os.path.join(entry or os.curdir, name)
+        if os.path.isfile(os.path.join(path, '__init__.py')):
+            return path
+    return None
+
+
+def fingerprint(extra_files=()):
+    """
+    Identifies the sources the index is built from, it changes with every update of the
+    client or python-linstor.
+
+    :param list[str] extra_files: additional source files defining commands
+    :return: hashable fingerprint
+    :rtype: tuple
+    """
+    files = list(extra_files)
+    for package in ('linstor_client', 'linstor'):
+        pkg_dir = package_dir(package)
+        if pkg_dir is None:
+            continue
+        for dirpath, _, filenames in os.walk(pkg_dir):
+            files += [os.path.join(dirpath, name) for name in filenames if name.endswith('.py')]
+
+    stamps = []
+    for path in sorted(files):
+        try:
+            stat = os.stat(path)
+            stamps.append((path, stat.st_mtime, stat.st_size))
+        except OSError:
+            pass
+    return INDEX_FORMAT, VERSION, tuple(sys.version_info[:2]), tuple(stamps)
+
+
+def format_help(parser, width=HELP_WIDTH):
+    """
+    Same as parser.format_help(), but for a fixed width instead of the one from the COLUMNS variable.
+    """
+    parser._get_formatter = lambda: parser.formatter_class(prog=parser.prog, width=width)
+    try:
+        return parser.format_help()
+    finally:
+        del parser._get_formatter
+
+
+def help_width():
+    """
+    :return: the width argparse currently formats help texts for
+    :rtype: int
+    """
+    try:
+        return int(os.environ['COLUMNS']) - 2
+    except (KeyError, ValueError):
+        return HELP_WIDTH
+
+
+def _plain(value):
+    return value if value is None or isinstance(value, (str, int, float, bool)) else None
+
+
+def _completer_spec(action):
+    completer = getattr(action, 'completer', None)
+    if completer is None:
+        return None
+    if isinstance(completer, (list, tuple)):
+        return {'choices': [str(x) for x in completer]}
+    # bound methods of command objects are looked up again, e.g. NodeCommands.node_completer
+    owner = getattr(completer, '__self__', None)
+    if owner is not None and not isinstance(owner, type):
+        module_name = type(owner).__module__
+        if module_name.startswith('linstor_client.commands.'):
+            return {
+                'module': module_name.rsplit('.', 1)[1],
+                'class': type(owner).__name__,
+                'method': completer.__name__
+            }
+    # closures and other callables need the real parser
+    return {'fallback': True}
+
+
+def _argument_help(parser, action):
+    if not action.help or action.help == argparse.SUPPRESS:
+        return None
+    try:
+        return parser._get_formatter()._expand_help(action)
+    except (ValueError, TypeError, KeyError):
+        return action.help
+
+
+def _argument_entry(parser, action, group=None):
+    return {
+        'strings': list(action.option_strings),
+        'help': _argument_help(parser, action),
+        'dest': action.dest,
+        'nargs': action.nargs,
+        'default': _plain(action.default),
+        'choices': [str(x) for x in action.choices] if action.choices is not None else None,
+        'completer': _completer_spec(action),
+        'suppressed': action.help == argparse.SUPPRESS,
+        'group': group
+    }
+
+
+def _parser_help(parser):
+    try:
+        return format_help(parser)
+    except (ValueError, TypeError, KeyError):  # e.g. '%' in help strings, "help" reports it from the parser
+        return None
+
+
+def _parser_node(parser, names):
+    node = {
+        'name': parser.prog.rsplit(' ', 1)[-1],
+        'names': names,
+        'prog': parser.prog,
+        'description': parser.description,
+        'help': _parser_help(parser),
+        'options': [],
+        'positionals': [],
+        'commands': None
+    }
+
+    groups = {}
+    for idx, group in enumerate(parser._mutually_exclusive_groups):
+        for action in group._group_actions:
+            groups[action] = idx
+
+    for action in parser._actions:
+        if isinstance(action, argparse._SubParsersAction):
+            node['commands'] = _subcommand_nodes(action)
+        elif action.option_strings:
+            node['options'].append(_argument_entry(parser, action, groups.get(action)))
+        else:
+            node['positionals'].append(_argument_entry(parser, action))
+    return node
+
+
+def _subcommand_nodes(subparsers_action):
+    names = {}
+    parsers = []
+    for name, subparser in subparsers_action.choices.items():
+        if id(subparser) not in names:
+            names[id(subparser)] = []
+            parsers.append(subparser)
+        names[id(subparser)].append(name)
+    return [_parser_node(subparser, names[id(subparser)]) for subparser in parsers]
+
+
+def build_index(parser):
+    """
+    Walks the whole parser tree, this builds all lazily registered command groups.
+
+    :param argparse.ArgumentParser parser: the linstor main parser
+    :return: index with the root command as 'root'
+    :rtype: dict
+    """
+    return {'fingerprint': None, 'root': _parser_node(parser, [parser.prog])}
+
+
+def _index_path():
+    return os.path.join(cache_dir(), 'command-index-py{v}.pickle'.format(v=sys.version_info[0]))
+
+
+def load_index(get_parser, extra_files=()):
+    """
+    Loads the command index from the user cache, builds and stores it if the cache is missing
+    or outdated.
+
+    :param get_parser: function returning the linstor main parser, only called to build the index
+    :param list[str] extra_files: additional source files defining commands
+    :return: the command index
+    :rtype: dict
+    """
+    path = _index_path()
+    current = fingerprint(extra_files)
+    try:
+        with open(path, 'rb') as index_file:
+            index = pickle.load(index_file)
+        if index.get('fingerprint') == current:
+            return index
+    except Exception:  # missing, truncated or foreign cache file, just rebuild it
+        pass
+
+    index = build_index(get_parser())
+    index['fingerprint'] = current
+    try:
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, 'wb') as tmp_file:
+            pickle.dump(index, tmp_file, 2)
+        os.rename(tmp_path, path)
+    except (IOError, OSError):
+        pass  # cache is an optimization only, e.g. read-only home directories
+    return index
+
+
+def find_command(index, names):
+    """
+    :param dict index: the command index
+    :param list[str] names: command names or aliases, e.g. ['r', 'list']
+    :return: the node of the command, None if there is no such command
+    :rtype: dict
+    """
+    node = index['root']
+    for name in names:
+        node = next((x for x in node['commands'] or [] if name in x['names']), None)
+        if node is None:
+            return None
+    return node
+
+
+def print_tree(nodes, indent=0):
+    """
+    Prints the commands and their subcommands like LinStorCLI.print_cmd_tree.
+    """
+    for node in sorted(nodes, key=lambda x: x['prog']):
+        p_str = node['name']
+        if len(node['names']) > 1:
+            p_str += " ({al})".format(al=sorted(node['names'], key=len)[0])
+        sys.stdout.write(" " * indent + "- " + p_str + "\n")
+        print_tree(node['commands'] or [], indent + 2)
+
+
+def _full(arg, count):
+    if arg['nargs'] is None or arg['nargs'] == argparse.OPTIONAL:
+        return count >= 1
+    if isinstance(arg['nargs'], int):
+        return count >= arg['nargs']
+    return False
+
+
+def _variable(arg):
+    return arg['nargs'] is not None and not isinstance(arg['nargs'], int)
+
+
+class IndexCompletionFinder(CompletionFinder):
+    """
+    Shell completion answered from the command index. Command lines the index cannot resolve,
+    e.g. abbreviated options or completers that need the parsed arguments, are completed by
+    argcomplete on the full parser.
+
+    Used like argcomplete.autocomplete, but with the LinStorCLI object instead of a parser.
+    """
+    def __init__(self, cli=None, **kwargs):
+        super(IndexCompletionFinder, self).__init__(None, **kwargs)
+        self._cli = cli
+
+    def _get_completions(self, comp_words, cword_prefix, cword_prequote, last_wordbreak_pos):
+        completions = self._index_completions(comp_words[1:], cword_prefix)
+        if completions is None:
+            self._parser = self._cli.setup_parser()
+            return super(IndexCompletionFinder, self)._get_completions(
+                comp_words, cword_prefix, cword_prequote, last_wordbreak_pos)
+        completions = self.filter_completions(completions)
+        return self.quote_completions(completions, cword_prequote, last_wordbreak_pos)
+
+    def _run_completer(self, arg, prefix, parsed_args):
+        spec = arg['completer']
+        if spec is None:
+            if arg['choices'] is not None:
+                results = arg['choices']
+            else:
+                results = self.default_completer(prefix=prefix, action=None, parser=None, parsed_args=parsed_args)
+        elif 'choices' in spec:
+            results = spec['choices']
+        else:
+            command_object = self._cli.command_object(spec['module'], spec['class'])
+            completer = getattr(command_object, spec['method'])
+            results = completer(prefix=prefix, action=None, parser=None, parsed_args=parsed_args)
+        return [x for x in results if self.validator(x, prefix)]
+
+    @staticmethod
+    def _uses_fallback(arg):
+        return arg['completer'] is not None and 'fallback' in arg['completer']
+
+    def _index_completions(self, words, prefix):
+        """
+        Follows argparse through the command words, only the common cases are handled.
+
+        :return: the completions or None if the full parser is needed
+        :rtype: list[str]
+        """
+        parsed_args = argparse.Namespace(controllers='localhost')
+        node = None
+        pending = None  # option still expecting values, and the number of values it got
+        for word in [None] + words:
+            is_option = word is not None and word.startswith('-') and word != '-'
+            if node is None or (pending is None and not is_option and node['commands'] is not None):
+                # the first round enters the main command, later rounds its subcommands
+                node = self._cli.command_index()['root'] if node is None else \
+                    next((x for x in node['commands'] if word in x['names']), None)
+                if node is None:
+                    return None
+                positionals = node['positionals']
+                if any(_variable(x) for x in positionals[:-1]) or \
+                        any(x['nargs'] == argparse.REMAINDER for x in positionals) or \
+                        (positionals and node['commands'] is not None):
+                    return None
+                for arg in node['options'] + positionals:
+                    if not hasattr(parsed_args, arg['dest']):
+                        setattr(parsed_args, arg['dest'], arg['default'])
+                counts = [0] * len(positionals)
+                seen_options = set()  # (mutually exclusive group, dest) of the given options
+                seen_positional = False
+                continue
+
+            if pending is not None:
+                option, got = pending
+                setattr(parsed_args, option['dest'], word)
+                pending = None if _full(option, got + 1) else (option, got + 1)
+                continue
+
+            if is_option:
+                if word == '--' or word[1:2].isdigit():
+                    return None
+                opt_string, _, value = word.partition('=')
+                option = next((x for x in node['options'] if opt_string in x['strings']), None)
+                if option is None or option['dest'] in ('help', 'version'):
+                    return None  # abbreviated, combined or unknown option, or argparse would exit
+                if seen_positional and any(_variable(x) for x in positionals):
+                    return None  # argparse might already have consumed the optional positionals empty
+                seen_options.add((option['group'], option['dest']))
+                if '=' in word:
+                    if option['nargs'] is not None:
+                        return None
+                    setattr(parsed_args, option['dest'], value)
+                elif option['nargs'] is None or isinstance(option['nargs'], int) and option['nargs'] > 0:
+                    pending = (option, 0)
+                elif option['nargs'] != 0:
+                    return None  # values up to the next option, argparse decides
+                continue
+
+            seen_positional = True
+            idx = next((i for i, cnt in enumerate(counts) if not _full(positionals[i], cnt)), None)
+            if idx is None:
+                return None  # too many arguments
+            counts[idx] += 1
+            if _variable(positionals[idx]) and positionals[idx]['nargs'] != argparse.OPTIONAL:
+                values = getattr(parsed_args, positionals[idx]['dest']) or []
+                setattr(parsed_args, positionals[idx]['dest'], values + [word])
+            else:
+                setattr(parsed_args, positionals[idx]['dest'], word)
+
+        if pending is not None:
+            option = pending[0]
+            if prefix.startswith('-') or self._uses_fallback(option):
+                return None
+            return self._run_completer(option, prefix, parsed_args)
+
+        completions = []
+        for option in node['options']:
+            if option['suppressed'] or any(group is not None and group == option['group'] and dest != option['dest']
+                                           for group, dest in seen_options):
+                continue
+            completions += [x for x in option['strings'] if x.startswith(prefix)]
+        if prefix.startswith('-'):
+            return completions
+
+        if node['commands'] is not None:
+            completions += [name for x in node['commands'] for name in x['names'] if name.startswith(prefix)]
+        else:
+            idx = next((i for i, cnt in enumerate(counts) if not _full(positionals[i], cnt)), None)
+            if idx is not None:
+                if self._uses_fallback(positionals[idx]):
+                    return None
+                completions += self._run_completer(positionals[idx], prefix, parsed_args)
+        return completions
+
+
+autocomplete = IndexCompletionFinder()
@@ -1,17 +1,4 @@
 from .commands import DefaultState, Commands, MiscCommands, ArgumentError
 from .drbd_setup_cmds import DrbdOptions
-from .controller_cmds import ControllerCommands
-from .node_cmds import NodeCommands
-from .rsc_dfn_cmds import ResourceDefinitionCommands
-from .rsc_grp_cmds import ResourceGroupCommands
-from .vlm_grp_cmds import VolumeGroupCommands
-from .storpool_dfn_cmds import StoragePoolDefinitionCommands
-from .storpool_cmds import StoragePoolCommands
-from .rsc_cmds import ResourceCommands
-from .rsc_conn_cmds import ResourceConnectionCommands
-from .vlm_cmds import VolumeCommands
-from .vlm_dfn_cmds import VolumeDefinitionCommands
-from .snapshot_cmds import SnapshotCommands
-from .drbd_proxy_cmds import DrbdProxyCommands
-from .migrate_cmds import MigrateCommands
-from .zsh_completer import ZshGenerator
+
+# the command group modules (node_cmds, rsc_cmds, ...) are imported on demand by linstor_client_main
@@ -0,0 +1,166 @@
+from linstor_client import cmdindex
+from linstor_client.consts import ExitCode
+
+_header = """# bash completion for linstor, generated by "linstor gen-bash-completer"
+#
+# Subcommands, options and static choices are completed from the tables below,
+# python is only started for object names (nodes, resources, ...) asked from the controller.
+
+declare -A _linstor_cmds _linstor_sub _linstor_opts _linstor_optarg _linstor_optval _linstor_posval _linstor_posrest
+"""
+
+_functions = r"""
+_linstor_python_complete() {
+  local IFS=$'\013'
+  COMPREPLY=( $(COMP_LINE="$COMP_LINE" COMP_POINT="$COMP_POINT" \
+                _ARGCOMPLETE_COMP_WORDBREAKS="$COMP_WORDBREAKS" _ARGCOMPLETE=1 \
+                "$1" 8>&1 9>&2 1>/dev/null 2>/dev/null) )
+  if [[ $? != 0 ]]; then
+    unset COMPREPLY
+  fi
+}
+
+# value specs: '=word ...' static words, '@' asks python, empty lets bash complete file names
+_linstor() {
+  local IFS=$' \t\n'
+  local line="${COMP_LINE:0:$COMP_POINT}"
+  # quoting, escapes and word break characters are left to the python completer
+  if [[ $line == *[\'\"\\:=]* ]]; then
+    _linstor_python_complete "$1"
+    return
+  fi
+
+  local -a words
+  read -ra words <<< "$line"
+  local cur=""
+  if [[ $line != *[[:space:]] ]]; then
+    cur="${words[${#words[@]}-1]}"
+    unset "words[${#words[@]}-1]"
+  fi
+
+  local path=linstor word pending="" opt="" values=0 n=0 i
+  for (( i=1; i < ${#words[@]}; i++ )); do
+    word="${words[i]}"
+    if [[ -n $pending ]]; then
+      if [[ $pending != + ]]; then
+        (( --pending > 0 )) || pending=""
+        continue
+      fi
+      if [[ $word != -* ]]; then
+        (( values++ ))
+        continue
+      fi
+      pending=""
+    fi
+    if [[ $word == -* ]]; then
+      opt="$word"
+      pending="${_linstor_optarg[$path|$word]}"
+      values=0
+    elif [[ -n ${_linstor_sub[$path|$word]} ]]; then
+      path="${_linstor_sub[$path|$word]}"
+      n=0
+    else
+      (( n++ ))
+    fi
+  done
+
+  local spec="" candidates=""
+  if [[ -n $pending && ( $pending != + || $cur != -* ) ]]; then
+    spec="${_linstor_optval[$path|$opt]}"
+    if [[ -z $spec ]]; then
+      COMPREPLY=()
+      return
+    fi
+    # once a list option got a value, further options may follow
+    [[ $pending == + ]] && (( values > 0 )) && candidates="${_linstor_opts[$path]}"
+  elif [[ $cur == -* ]]; then
+    candidates="${_linstor_opts[$path]}"
+  else
+    candidates="${_linstor_opts[$path]} ${_linstor_cmds[$path]}"
+    spec="${_linstor_posval[$path|$n]-${_linstor_posrest[$path]}}"
+  fi
+
+  if [[ $spec == @* ]]; then
+    _linstor_python_complete "$1"
+    return
+  fi
+  candidates+=" ${spec#=}"
+  COMPREPLY=( $(compgen -W "$candidates" -- "$cur") )
+  if [[ ${#COMPREPLY[@]} == 1 ]]; then
+    COMPREPLY[0]+=" "
+  fi
+}
+complete -o nospace -o default -F _linstor linstor
+"""
+
+
+def _quote(value):
+    return "'" + value.replace("'", "'\\''") + "'"
+
+
+class BashGenerator(object):
+    def __init__(self, parser):
+        self._parser = parser
+
+    def cmd_completer(self, args):
+        print(_header)
+        index = cmdindex.build_index(self._parser)
+        for path, value in self.tables(index['root']):
+            print(path + '=' + _quote(value))
+        print(_functions)
+        return ExitCode.OK
+
+    @classmethod
+    def value_spec(cls, arg):
+        """
+        :param dict arg: option or positional entry of the command index
+        :return: how the shell completes the argument values, see _functions
+        :rtype: str
+        """
+        completer = arg['completer']
+        if completer is not None and 'choices' in completer:
+            return '=' + ' '.join(completer['choices'])
+        if arg['choices'] is not None and (completer is None or 'fallback' in completer):
+            return '=' + ' '.join(arg['choices'])
+        return '@' if completer is not None else ''
+
+    @classmethod
+    def tables(cls, node):
+        """
+        Generates the bash array entries for a command and its subcommands.
+
+        :param dict node: command index node
+        :return: generator of (array element, value)
+        """
+        path = node['prog']
+        key = _quote(path)
+        options = [x for x in node['options'] if not x['suppressed']]
+        yield '_linstor_opts[' + key + ']', ' '.join(s for x in options for s in x['strings'])
+        for option in options:
+            if option['nargs'] == 0:
+                continue
+            arity = str(option['nargs']) if isinstance(option['nargs'], int) else \
+                '1' if option['nargs'] in (None, '?') else '+'
+            for opt_string in option['strings']:
+                yield '_linstor_optarg[' + _quote(path + '|' + opt_string) + ']', arity
+                yield '_linstor_optval[' + _quote(path + '|' + opt_string) + ']', cls.value_spec(option)
+
+        slot = 0
+        for positional in node['positionals']:
+            nargs = positional['nargs']
+            if nargs is None or nargs == '?' or isinstance(nargs, int):
+                for _ in range(1 if not isinstance(nargs, int) else nargs):
+                    yield '_linstor_posval[' + _quote(path + '|' + str(slot)) + ']', cls.value_spec(positional)
+                    slot += 1
+            else:
+                yield '_linstor_posrest[' + key + ']', cls.value_spec(positional)
+                break
+
+        if node['commands'] is not None:
+            yield '_linstor_cmds[' + key + ']', ' '.join(name for x in node['commands'] for name in x['names'])
+            for child in node['commands']:
+                for name in child['names']:
+                    yield '_linstor_sub[' + _quote(path + '|' + name) + ']', child['prog']
+            for child in node['commands']:
+                for entry in cls.tables(child):
+                    yield entry
@@ -2,11 +2,7 @@ import linstor_client.argparse.argparse as argparse
 import getpass
 import json
 import re
-from datetime import datetime, timedelta
 
-import linstor
-from linstor.sharedconsts import NAMESPC_AUXILIARY
-from linstor.properties import properties
 import linstor_client
 from linstor_client.utils import LinstorClientError, Output
 from linstor_client.consts import ExitCode, Color
@@ -35,11 +31,45 @@ class DefaultState(object):
         return False
 
 
+class _MergedListResponse(object):
+    """
+    The list responses of the shards of Commands.output_sharded_list() as one, for machine readable output.
+    """
+    def __init__(self, lstmsgs):
+        self._lstmsgs = lstmsgs
+
+    @staticmethod
+    def _merge(shards):
+        """
+        Concatenates the lists of the shards, in dictionaries the lists of every key.
+        """
+        if shards and isinstance(shards[0], dict):
+            merged = {}
+            for shard in shards:
+                for key, value in shard.items():
+                    if isinstance(value, list):
+                        merged.setdefault(key, []).extend(value)
+                    else:
+                        merged.setdefault(key, value)
+            return merged
+        return [x for shard in shards for x in shard]
+
+    @property
+    def data_v0(self):
+        return self._merge([x.data_v0 for x in self._lstmsgs])
+
+    @property
+    def data_v1(self):
+        return self._merge([x.data_v1 for x in self._lstmsgs])
+
+
 class Commands(object):
     CONTROLLER = 'controller'
     CRYPT = 'encryption'
     DMMIGRATE = 'dm-migrate'
     EXIT = 'exit'
+    REFRESH = 'refresh'
+    GEN_BASH_COMPLETER = 'gen-bash-completer'
     GEN_ZSH_COMPLETER = 'gen-zsh-completer'
     HELP = 'help'
     INTERACTIVE = 'interactive'
@@ -57,6 +87,7 @@ class Commands(object):
     VOLUME_DEF = 'volume-definition'
     SNAPSHOT = 'snapshot'
     DRBD_PROXY = 'drbd-proxy'
+    WAIT = 'wait'
 
     MainList = [
         CONTROLLER,
@@ -76,18 +107,30 @@ class Commands(object):
         VOLUME,
         VOLUME_DEF,
         SNAPSHOT,
-        DRBD_PROXY
+        DRBD_PROXY,
+        WAIT
     ]
     Hidden = [
         DMMIGRATE,
         EXIT,
+        REFRESH,
+        GEN_BASH_COMPLETER,
         GEN_ZSH_COMPLETER
     ]
 
-    def __init__(self):
-        self._linstor = None  # type: linstor.Linstor
-        # _linstor_completer is just here as a cache for completer calls
-        self._linstor_completer = None  # type: linstor.Linstor
+    def __init__(self, session=None):
+        """
+        :param linstor_client.session.Session session: controller connection shared by all command objects
+        """
+        self._session = session
+
+    @property
+    def _linstor(self):
+        """
+        :return: the connected client of the session, None if not connected
+        :rtype: linstor.Linstor
+        """
+        return self._session.api if self._session is not None else None
 
     class Subcommands(object):
 
@@ -252,6 +295,20 @@ class Commands(object):
 
         return rc
 
+    @classmethod
+    def replies_exit_code(cls, args, replies):
+        """
+        :param args: parsed arguments, with the warn_as_error option
+        :param list[ApiCallResponse] replies:
+        :return: the exit code handle_replies returns for the replies in human readable output
+        :rtype: int
+        """
+        rc = ExitCode.OK
+        for reply in replies:
+            if reply.is_error() or (args.warn_as_error and reply.is_warning()):
+                rc = ExitCode.API_ERROR
+        return rc
+
     @classmethod
     def get_replies_state(cls, replies):
         """
@@ -276,10 +333,12 @@ class Commands(object):
 
     @classmethod
     def check_for_api_replies(cls, replies):
+        import linstor
         return replies and isinstance(replies[0], linstor.ApiCallResponse)
 
     @classmethod
     def output_list(cls, args, replies, output_func, single_item=True):
+        import linstor
         if isinstance(replies, list) and not args.curl:
             if cls.check_for_api_replies(replies):
                 return cls.handle_replies(args, replies)
@@ -328,7 +387,13 @@ class Commands(object):
         """
         serializes the given protobuf data and prints to stdout.
         """
+        from linstor_client import clusters
         assert(isinstance(data, list))
+        cluster_collector = clusters.collector()
+        if cluster_collector is not None:  # merged with the output of the other clusters, see --clusters
+            cluster_collector.data += [x.data_v0 if output_version == 'v0' else x.data_v1 for x in data]
+            return True
+
         if output_version == 'v0':
             s = json.dumps([x.data_v0 for x in data], indent=2)
         elif output_version == 'v1':
@@ -373,6 +438,134 @@ class Commands(object):
             'delete': delete
         }
 
+    @classmethod
+    def add_parallel_argument(cls, parser, help_text=None):
+        parser.add_argument(
+            '--parallel',
+            type=int,
+            metavar='N',
+            default=1,
+            help=help_text or 'Number of calls to run concurrently, one per target (Default: 1)'
+        )
+
+    @classmethod
+    def add_table_arguments(cls, parser, columns):
+        """
+        Adds the options of list commands shaping their table, see Table.set_columns(), set_sortby()
+        and set_window().
+
+        :param parser: parser of the list command
+        :param list[str] columns: names of the table columns
+        """
+        parser.add_argument(
+            '-c', '--columns',
+            nargs='+',
+            choices=columns,
+            help='Only show these columns, the cells and fetches of the others are skipped'
+        ).completer = Commands.show_group_completer(columns, "columns")
+        parser.add_argument(
+            '--sort-by',
+            nargs='+',
+            type=cls.sort_key_check(columns),
+            metavar='COL[:desc]',
+            help='Sort the rows by these columns, within the groups of --groupby'
+        ).completer = Commands.show_group_completer(columns + [x + ':desc' for x in columns], "sort_by")
+        parser.add_argument(
+            '--offset',
+            type=int,
+            default=0,
+            metavar='N',
+            help='Skip the first N rows of the sorted table'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            metavar='N',
+            help='Show at most N rows, only these are formatted'
+        )
+        parser.add_argument(
+            '--page',
+            action='store_true',
+            help='Show the rows page by page, each page as high as the terminal'
+        )
+
+    @classmethod
+    def add_sharded_list_argument(cls, parser):
+        cls.add_parallel_argument(
+            parser,
+            help_text='Fetch the list per node, N nodes at once (Default: 1)'
+        )
+
+    def run_calls(self, args, calls):
+        """
+        Runs one api call per target, concurrently if --parallel is given, and handles the replies.
+
+        :param args: parsed arguments, with the parallel option
+        :param list calls: functions taking a linstor.Linstor and returning a list of replies
+        :return: the merged exit code of the replies
+        :rtype: int
+        """
+        from linstor_client import executor
+        parallel = 1 if args.curl else max(getattr(args, 'parallel', 1), 1)  # curl mode prints the calls in order
+        replies = executor.run_calls(self._session, calls, parallel)
+        return self.handle_replies(args, replies)
+
+    def output_sharded_list(self, args, list_call, output_func):
+        """
+        Outputs a list, fetched as one shard per node if --parallel is given.
+
+        The shards are the nodes of the --nodes filter or all nodes of the cluster, up to --parallel of
+        them are fetched at once and passed to output_func as they arrive, the tables of the list commands
+        are printed once all shards are in. The fetch starts once output_func iterates the responses, it may
+        issue calls of its own on the session client before. Machine readable output merges the shards into
+        a single list response.
+
+        :param args: parsed arguments, with the nodes and parallel options
+        :param list_call: function taking a linstor.Linstor and a node filter, issuing the list call
+        :param output_func: function taking the args and an iterable of list responses
+        :return: exit code
+        :rtype: int
+        """
+        from linstor_client import executor
+        import linstor
+        if args.curl or args.parallel <= 1:
+            return self.output_list(
+                args,
+                list_call(self._linstor, args.nodes),
+                lambda output_args, lstmsg: output_func(output_args, [lstmsg])
+            )
+
+        node_names = args.nodes
+        if not node_names:
+            node_list = self._linstor.node_list()
+            if self.check_for_api_replies(node_list):
+                return self.handle_replies(args, node_list)
+            node_names = [x.name for x in node_list[0].nodes]
+
+        shards = executor.iter_calls(
+            self._session,
+            [lambda api, node=node: list_call(api, [node]) for node in node_names],
+            args.parallel
+        )
+        api_replies = []
+
+        def list_responses():
+            for replies in shards:
+                if self.check_for_api_replies(replies):
+                    api_replies.extend(replies)
+                elif replies:
+                    api_replies.extend(linstor.Linstor.filter_api_call_response(replies[1:]))
+                    yield replies[0]
+
+        if args.machine_readable:
+            lstmsgs = list(list_responses())
+            merged = [_MergedListResponse(lstmsgs)] if lstmsgs else []
+            self._print_machine_readable(merged + api_replies, args.output_version)
+            return self.replies_exit_code(args, api_replies)
+
+        output_func(args, list_responses())
+        return self.handle_replies(args, api_replies)
+
     @classmethod
     def add_parser_keyvalue(cls, parser, property_object=None):
         parser.add_argument('--aux', action="store_true", help="Property is an auxiliary user property.")
@@ -425,6 +618,7 @@ class Commands(object):
 
     @classmethod
     def get_allowed_props(cls, objname):
+        from linstor.properties import properties
         return [x for x in properties[objname] if not x.get('internal', False)] if objname in properties else []
 
     @classmethod
@@ -433,12 +627,14 @@ class Commands(object):
 
     @classmethod
     def _attach_aux_prop(cls, args):
+        from linstor.sharedconsts import NAMESPC_AUXILIARY
         if args.aux:
             args.key = NAMESPC_AUXILIARY + '/' + args.key
         return args
 
     @classmethod
     def add_auto_select_argparse_arguments(cls, parser, use_place_count=False):
+        import linstor
         parser.add_argument(
             '--storage-pool', '-s',
             type=str,
@@ -513,6 +709,10 @@ class Commands(object):
                 opt = parsed_args.groupby
             elif opt == "show":
                 opt = parsed_args.show
+            elif opt == "columns":
+                opt = parsed_args.columns
+            elif opt == "sort_by":
+                opt = [x + ':desc' if desc else x for x, desc in parsed_args.sort_by or []]
             else:
                 return possible
 
@@ -523,23 +723,15 @@ class Commands(object):
         return completer
 
     def get_linstorapi(self, **kwargs):
-        if self._linstor:
-            return self._linstor
-
-        if self._linstor_completer:
-            return self._linstor_completer
-
-        # TODO also read config overrides
-        servers = ['linstor://localhost']
-        if 'parsed_args' in kwargs:
-            cliargs = kwargs['parsed_args']
-            servers = linstor.MultiLinstor.controller_uri_list(cliargs.controllers)
-        if not servers:
-            return None
+        """
+        Returns the client of the session, completers connect the session on first use.
 
-        self._linstor_completer = linstor.Linstor(servers[0])
-        self._linstor_completer.connect()
-        return self._linstor_completer
+        :return: the connected client
+        :rtype: linstor.Linstor
+        """
+        if self._linstor is None and self._session is not None:
+            return self._session.connect_completer(kwargs.get('parsed_args'))
+        return self._linstor
 
     def node_completer(self, prefix, **kwargs):
         lapi = self.get_linstorapi(**kwargs)
@@ -629,6 +821,7 @@ class Commands(object):
         return possible
 
     def resource_grp_completer(self, prefix, **kwargs):
+        import linstor
         lapi = self.get_linstorapi(**kwargs)
         possible = set()
         try:
@@ -668,6 +861,7 @@ class Commands(object):
         :return: List of layer names
         :rtype: list[str]
         """
+        import linstor
         layer_list = []
         for layer in layer_data.split(','):
             if layer.lower() not in linstor.Linstor.layer_list():
@@ -684,6 +878,7 @@ class Commands(object):
         :return: List of provider names
         :rtype list[str]
         """
+        import linstor
         provider_list = []
         for provider in providers.split(","):
             if provider.upper() not in linstor.Linstor.provider_list():
@@ -691,10 +886,26 @@ class Commands(object):
             provider_list.append(provider)
         return provider_list
 
+    @classmethod
+    def sort_key_check(cls, columns):
+        """
+        :param list[str] columns: names of the table columns
+        :return: "type" for argparse, converting COL[:asc|:desc] to (COL, descending)
+        """
+        def sort_key(value):
+            name, _, order = value.partition(':')
+            if name not in columns:
+                raise argparse.ArgumentTypeError(
+                    'Column "{c}" not valid, choose from {cols}'.format(c=name, cols=", ".join(columns)))
+            if order.lower() not in ('', 'asc', 'desc'):
+                raise argparse.ArgumentTypeError('Sort order "{o}" not valid, use asc or desc'.format(o=order))
+            return name, order.lower() == 'desc'
+        return sort_key
+
 
 class MiscCommands(Commands):
-    def __init__(self):
-        super(MiscCommands, self).__init__()
+    def __init__(self, session=None):
+        super(MiscCommands, self).__init__(session)
 
     def setup_commands(self, parser):
         # Enryption subcommands
@@ -859,6 +1070,7 @@ class MiscCommands(Commands):
         tbl.show()
 
     def cmd_list_error_reports(self, args):
+        from datetime import datetime, timedelta
         since = args.since
         since_dt = None
         if since:
@@ -6,8 +6,8 @@ import json
 class ControllerCommands(Commands):
     OBJECT_NAME = 'controller'
 
-    def __init__(self):
-        super(ControllerCommands, self).__init__()
+    def __init__(self, session=None):
+        super(ControllerCommands, self).__init__(session)
 
     def setup_commands(self, parser):
         # Controller commands
@@ -80,13 +80,9 @@ class ControllerCommands(Commands):
         args = self._attach_aux_prop(args)
         props = Commands.parse_key_value_pairs([args.key + '=' + args.value])
 
-        replies = []
-        for prop_key, prop_value in props['pairs'].items():
-            replies.extend(self._linstor.controller_set_prop(prop_key, prop_value))
-        for prop_key in props['delete']:
-            replies.extend(self._linstor.controller_del_prop(prop_key))
-
-        return self.handle_replies(args, replies)
+        calls = [lambda api, k=k, v=v: api.controller_set_prop(k, v) for k, v in props['pairs'].items()]
+        calls += [lambda api, k=k: api.controller_del_prop(k) for k in props['delete']]
+        return self.run_calls(args, calls)
 
     def cmd_controller_drbd_opts(self, args):
         a = DrbdOptions.filter_new(args)
@@ -44,8 +44,8 @@ class DrbdProxyCommands(Commands):
         LONG = "lz4"
         SHORT = "lz4"
 
-    def __init__(self):
-        super(DrbdProxyCommands, self).__init__()
+    def __init__(self, session=None):
+        super(DrbdProxyCommands, self).__init__(session)
 
     def setup_commands(self, parser):
         subcmds = [
@@ -1,11 +1,43 @@
+import os
+import sys
+import tempfile
+
 import linstor_client.argparse.argparse as argparse
-from linstor_client.utils import rangecheck, filter_new_args
-from linstor.properties import properties
-import linstor.sharedconsts as apiconsts
-from linstor import SizeCalc, LinstorError
+from linstor_client.consts import VERSION
+from linstor_client.utils import rangecheck, filter_new_args, cache_dir
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+
+def _specs_version():
+    """
+    Identifies the sources of the option specs, besides the versions the properties module of
+    python-linstor by its modification time and size, it may change without a version bump.
+
+    :rtype: tuple
+    """
+    from linstor_client.cmdindex import package_dir
+    try:
+        from linstor.version import VERSION as API_VERSION
+    except ImportError:
+        API_VERSION = 'unknown'
+    stamp = None
+    pkg_dir = package_dir('linstor')
+    if pkg_dir is not None:
+        try:
+            stat = os.stat(os.path.join(pkg_dir, 'properties.py'))
+            stamp = (stat.st_mtime, stat.st_size)
+        except OSError:  # e.g. only byte code installed
+            pass
+    return VERSION, API_VERSION, stamp
 
 
 def _drbd_options():
+    from linstor.properties import properties
+
     drbd_options = {}
     for object_name, options in properties.items():
         object_drbd_options = {}
@@ -20,11 +52,123 @@ def _drbd_options():
     return drbd_options
 
 
-class DrbdOptions(object):
+def _argument_spec(option):
+    """
+    Derives the argparse arguments of a drbd option.
+
+    :param dict option: property entry of the drbd option
+    :return: A tuple (type_spec, add_argument kwargs), type_spec is None or a tuple naming the type function
+    :rtype: (tuple, dict)
+    """
+    if option['type'] == 'symbol':
+        return None, {'choices': option['values']}
+    elif option['type'] == 'boolean':
+        return None, {'choices': ['yes', 'no'], 'help': "yes/no (Default: %s)" % (option['default'])}
+    elif option['type'] == 'string':
+        return None, {}
+    elif option['type'] == 'numeric-or-symbol':
+        min_ = int(option['min'])
+        max_ = int(option['max'])
+        return ('numeric-or-symbol', min_, max_, option['values']), {
+            'help': "Integer between [{min}-{max}] or one of ['{syms}']".format(
+                min=min_,
+                max=max_,
+                syms="','".join(option['values'])
+            )
+        }
+    elif option['type'] == 'range':
+        min_ = option['min']
+        max_ = option['max']
+        default = option['default']
+        if "unit" in option:
+            unit = "; Unit: " + option['unit']
+        else:
+            unit = ""
+        # sp.add_argument('--' + opt, type=rangecheck(min_, max_),
+        #                 default=default, help="Range: [%d, %d]; Default: %d" %(min_, max_, default))
+        # setting a default sets the option to != None, which makes
+        # filterNew relatively complex
+        help_txt = "Range: [%d, %d]; Default: %s%s" % (min_, max_, str(default), unit)
+        if 'unit' in option and option['unit'] == 'bytes':
+            return None, {'type': str, 'help': help_txt}
+        return ('range', min_, max_), {'help': help_txt}
+    from linstor import LinstorError
+    raise LinstorError('Unknown option type ' + option['type'])
+
+
+def _compile_option_specs():
+    """
+    Scans the linstor properties for drbd options and precomputes their argparse arguments.
+
+    :return: dict with the drbd options per object and the sorted argument specs per object
+    :rtype: dict
+    """
     drbd_options = _drbd_options()
+    arguments = {}
+    for object_name, object_options in drbd_options.items():
+        arguments[object_name] = [
+            (opt_key,) + _argument_spec(option) for opt_key, option in sorted(object_options.items())
+        ]
+    return {
+        'version': _specs_version(),
+        'options': drbd_options,
+        'arguments': arguments
+    }
+
+
+def _option_specs_path():
+    return os.path.join(cache_dir(), 'drbd-options-py{v}.pickle'.format(v=sys.version_info[0]))
+
+
+def _load_option_specs():
+    """
+    Loads the compiled drbd option specs from the user cache, compiles and stores them if the
+    cache is missing or was written by another client or python-linstor version.
+
+    :return: compiled option specs, see _compile_option_specs
+    :rtype: dict
+    """
+    path = _option_specs_path()
+    try:
+        with open(path, 'rb') as cache_file:
+            specs = pickle.load(cache_file)
+        if specs.get('version') == _specs_version():
+            return specs
+    except Exception:  # missing, truncated or foreign cache file, just rebuild it
+        pass
+
+    specs = _compile_option_specs()
+    try:
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, 'wb') as tmp_file:
+            pickle.dump(specs, tmp_file, 2)
+        os.rename(tmp_path, path)
+    except (IOError, OSError):
+        pass  # cache is an optimization only, e.g. read-only home directories
+    return specs
+
+
+class DrbdOptions(object):
+    _specs = None
 
     unsetprefix = 'unset'
 
+    @classmethod
+    def option_specs(cls):
+        if cls._specs is None:
+            cls._specs = _load_option_specs()
+        return cls._specs
+
+    @classmethod
+    def drbd_options(cls):
+        """
+        :return: drbd option property entries per object name and option name
+        :rtype: dict[str, dict[str, dict]]
+        """
+        return cls.option_specs()['options']
+
     @staticmethod
     def description(_type):
         return "Set drbd {t} options.  Use --unset-[option_name] to unset.".format(t=_type)
@@ -47,52 +191,13 @@ class DrbdOptions(object):
 
     @classmethod
     def add_arguments(cls, parser, object_name, allow_unset=True):
-        for opt_key, option in sorted(cls.drbd_options[object_name].items(), key=lambda k: k[0]):
-            if option['type'] == 'symbol':
-                parser.add_argument('--' + opt_key, choices=option['values'])
-            elif option['type'] == 'boolean':
-                parser.add_argument(
-                    '--' + opt_key,
-                    choices=['yes', 'no'],
-                    help="yes/no (Default: %s)" % (option['default'])
-                )
-            elif option['type'] == 'string':
-                parser.add_argument('--' + opt_key)
-            elif option['type'] == 'numeric-or-symbol':
-                min_ = int(option['min'])
-                max_ = int(option['max'])
-                parser.add_argument(
-                    '--' + opt_key,
-                    type=DrbdOptions.numeric_symbol(min_, max_, option['values']),
-                    help="Integer between [{min}-{max}] or one of ['{syms}']".format(
-                        min=min_,
-                        max=max_,
-                        syms="','".join(option['values'])
-                    )
-                )
-            elif option['type'] == 'range':
-                min_ = option['min']
-                max_ = option['max']
-                default = option['default']
-                if "unit" in option:
-                    unit = "; Unit: " + option['unit']
-                else:
-                    unit = ""
-                # sp.add_argument('--' + opt, type=rangecheck(min_, max_),
-                #                 default=default, help="Range: [%d, %d]; Default: %d" %(min_, max_, default))
-                # setting a default sets the option to != None, which makes
-                # filterNew relatively complex
-                if 'unit' in option and option['unit'] == 'bytes':
-                    parser.add_argument(
-                        '--' + opt_key,
-                        type=str,
-                        help="Range: [%d, %d]; Default: %s%s" % (min_, max_, str(default), unit)
-                    )
-                else:
-                    parser.add_argument('--' + opt_key, type=rangecheck(min_, max_),
-                                        help="Range: [%d, %d]; Default: %s%s" % (min_, max_, str(default), unit))
+        for opt_key, type_spec, kwargs in cls.option_specs()['arguments'][object_name]:
+            if type_spec is None:
+                parser.add_argument('--' + opt_key, **kwargs)
+            elif type_spec[0] == 'numeric-or-symbol':
+                parser.add_argument('--' + opt_key, type=DrbdOptions.numeric_symbol(*type_spec[1:]), **kwargs)
             else:
-                raise LinstorError('Unknown option type ' + option['type'])
+                parser.add_argument('--' + opt_key, type=rangecheck(*type_spec[1:]), **kwargs)
 
             if allow_unset:
                 parser.add_argument('--%s-%s' % (cls.unsetprefix, opt_key),
@@ -112,13 +217,14 @@ class DrbdOptions(object):
             value = new_args[arg]
             is_unset = arg.startswith(cls.unsetprefix)
             prop_name = arg[len(cls.unsetprefix) + 1:] if is_unset else arg
-            option = cls.drbd_options[object_name][prop_name]
+            option = cls.drbd_options()[object_name][prop_name]
 
             key = option['key']
             if is_unset:
                 deletes.append(key)
             else:
                 if 'bytes' in option and option['unit'] == 'bytes':
+                    from linstor import SizeCalc
                     value = SizeCalc.auto_convert(value, SizeCalc.UNIT_B)
                     if option['min'] < value < option['max']:
                         value = str(value)
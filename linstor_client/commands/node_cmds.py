@@ -32,8 +32,8 @@ class NodeCommands(Commands):
         LONG = "reconnect"
         SHORT = "rc"
 
-    def __init__(self):
-        super(NodeCommands, self).__init__()
+    def __init__(self, session=None):
+        super(NodeCommands, self).__init__(session)
 
     def setup_commands(self, parser):
         # Node subcommands
@@ -290,6 +290,7 @@ class NodeCommands(Commands):
             "node_name",
             help="Name of the node to remove the net interface"
         ).completer = self.node_completer
+        Commands.add_parallel_argument(p_delete_netinterface)
         p_delete_netinterface.add_argument(
             "interface_name",
             nargs='+',
@@ -311,6 +312,7 @@ class NodeCommands(Commands):
                               choices=node_groupby).completer = node_group_completer
         p_lnodes.add_argument('-N', '--nodes', nargs='+', type=str,
                               help='Filter by list of nodes').completer = self.node_completer
+        self.add_table_arguments(p_lnodes, node_groupby)
         p_lnodes.set_defaults(func=self.list)
 
         # list netinterface
@@ -421,21 +423,31 @@ class NodeCommands(Commands):
             "NO_STLT_CONN": ("OFFLINE(NO CONNECTION TO SATELLITE)", Color.RED)
         }
 
-        tbl.set_groupby(args.groupby if args.groupby else [tbl.header_name(0)])
+        tbl.set_groupby(args.groupby if args.groupby or args.sort_by else [tbl.header_name(0)])
+        tbl.set_columns(args.columns)
+        tbl.set_sortby(args.sort_by)
+        tbl.set_window(args.offset, args.limit, args.page)
+        show_addresses = tbl.shows("Addresses")
+        show_state = tbl.shows("State")
 
         node_list = [x for x in lstmsg.nodes if x.name in args.nodes] if args.nodes else lstmsg.nodes
         for node in node_list:
             # concat a ip list with satellite connection indicator
             active_ip = ""
-            for net_if in node.net_interfaces:
-                if net_if.is_active and net_if.stlt_port:
-                    active_ip = net_if.address + ":" + str(net_if.stlt_port) + " (" + net_if.stlt_encryption_type + ")"
-            conn_stat = conn_stat_dict[node.connection_status]
+            if show_addresses:
+                for net_if in node.net_interfaces:
+                    if net_if.is_active and net_if.stlt_port:
+                        active_ip = net_if.address + ":" + str(net_if.stlt_port) + \
+                            " (" + net_if.stlt_encryption_type + ")"
+            state = ""
+            if show_state:
+                conn_stat = conn_stat_dict[node.connection_status]
+                state = tbl.color_cell(conn_stat[0], conn_stat[1])
             tbl.add_row([
                 node.name,
                 node.type,
                 active_ip,
-                tbl.color_cell(conn_stat[0], conn_stat[1])
+                state
             ])
         tbl.show()
 
@@ -657,6 +669,8 @@ class NodeCommands(Commands):
         return self.handle_replies(args, replies)
 
     def delete_netif(self, args):
-        # execute delete netinterfaces and flatten result list
-        replies = [x for subx in args.interface_name for x in self._linstor.netinterface_delete(args.node_name, subx)]
-        return self.handle_replies(args, replies)
+        # execute delete netinterfaces, one call per interface
+        return self.run_calls(
+            args,
+            [lambda api, netif=netif: api.netinterface_delete(args.node_name, netif) for netif in args.interface_name]
+        )
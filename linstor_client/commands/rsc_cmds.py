@@ -39,8 +39,8 @@ class ResourceCommands(Commands):
         linstor_client.TableHeader("State", Color.DARKGREEN, alignment_text=linstor_client.TableHeader.ALIGN_RIGHT)
     ]
 
-    def __init__(self, state_service):
-        super(ResourceCommands, self).__init__()
+    def __init__(self, state_service, session=None):
+        super(ResourceCommands, self).__init__(session)
 
         self._state_service = state_service
 
@@ -111,6 +111,7 @@ class ResourceCommands(Commands):
             action='store_true',
             help='Do not wait for actual deletion on satellites before returning'
         )
+        Commands.add_parallel_argument(p_rm_res)
         p_rm_res.add_argument('node_name',
                               nargs="+",
                               help='Name of the node').completer = self.node_completer
@@ -141,6 +142,8 @@ class ResourceCommands(Commands):
             nargs='+',
             type=str,
             help='Filter by list of nodes').completer = self.node_completer
+        self.add_table_arguments(p_lreses, resgroupby)
+        self.add_sharded_list_argument(p_lreses)
         p_lreses.set_defaults(func=self.list)
 
         # list volumes
@@ -162,6 +165,8 @@ class ResourceCommands(Commands):
             nargs='+',
             type=str,
             help='Filter by list of resources').completer = self.resource_completer
+        self.add_table_arguments(p_lvlms, [x.name for x in VolumeCommands._volume_headers])
+        self.add_sharded_list_argument(p_lvlms)
         p_lvlms.set_defaults(func=self.list_volumes)
 
         # show properties
@@ -376,48 +381,56 @@ class ResourceCommands(Commands):
     def delete(self, args):
         async_flag = vars(args)["async"]
 
-        # execute delete resource and flatten result list
-        replies = [x for subx in args.node_name for x in self._linstor.resource_delete(subx, args.name, async_flag)]
-        return self.handle_replies(args, replies)
-
-    def show(self, args, lstmsg):
-        rsc_dfns = self._linstor.resource_dfn_list(query_volume_definitions=False)
-        if isinstance(rsc_dfns[0], linstor.ApiCallResponse):
-            return self.handle_replies(args, rsc_dfns)
-        rsc_dfns = rsc_dfns[0].resource_definitions
-
-        rsc_dfn_map = {x.name: x for x in rsc_dfns}
-        rsc_state_lkup = {x.node_name + x.name: x for x in lstmsg.resource_states}
+        # execute delete resource, one call per node
+        return self.run_calls(
+            args,
+            [lambda api, node=node: api.resource_delete(node, args.name, async_flag) for node in args.node_name]
+        )
 
+    def show(self, args, lstmsgs):
+        """
+        :param args: parsed arguments
+        :param lstmsgs: resource list responses, e.g. one per node
+        """
         tbl = linstor_client.Table(utf8=not args.no_utf8, colors=not args.no_color, pastable=args.pastable)
         for hdr in ResourceCommands._resource_headers:
             tbl.add_header(hdr)
 
-        tbl.set_groupby(args.groupby if args.groupby else [ResourceCommands._resource_headers[0].name])
+        tbl.set_groupby(args.groupby if args.groupby or args.sort_by else [ResourceCommands._resource_headers[0].name])
+        tbl.set_columns(args.columns)
+        tbl.set_sortby(args.sort_by)
+        tbl.set_window(args.offset, args.limit, args.page)
 
+        rsc_dfn_map = None
+        if tbl.shows("Port"):  # the port is a property of the resource definition
+            rsc_dfns = self._linstor.resource_dfn_list(query_volume_definitions=False)
+            if isinstance(rsc_dfns[0], linstor.ApiCallResponse):
+                return self.handle_replies(args, rsc_dfns)
+            rsc_dfn_map = {x.name: x for x in rsc_dfns[0].resource_definitions}
+
+        for lstmsg in lstmsgs:
+            self._add_resource_rows(tbl, lstmsg, rsc_dfn_map)
+        tbl.show()
+
+    @classmethod
+    def _add_resource_rows(cls, tbl, lstmsg, rsc_dfn_map):
+        """
+        :param linstor_client.Table tbl: table to add the rows to
+        :param lstmsg: resource list response
+        :param dict rsc_dfn_map: resource definitions by name, None if the port is not shown
+        """
+        show_state = tbl.shows("Usage") or tbl.shows("State")
+        rsc_state_lkup = {x.node_name + x.name: x for x in lstmsg.resource_states} if show_state else {}
         for rsc in lstmsg.resources:
             rsc_dfn_port = ''
-            if rsc.name in rsc_dfn_map:
+            if rsc_dfn_map is not None and rsc.name in rsc_dfn_map:
                 drbd_data = rsc_dfn_map[rsc.name].drbd_data
                 rsc_dfn_port = drbd_data.port if drbd_data else ""
-            marked_delete = apiconsts.FLAG_DELETE in rsc.flags
-            rsc_state_obj = rsc_state_lkup.get(rsc.node_name + rsc.name)
-            rsc_state = tbl.color_cell("Unknown", Color.YELLOW)
+            rsc_state = ""
             rsc_usage = ""
-            if marked_delete:
-                rsc_state = tbl.color_cell("DELETING", Color.RED)
-            elif rsc_state_obj:
-                if rsc_state_obj.in_use is not None and rsc_state_obj.in_use:
-                    rsc_usage = tbl.color_cell("InUse", Color.GREEN)
-                else:
-                    rsc_usage = "Unused"
-                for vlm in rsc.volumes:
-                    vlm_state = VolumeCommands.get_volume_state(rsc_state_obj.volume_states,
-                                                                  vlm.number) if rsc_state_obj else None
-                    state_txt, color = VolumeCommands.volume_state_cell(vlm_state, rsc.flags, vlm.flags)
-                    rsc_state = tbl.color_cell(state_txt, color)
-                    if color is not None:
-                        break
+            if show_state:
+                rsc_state_obj = rsc_state_lkup.get(rsc.node_name + rsc.name)
+                rsc_state, rsc_usage = cls._resource_state_cells(tbl, rsc, rsc_state_obj)
             tbl.add_row([
                 rsc.name,
                 rsc.node_name,
@@ -425,16 +438,43 @@ class ResourceCommands(Commands):
                 rsc_usage,
                 rsc_state
             ])
-        tbl.show()
+
+    @classmethod
+    def _resource_state_cells(cls, tbl, rsc, rsc_state_obj):
+        """
+        :return: the State and Usage cells of a resource
+        :rtype: (str, str)
+        """
+        rsc_state = tbl.color_cell("Unknown", Color.YELLOW)
+        rsc_usage = ""
+        if apiconsts.FLAG_DELETE in rsc.flags:
+            rsc_state = tbl.color_cell("DELETING", Color.RED)
+        elif rsc_state_obj:
+            if rsc_state_obj.in_use is not None and rsc_state_obj.in_use:
+                rsc_usage = tbl.color_cell("InUse", Color.GREEN)
+            else:
+                rsc_usage = "Unused"
+            for vlm in rsc.volumes:
+                vlm_state = VolumeCommands.get_volume_state(rsc_state_obj.volume_states, vlm.number)
+                state_txt, color = VolumeCommands.volume_state_cell(vlm_state, rsc.flags, vlm.flags)
+                rsc_state = tbl.color_cell(state_txt, color)
+                if color is not None:
+                    break
+        return rsc_state, rsc_usage
 
     def list(self, args):
-        lstmsg = self._linstor.resource_list(filter_by_nodes=args.nodes, filter_by_resources=args.resources)
-        return self.output_list(args, lstmsg, self.show)
+        return self.output_sharded_list(
+            args,
+            lambda api, nodes: api.resource_list(filter_by_nodes=nodes, filter_by_resources=args.resources),
+            self.show
+        )
 
     def list_volumes(self, args):
-        lstmsg = self._linstor.volume_list(args.nodes, args.storpools, args.resources)
-
-        return self.output_list(args, lstmsg, VolumeCommands.show_volumes)
+        return self.output_sharded_list(
+            args,
+            lambda api, nodes: api.volume_list(nodes, args.storpools, args.resources),
+            VolumeCommands.show_volumes
+        )
 
     @classmethod
     def _props_list(cls, args, lstmsg):
@@ -22,8 +22,8 @@ class ResourceConnectionCommands(Commands):
         LONG = "path"
         SHORT = "p"
 
-    def __init__(self):
-        super(ResourceConnectionCommands, self).__init__()
+    def __init__(self, session=None):
+        super(ResourceConnectionCommands, self).__init__(session)
 
     def setup_commands(self, parser):
         subcmds = [
@@ -64,6 +64,7 @@ class ResourceConnectionCommands(Commands):
             'resource_name',
             help="Resource name"
         ).completer = self.resource_completer
+        self.add_table_arguments(p_lresconn, rescon_groubby)
         p_lresconn.set_defaults(func=self.list)
 
         # show properties
@@ -242,13 +243,19 @@ class ResourceConnectionCommands(Commands):
         tbl = Table(utf8=not args.no_utf8, colors=not args.no_color, pastable=args.pastable)
         tbl.add_headers(ResourceConnectionCommands._headers)
 
-        tbl.set_groupby(args.groupby if args.groupby else [ResourceConnectionCommands._headers[0].name])
+        tbl.set_groupby(args.groupby if args.groupby or args.sort_by else [ResourceConnectionCommands._headers[0].name])
+        tbl.set_columns(args.columns)
+        tbl.set_sortby(args.sort_by)
+        tbl.set_window(args.offset, args.limit, args.page)
+        show_props = tbl.shows("Properties")
 
         props_str_size = 30
 
         for rsc_con in [x for x in lstmsg.resource_connections if "DELETED" not in x.flags]:
-            opts = [os.path.basename(x) + '=' + rsc_con.properties[x] for x in rsc_con.properties]
-            props_str = ",".join(opts)
+            props_str = ""
+            if show_props:
+                opts = [os.path.basename(x) + '=' + rsc_con.properties[x] for x in rsc_con.properties]
+                props_str = ",".join(opts)
             tbl.add_row([
                 rsc_con.node_a,
                 rsc_con.node_b,
@@ -18,8 +18,8 @@ class ResourceDefinitionCommands(Commands):
         linstor_client.TableHeader("State", color=Color.DARKGREEN)
     ]
 
-    def __init__(self):
-        super(ResourceDefinitionCommands, self).__init__()
+    def __init__(self, session=None):
+        super(ResourceDefinitionCommands, self).__init__(session)
 
     def setup_commands(self, parser):
         subcmds = [
@@ -95,6 +95,7 @@ class ResourceDefinitionCommands(Commands):
             action='store_true',
             help='Do not wait for actual deletion on satellites before returning'
         )
+        Commands.add_parallel_argument(p_rm_res_dfn)
         p_rm_res_dfn.add_argument(
             'name',
             nargs="+",
@@ -115,6 +116,7 @@ class ResourceDefinitionCommands(Commands):
         p_lrscdfs.add_argument('-R', '--resources', nargs='+', type=str,
                                help='Filter by list of resources').completer = self.resource_dfn_completer
         p_lrscdfs.add_argument('-e', '--external-name', action="store_true", help='Show user specified name.')
+        self.add_table_arguments(p_lrscdfs, rsc_dfn_groupby)
         p_lrscdfs.set_defaults(func=self.list)
 
         # show properties
@@ -179,9 +181,11 @@ class ResourceDefinitionCommands(Commands):
     def delete(self, args):
         async_flag = vars(args)["async"]
 
-        # execute delete rscdfns and flatten result list
-        replies = [x for subx in args.name for x in self._linstor.resource_dfn_delete(subx, async_flag)]
-        return self.handle_replies(args, replies)
+        # execute delete rscdfns, one call per resource definition
+        return self.run_calls(
+            args,
+            [lambda api, name=name: api.resource_dfn_delete(name, async_flag) for name in args.name]
+        )
 
     @classmethod
     def show(cls, args, lstmsg):
@@ -195,16 +199,23 @@ class ResourceDefinitionCommands(Commands):
         for hdr in rsc_dfn_hdr:
             tbl.add_header(hdr)
 
-        tbl.set_groupby(args.groupby if args.groupby else [tbl.header_name(0)])
+        tbl.set_groupby(args.groupby if args.groupby or args.sort_by else [tbl.header_name(0)])
+        if args.columns and args.external_name:
+            tbl.set_columns(args.columns + ["External"])
+        else:
+            tbl.set_columns(args.columns)
+        tbl.set_sortby(args.sort_by)
+        tbl.set_window(args.offset, args.limit, args.page)
+        show_port = tbl.shows("Port")
 
         for rsc_dfn in cls.filter_rsc_dfn_list(lstmsg.resource_definitions, args.resources):
-            drbd_data = rsc_dfn.drbd_data
             row = [rsc_dfn.name]
             if args.external_name:
                 if isinstance(rsc_dfn.external_name, str):
                     row.append(rsc_dfn.external_name)
                 else:
                     row.append(rsc_dfn.external_name)
+            drbd_data = rsc_dfn.drbd_data if show_port else None
             row.append(drbd_data.port if drbd_data else "")
             row.append(rsc_dfn.resource_group_name)
             row.append(tbl.color_cell("DELETING", Color.RED)
@@ -15,8 +15,8 @@ class ResourceGroupCommands(Commands):
         linstor_client.TableHeader("Description")
     ]
 
-    def __init__(self):
-        super(ResourceGroupCommands, self).__init__()
+    def __init__(self, session=None):
+        super(ResourceGroupCommands, self).__init__(session)
 
     def setup_commands(self, parser):
         subcmds = [
@@ -100,6 +100,7 @@ class ResourceGroupCommands(Commands):
                                 choices=rsc_grp_groupby).completer = rsc_grp_group_completer
         p_lrscgrps.add_argument('-R', '--resources', nargs='+', type=str,
                                 help='Filter by list of resource groups').completer = self.resource_grp_completer
+        self.add_table_arguments(p_lrscgrps, rsc_grp_groupby)
         p_lrscgrps.set_defaults(func=self.list)
         #  ------------ LIST END
 
@@ -213,14 +214,21 @@ class ResourceGroupCommands(Commands):
         for hdr in self._rsc_grp_headers:
             tbl.add_header(hdr)
 
-        tbl.set_groupby(args.groupby if args.groupby else [tbl.header_name(0)])
+        tbl.set_groupby(args.groupby if args.groupby or args.sort_by else [tbl.header_name(0)])
+        tbl.set_columns(args.columns)
+        tbl.set_sortby(args.sort_by)
+        tbl.set_window(args.offset, args.limit, args.page)
+        show_vlm_nrs = tbl.shows("VlmNrs")  # needs a volume group list call per resource group
 
         for rsc_grp in rsc_grps.resource_groups:
-            vlm_grps = self.get_linstorapi().volume_group_list_raise(rsc_grp.name).volume_groups
+            vlm_nrs = ""
+            if show_vlm_nrs:
+                vlm_grps = self.get_linstorapi().volume_group_list_raise(rsc_grp.name).volume_groups
+                vlm_nrs = ",".join([str(x.number) for x in vlm_grps])
             row = [
                 rsc_grp.name,
-                str(rsc_grp.select_filter),
-                ",".join([str(x.number) for x in vlm_grps]),
+                str(rsc_grp.select_filter) if tbl.shows("SelectFilter") else "",
+                vlm_nrs,
                 rsc_grp.description
             ]
             tbl.add_row(row)
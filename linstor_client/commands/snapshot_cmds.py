@@ -4,17 +4,24 @@ import linstor_client
 from linstor_client.commands import Commands
 from linstor_client.consts import Color
 from linstor.sharedconsts import FLAG_DELETE, FLAG_SUCCESSFUL, FLAG_FAILED_DEPLOYMENT, FLAG_FAILED_DISCONNECT
-from linstor_client.utils import Output
 from linstor import SizeCalc
 
 
 class SnapshotCommands(Commands):
+    _snapshot_headers = [
+        linstor_client.TableHeader("ResourceName"),
+        linstor_client.TableHeader("SnapshotName"),
+        linstor_client.TableHeader("NodeNames"),
+        linstor_client.TableHeader("Volumes"),
+        linstor_client.TableHeader("State", color=Color.DARKGREEN)
+    ]
+
     class Rollback(object):
         LONG = "rollback"
         SHORT = "rb"
 
-    def __init__(self):
-        super(SnapshotCommands, self).__init__()
+    def __init__(self, session=None):
+        super(SnapshotCommands, self).__init__(session)
 
     def setup_commands(self, parser):
         subcmds = [
@@ -107,6 +114,7 @@ class SnapshotCommands(Commands):
             description=' Prints a list of all snapshots known to linstor. '
                         'By default, the list is printed as a human readable table.')
         p_lsnapshots.add_argument('-p', '--pastable', action="store_true", help='Generate pastable output')
+        self.add_table_arguments(p_lsnapshots, [x.name for x in self._snapshot_headers])
         p_lsnapshots.set_defaults(func=self.list)
 
         # volume definition commands
@@ -224,34 +232,43 @@ class SnapshotCommands(Commands):
         replies = self._linstor.snapshot_rollback(args.resource_definition_name, args.snapshot_name)
         return self.handle_replies(args, replies)
 
+    @staticmethod
+    def snapshot_state_cell(snapshot_flags):
+        """
+        Determines the state of a snapshot definition for table display.
+
+        :param snapshot_flags: snapshot definition flags
+        :return: A tuple (state_text, color)
+        """
+        if FLAG_DELETE in snapshot_flags:
+            return "DELETING", Color.RED
+        elif FLAG_FAILED_DEPLOYMENT in snapshot_flags:
+            return "Failed", Color.RED
+        elif FLAG_FAILED_DISCONNECT in snapshot_flags:
+            return "Satellite disconnected", Color.RED
+        elif FLAG_SUCCESSFUL in snapshot_flags:
+            return "Successful", Color.DARKGREEN
+        return "Incomplete", Color.DARKBLUE
+
     @classmethod
     def show(cls, args, lstmsg):
         tbl = linstor_client.Table(utf8=not args.no_utf8, colors=not args.no_color, pastable=args.pastable)
-        tbl.add_column("ResourceName")
-        tbl.add_column("SnapshotName")
-        tbl.add_column("NodeNames")
-        tbl.add_column("Volumes")
-        tbl.add_column("State", color=Output.color(Color.DARKGREEN, args.no_color))
+        tbl.add_headers(cls._snapshot_headers)
+        tbl.set_columns(args.columns)
+        tbl.set_sortby(args.sort_by)
+        tbl.set_window(args.offset, args.limit, args.page)
+        show_nodes = tbl.shows("NodeNames")
+        show_volumes = tbl.shows("Volumes")
+        show_state = tbl.shows("State")
         for snapshot_dfn in lstmsg.snapshots:
-            if FLAG_DELETE in snapshot_dfn.flags:
-                state_cell = tbl.color_cell("DELETING", Color.RED)
-            elif FLAG_FAILED_DEPLOYMENT in snapshot_dfn.flags:
-                state_cell = tbl.color_cell("Failed", Color.RED)
-            elif FLAG_FAILED_DISCONNECT in snapshot_dfn.flags:
-                state_cell = tbl.color_cell("Satellite disconnected", Color.RED)
-            elif FLAG_SUCCESSFUL in snapshot_dfn.flags:
-                state_cell = tbl.color_cell("Successful", Color.DARKGREEN)
-            else:
-                state_cell = tbl.color_cell("Incomplete", Color.DARKBLUE)
-
             tbl.add_row([
                 snapshot_dfn.resource_name,
                 snapshot_dfn.name,
-                ", ".join([node_name for node_name in snapshot_dfn.nodes]),
+                ", ".join([node_name for node_name in snapshot_dfn.nodes]) if show_nodes else "",
                 ", ".join([
                     str(snapshot_vlm_dfn.number) + ": " + SizeCalc.approximate_size_string(snapshot_vlm_dfn.size)
-                    for snapshot_vlm_dfn in snapshot_dfn.snapshot_volume_definitions]),
-                state_cell
+                    for snapshot_vlm_dfn in snapshot_dfn.snapshot_volume_definitions]) if show_volumes else "",
+                tbl.color_cell(*cls.snapshot_state_cell(snapshot_dfn.flags)) if show_state else ""
             ])
         tbl.show()
 
@@ -58,8 +58,8 @@ class StoragePoolCommands(Commands):
         linstor_client.TableHeader("State")
     ]
 
-    def __init__(self):
-        super(StoragePoolCommands, self).__init__()
+    def __init__(self, session=None):
+        super(StoragePoolCommands, self).__init__(session)
 
     @classmethod
     def _create_pool_args(cls, parser, shared_space=True):
@@ -250,6 +250,7 @@ class StoragePoolCommands(Commands):
             action="store_true",
             help='Unless this option is used, linstor will issue a safety question '
             'that must be answered with yes, otherwise the operation is canceled.')
+        Commands.add_parallel_argument(p_rm_storpool)
         p_rm_storpool.add_argument(
             'node_name',
             nargs="+",
@@ -274,6 +275,8 @@ class StoragePoolCommands(Commands):
                                  help='Filter by list of storage pools').completer = self.storage_pool_completer
         p_lstorpool.add_argument('-n', '--nodes', nargs='+', type=str,
                                  help='Filter by list of nodes').completer = self.node_completer
+        self.add_table_arguments(p_lstorpool, storpoolgroupby)
+        self.add_sharded_list_argument(p_lstorpool)
         p_lstorpool.set_defaults(func=self.list)
 
         # show properties
@@ -344,38 +347,68 @@ class StoragePoolCommands(Commands):
         return self.handle_replies(args, replies)
 
     def delete(self, args):
-        # execute delete storpooldfns and flatten result list
-        replies = [x for subx in args.node_name for x in self._linstor.storage_pool_delete(subx, args.name)]
-        return self.handle_replies(args, replies)
+        # execute delete storpools, one call per node
+        return self.run_calls(
+            args,
+            [lambda api, node=node: api.storage_pool_delete(node, args.name) for node in args.node_name]
+        )
 
-    def show(self, args, lstmsg):
+    def show(self, args, lstmsgs):
+        """
+        :param args: parsed arguments
+        :param lstmsgs: storage pool list responses, e.g. one per node
+        """
         tbl = linstor_client.Table(utf8=not args.no_utf8, colors=not args.no_color, pastable=args.pastable)
         for hdr in self._stor_pool_headers:
             tbl.add_header(hdr)
 
-        storage_pool_resp = lstmsg  # type: StoragePoolListResponse
-
-        tbl.set_groupby(args.groupby if args.groupby else [self._stor_pool_headers[0].name])
+        tbl.set_groupby(args.groupby if args.groupby or args.sort_by else [self._stor_pool_headers[0].name])
+        tbl.set_columns(args.columns)
+        tbl.set_sortby(args.sort_by)
+        tbl.set_window(args.offset, args.limit, args.page)
 
         errors = []
+        for lstmsg in lstmsgs:
+            self._add_storage_pool_rows(tbl, lstmsg, errors)
+        tbl.show()
+        for err in errors:
+            Output.handle_ret(
+                err,
+                warn_as_error=args.warn_as_error,
+                no_color=args.no_color
+            )
+
+    def _add_storage_pool_rows(self, tbl, lstmsg, errors):
+        storage_pool_resp = lstmsg  # type: StoragePoolListResponse
+        show_pool_name = tbl.shows("PoolName")
+        show_capacity = tbl.shows("FreeCapacity") or tbl.shows("TotalCapacity")
+        show_snapshots = tbl.shows("SupportsSnapshots")
+        show_state = tbl.shows("State")
         for storpool in storage_pool_resp.storage_pools:
-            driver_device = linstor.StoragePoolDriver.storage_props_to_driver_pool(
-                storpool.provider_kind,
-                storpool.properties)
+            driver_device = ""
+            if show_pool_name:
+                driver_device = linstor.StoragePoolDriver.storage_props_to_driver_pool(
+                    storpool.provider_kind,
+                    storpool.properties)
 
-            supports_snapshots = storpool.static_traits.get(KEY_STOR_POOL_SUPPORTS_SNAPSHOTS, '')
+            supports_snapshots = ""
+            if show_snapshots:
+                supports_snapshots = storpool.static_traits.get(KEY_STOR_POOL_SUPPORTS_SNAPSHOTS, '')
 
             free_capacity = ""
             total_capacity = ""
-            if not storpool.is_diskless() and storpool.free_space is not None:
+            if show_capacity and not storpool.is_diskless() and storpool.free_space is not None:
                 free_capacity = SizeCalc.approximate_size_string(storpool.free_space.free_capacity)
                 total_capacity = SizeCalc.approximate_size_string(storpool.free_space.total_capacity)
 
-            for error in storpool.reports:
+            reports = storpool.reports
+            for error in reports:
                 if error not in errors:
                     errors.append(error)
 
-            state_str, state_color = self.get_replies_state(storpool.reports)
+            state = ""
+            if show_state:
+                state = tbl.color_cell(*self.get_replies_state(reports))
             tbl.add_row([
                 storpool.name,
                 storpool.node_name,
@@ -384,19 +417,15 @@ class StoragePoolCommands(Commands):
                 free_capacity,
                 total_capacity,
                 supports_snapshots,
-                tbl.color_cell(state_str, state_color)
+                state
             ])
-        tbl.show()
-        for err in errors:
-            Output.handle_ret(
-                err,
-                warn_as_error=args.warn_as_error,
-                no_color=args.no_color
-            )
 
     def list(self, args):
-        lstmsg = self._linstor.storage_pool_list(args.nodes, args.storpools)
-        return self.output_list(args, lstmsg, self.show)
+        return self.output_sharded_list(
+            args,
+            lambda api, nodes: api.storage_pool_list(nodes, args.storpools),
+            self.show
+        )
 
     @classmethod
     def _props_list(cls, args, lstmsg):
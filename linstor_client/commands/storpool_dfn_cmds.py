@@ -8,8 +8,8 @@ from linstor.sharedconsts import KEY_STOR_POOL_DFN_MAX_OVERSUBSCRIPTION_RATIO
 
 
 class StoragePoolDefinitionCommands(Commands):
-    def __init__(self):
-        super(StoragePoolDefinitionCommands, self).__init__()
+    def __init__(self, session=None):
+        super(StoragePoolDefinitionCommands, self).__init__(session)
 
     def setup_commands(self, parser):
         # storpool subcommands
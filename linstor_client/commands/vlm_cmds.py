@@ -6,13 +6,23 @@ import linstor_client.argparse.argparse as argparse
 
 from linstor import SizeCalc
 from linstor.responses import Resource
-from linstor_client import Table
+from linstor_client import Table, TableHeader
 from linstor_client.commands import Commands
-from linstor_client.utils import Output
 from linstor_client.consts import Color
 
 
 class VolumeCommands(Commands):
+    _volume_headers = [
+        TableHeader("Node"),
+        TableHeader("Resource"),
+        TableHeader("StoragePool"),
+        TableHeader("VolumeNr"),
+        TableHeader("MinorNr"),
+        TableHeader("DeviceName"),
+        TableHeader("Allocated"),
+        TableHeader("InUse", color=Color.DARKGREEN),
+        TableHeader("State", color=Color.DARKGREEN, alignment_text=TableHeader.ALIGN_RIGHT)
+    ]
 
     def setup_commands(self, parser):
         """
@@ -56,6 +66,8 @@ class VolumeCommands(Commands):
             nargs='+',
             type=str,
             help='Filter by list of resources').completer = self.resource_completer
+        self.add_table_arguments(p_lvlms, [x.name for x in self._volume_headers])
+        self.add_sharded_list_argument(p_lvlms)
         p_lvlms.set_defaults(func=self.list_volumes)
 
         # show properties
@@ -138,54 +150,72 @@ class VolumeCommands(Commands):
         return state, tbl_color
 
     @classmethod
-    def show_volumes(cls, args, lstmsg):
+    def show_volumes(cls, args, lstmsgs):
+        """
+        :param args: parsed arguments
+        :param lstmsgs: volume list responses, e.g. one per node
+        """
         tbl = Table(utf8=not args.no_utf8, colors=not args.no_color, pastable=args.pastable)
-        tbl.add_column("Node")
-        tbl.add_column("Resource")
-        tbl.add_column("StoragePool")
-        tbl.add_column("VolumeNr")
-        tbl.add_column("MinorNr")
-        tbl.add_column("DeviceName")
-        tbl.add_column("Allocated")
-        tbl.add_column("InUse", color=Output.color(Color.DARKGREEN, args.no_color))
-        tbl.add_column("State", color=Output.color(Color.DARKGREEN, args.no_color), just_txt='>')
-
-        rsc_state_lkup = {x.node_name + x.name: x for x in lstmsg.resource_states}
+        tbl.add_headers(cls._volume_headers)
+        tbl.set_columns(args.columns)
+        tbl.set_sortby(args.sort_by)
+        tbl.set_window(args.offset, args.limit, args.page)
+
+        for lstmsg in lstmsgs:
+            cls._add_volume_rows(tbl, lstmsg)
+        tbl.show()
+
+    @classmethod
+    def _add_volume_rows(cls, tbl, lstmsg):
+        show_usage = tbl.shows("InUse")
+        show_state = tbl.shows("State")
+        show_minor = tbl.shows("MinorNr")
+        show_allocated = tbl.shows("Allocated")
+        rsc_state_lkup = {x.node_name + x.name: x for x in lstmsg.resource_states} \
+            if show_usage or show_state else {}
 
         for rsc in lstmsg.resources:
             rsc_state = rsc_state_lkup.get(rsc.node_name + rsc.name)
             rsc_usage = ""
-            if rsc_state:
+            if rsc_state and show_usage:
                 if rsc_state.in_use:
                     rsc_usage = tbl.color_cell("InUse", Color.GREEN)
                 else:
                     rsc_usage = "Unused"
             for vlm in rsc.volumes:
-                vlm_state = cls.get_volume_state(
-                    rsc_state.volume_states,
-                    vlm.number
-                ) if rsc_state else None
-                state_txt, color = cls.volume_state_cell(vlm_state, rsc.flags, vlm.flags)
-                state = tbl.color_cell(state_txt, color) if color else state_txt
-                vlm_drbd_data = vlm.drbd_data
+                state = ""
+                if show_state:
+                    vlm_state = cls.get_volume_state(
+                        rsc_state.volume_states,
+                        vlm.number
+                    ) if rsc_state else None
+                    state_txt, color = cls.volume_state_cell(vlm_state, rsc.flags, vlm.flags)
+                    state = tbl.color_cell(state_txt, color) if color else state_txt
+                minor = ""
+                if show_minor:
+                    vlm_drbd_data = vlm.drbd_data
+                    minor = str(vlm_drbd_data.drbd_volume_definition.minor) if vlm_drbd_data else ""
+                allocated = ""
+                if show_allocated and vlm.allocated_size:
+                    allocated = SizeCalc.approximate_size_string(vlm.allocated_size)
                 tbl.add_row([
                     rsc.node_name,
                     rsc.name,
                     vlm.storage_pool_name,
                     str(vlm.number),
-                    str(vlm_drbd_data.drbd_volume_definition.minor) if vlm_drbd_data else "",
+                    minor,
                     vlm.device_path,
-                    SizeCalc.approximate_size_string(vlm.allocated_size) if vlm.allocated_size else "",
+                    allocated,
                     rsc_usage,
                     state
                 ])
 
-        tbl.show()
-
     def list_volumes(self, args):
-        lstmsg = self._linstor.volume_list(args.nodes, args.storpools, args.resources)
-
-        return self.output_list(args, lstmsg, VolumeCommands.show_volumes)
+        return self.output_sharded_list(
+            args,
+            lambda api, nodes: api.volume_list(nodes, args.storpools, args.resources),
+            VolumeCommands.show_volumes
+        )
 
     @classmethod
     def _props_list(cls, args, lstmsg):
@@ -30,8 +30,8 @@ class VolumeDefinitionCommands(Commands):
         'is the smallest natural number of kibibytes that is large enough to ' \
         'accommodate a volume of the requested size in the specified size unit.'
 
-    def __init__(self):
-        super(VolumeDefinitionCommands, self).__init__()
+    def __init__(self, session=None):
+        super(VolumeDefinitionCommands, self).__init__(session)
 
     def setup_commands(self, parser):
         # volume definition subcommands
@@ -119,6 +119,7 @@ class VolumeDefinitionCommands(Commands):
                              choices=vlm_dfn_groupby).completer = vlm_dfn_group_completer
         p_lvols.add_argument('-R', '--resources', nargs='+', type=str,
                              help='Filter by list of resources').completer = self.resource_dfn_completer
+        self.add_table_arguments(p_lvols, vlm_dfn_groupby)
         p_lvols.set_defaults(func=self.list)
 
         # show properties
@@ -216,7 +217,12 @@ class VolumeDefinitionCommands(Commands):
         for hdr in cls._vlm_dfn_headers:
             tbl.add_header(hdr)
 
-        tbl.set_groupby(args.groupby if args.groupby else [tbl.header_name(0)])
+        tbl.set_groupby(args.groupby if args.groupby or args.sort_by else [tbl.header_name(0)])
+        tbl.set_columns(args.columns)
+        tbl.set_sortby(args.sort_by)
+        tbl.set_window(args.offset, args.limit, args.page)
+        show_minor = tbl.shows("VolumeMinor")
+        show_size = tbl.shows("Size")
         for rsc_dfn in cls.filter_rsc_dfn_list(lstmsg.resource_definitions, args.resources):
             for vlmdfn in rsc_dfn.volume_definitions:
                 state = tbl.color_cell("ok", Color.DARKGREEN)
@@ -225,12 +231,12 @@ class VolumeDefinitionCommands(Commands):
                 elif FLAG_RESIZE in vlmdfn.flags:
                     state = tbl.color_cell("resizing", Color.DARKPINK)
 
-                drbd_data = vlmdfn.drbd_data
+                drbd_data = vlmdfn.drbd_data if show_minor else None
                 tbl.add_row([
                     rsc_dfn.name,
                     vlmdfn.number,
                     drbd_data.minor if drbd_data else "",
-                    SizeCalc.approximate_size_string(vlmdfn.size),
+                    SizeCalc.approximate_size_string(vlmdfn.size) if show_size else "",
                     state
                 ])
         tbl.show()
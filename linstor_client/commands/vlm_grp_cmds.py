@@ -12,8 +12,8 @@ class VolumeGroupCommands(Commands):
         linstor_client.TableHeader("VolumeNr")
     ]
 
-    def __init__(self):
-        super(VolumeGroupCommands, self).__init__()
+    def __init__(self, session=None):
+        super(VolumeGroupCommands, self).__init__(session)
 
     def setup_commands(self, parser):
         subcmds = [
@@ -0,0 +1,291 @@
+from __future__ import print_function
+
+import sys
+import time
+
+import linstor_client.argparse.argparse as argparse
+from linstor_client.commands import Commands
+from linstor_client.consts import Color, ExitCode
+from linstor_client.utils import Output
+
+# upper bound of the poll interval in seconds, it doubles after every poll up to this
+MAX_POLL_INTERVAL = 10.0
+
+
+class _ListFailed(Exception):
+    def __init__(self, replies):
+        super(_ListFailed, self).__init__()
+        self.replies = replies
+
+
+class WaitCommands(Commands):
+    """
+    Waits for objects to reach a state, e.g. after commands given --async.
+
+    Every poll issues one list call for all given objects, the interval between polls doubles
+    up to MAX_POLL_INTERVAL until the deadline is reached.
+    """
+    class Resource(object):
+        LONG = "resource"
+        SHORT = "r"
+
+    class ResourceDefinitionDeleted(object):
+        LONG = "resource-definition-deleted"
+        SHORT = "rdd"
+
+    class Snapshot(object):
+        LONG = "snapshot"
+        SHORT = "s"
+
+    class Node(object):
+        LONG = "node"
+        SHORT = "n"
+
+    class StoragePool(object):
+        LONG = "storage-pool"
+        SHORT = "sp"
+
+    def __init__(self, session=None):
+        super(WaitCommands, self).__init__(session)
+
+    @staticmethod
+    def _add_poll_arguments(parser):
+        parser.add_argument(
+            '--deadline',
+            type=float,
+            default=600,
+            metavar='SECONDS',
+            help='Give up if the objects did not reach the state after this many seconds (Default: %(default)s)'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0.5,
+            metavar='SECONDS',
+            help='Seconds until the first poll is repeated, the interval doubles after every poll '
+                 '(Default: %(default)s)'
+        )
+
+    def setup_commands(self, parser):
+        subcmds = [
+            self.Resource,
+            self.ResourceDefinitionDeleted,
+            self.Snapshot,
+            self.Node,
+            self.StoragePool
+        ]
+
+        wait_parser = parser.add_parser(
+            Commands.WAIT,
+            aliases=["w"],
+            formatter_class=argparse.RawTextHelpFormatter,
+            description="Wait for objects to reach a state, e.g. after commands given --async.\n"
+                        "The exit code is 0 once all objects reached the state, " + str(ExitCode.API_ERROR) +
+                        " if one of them failed and " + str(ExitCode.ILLEGAL_STATE) + " if the deadline passed."
+        )
+        wait_subp = wait_parser.add_subparsers(
+            title="wait commands",
+            metavar="",
+            description=Commands.Subcommands.generate_desc(subcmds)
+        )
+
+        p_rsc = wait_subp.add_parser(
+            self.Resource.LONG,
+            aliases=[self.Resource.SHORT],
+            description='Waits until all volumes of the resources are UpToDate on all their nodes. '
+                        'Diskless and non-DRBD volumes count once they reached their final state.')
+        self._add_poll_arguments(p_rsc)
+        p_rsc.add_argument(
+            '--nodes',
+            nargs='+',
+            help='Only wait for the resources on these nodes, all of them have to get the resources'
+        ).completer = self.node_completer
+        p_rsc.add_argument('name', nargs='+', help='Name of the resource').completer = self.resource_completer
+        p_rsc.set_defaults(func=self.wait_resource)
+
+        p_rsc_dfn = wait_subp.add_parser(
+            self.ResourceDefinitionDeleted.LONG,
+            aliases=[self.ResourceDefinitionDeleted.SHORT],
+            description='Waits until the resource definitions are deleted.')
+        self._add_poll_arguments(p_rsc_dfn)
+        p_rsc_dfn.add_argument(
+            'name',
+            nargs='+',
+            help='Name of the resource definition').completer = self.resource_dfn_completer
+        p_rsc_dfn.set_defaults(func=self.wait_resource_dfn_deleted)
+
+        p_snapshot = wait_subp.add_parser(
+            self.Snapshot.LONG,
+            aliases=[self.Snapshot.SHORT],
+            description='Waits until the snapshots are successful, fails as soon as one of them failed.')
+        self._add_poll_arguments(p_snapshot)
+        p_snapshot.add_argument(
+            'resource_definition_name',
+            help='Name of the resource definition').completer = self.resource_dfn_completer
+        p_snapshot.add_argument('snapshot_name', nargs='+', help='Name of the snapshot')
+        p_snapshot.set_defaults(func=self.wait_snapshot)
+
+        p_node = wait_subp.add_parser(
+            self.Node.LONG,
+            aliases=[self.Node.SHORT],
+            description='Waits until the nodes are online.')
+        self._add_poll_arguments(p_node)
+        p_node.add_argument('name', nargs='+', help='Name of the node').completer = self.node_completer
+        p_node.set_defaults(func=self.wait_node)
+
+        p_storpool = wait_subp.add_parser(
+            self.StoragePool.LONG,
+            aliases=[self.StoragePool.SHORT],
+            description='Waits until the storage pool exists on the nodes and reports no errors.')
+        self._add_poll_arguments(p_storpool)
+        p_storpool.add_argument('node_name', nargs='+', help='Name of the node').completer = self.node_completer
+        p_storpool.add_argument(
+            'name',
+            help='Name of the storage pool').completer = self.storage_pool_dfn_completer
+        p_storpool.set_defaults(func=self.wait_storage_pool)
+
+        self.check_subcommands(wait_subp, subcmds)
+
+    @classmethod
+    def _list(cls, replies):
+        """
+        :return: the list response of a list call
+        :raises _ListFailed: if the controller answered with api call responses
+        """
+        if cls.check_for_api_replies(replies):
+            raise _ListFailed(replies)
+        return replies[0]
+
+    def _poll(self, args, check):
+        """
+        Polls until check reports no pending objects.
+
+        :param args: parsed arguments with the poll options
+        :param check: function issuing one list call, returning (pending, failed) lists of object descriptions
+        :return: exit code
+        :rtype: int
+        """
+        deadline = time.time() + args.deadline
+        interval = args.interval
+        cache = self._session.cache if self._session is not None else None
+        while True:
+            if cache is not None:
+                cache.clear()  # in batch and interactive mode every poll has to reach the controller
+            try:
+                pending, failed = check()
+            except _ListFailed as lf:
+                return self.handle_replies(args, lf.replies)
+
+            if args.verbose:
+                for entry in pending:
+                    print("waiting for " + entry)
+            if failed:
+                for entry in failed:
+                    sys.stderr.write(Output.color_str("Failed: " + entry, Color.RED, args.no_color) + '\n')
+                return ExitCode.API_ERROR
+            if not pending:
+                return ExitCode.OK
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                for entry in pending:
+                    sys.stderr.write(Output.color_str("Timeout: " + entry, Color.YELLOW, args.no_color) + '\n')
+                return ExitCode.ILLEGAL_STATE
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, MAX_POLL_INTERVAL)
+
+    def wait_resource(self, args):
+        from linstor_client.commands.vlm_cmds import VolumeCommands
+
+        def check():
+            lstmsg = self._list(self._linstor.volume_list(filter_by_nodes=args.nodes, filter_by_resources=args.name))
+            rsc_state_lkup = {x.node_name + x.name: x for x in lstmsg.resource_states}
+            pending = []
+            for rsc_name in args.name:
+                rscs = [x for x in lstmsg.resources if x.name == rsc_name]
+                if not rscs and not args.nodes:
+                    pending.append("resource {r}: not deployed".format(r=rsc_name))
+                for node_name in set(args.nodes or []) - set(x.node_name for x in rscs):
+                    pending.append("resource {r} on {n}: not deployed".format(r=rsc_name, n=node_name))
+                for rsc in rscs:
+                    rsc_state = rsc_state_lkup.get(rsc.node_name + rsc.name)
+                    for vlm in rsc.volumes:
+                        vlm_state = VolumeCommands.get_volume_state(
+                            rsc_state.volume_states,
+                            vlm.number
+                        ) if rsc_state else None
+                        state_txt, color = VolumeCommands.volume_state_cell(vlm_state, rsc.flags, vlm.flags)
+                        if color is not None or state_txt.startswith('Resizing'):
+                            pending.append("resource {r} volume {v} on {n}: {s}".format(
+                                r=rsc.name, v=vlm.number, n=rsc.node_name, s=state_txt))
+            return pending, []
+        return self._poll(args, check)
+
+    def wait_resource_dfn_deleted(self, args):
+        def check():
+            lstmsg = self._list(self._linstor.resource_dfn_list(
+                query_volume_definitions=False,
+                filter_by_resource_definitions=args.name
+            ))
+            names = set(x.name.lower() for x in lstmsg.resource_definitions)
+            return ["resource definition {r}: exists".format(r=x) for x in args.name if x.lower() in names], []
+        return self._poll(args, check)
+
+    def wait_snapshot(self, args):
+        from linstor_client.commands.snapshot_cmds import SnapshotCommands
+
+        def check():
+            lstmsg = self._list(self._linstor.snapshot_dfn_list(filter_by_resources=[args.resource_definition_name]))
+            snapshots = dict(
+                (x.name.lower(), x) for x in lstmsg.snapshots
+                if x.resource_name.lower() == args.resource_definition_name.lower()
+            )
+            pending = []
+            failed = []
+            for snapshot_name in args.snapshot_name:
+                desc = "snapshot {r}/{s}".format(r=args.resource_definition_name, s=snapshot_name)
+                snapshot_dfn = snapshots.get(snapshot_name.lower())
+                if snapshot_dfn is None:
+                    pending.append(desc + ": not created")
+                    continue
+                state_txt, color = SnapshotCommands.snapshot_state_cell(snapshot_dfn.flags)
+                if color == Color.RED:
+                    failed.append(desc + ": " + state_txt)
+                elif color != Color.DARKGREEN:
+                    pending.append(desc + ": " + state_txt)
+            return pending, failed
+        return self._poll(args, check)
+
+    def wait_node(self, args):
+        def check():
+            lstmsg = self._list(self._linstor.node_list(filter_by_nodes=args.name))
+            nodes = dict((x.name.lower(), x) for x in lstmsg.nodes)
+            pending = []
+            for node_name in args.name:
+                node = nodes.get(node_name.lower())
+                if node is None:
+                    pending.append("node {n}: not created".format(n=node_name))
+                elif node.connection_status != 'ONLINE':
+                    pending.append("node {n}: {s}".format(n=node_name, s=node.connection_status))
+            return pending, []
+        return self._poll(args, check)
+
+    def wait_storage_pool(self, args):
+        def check():
+            lstmsg = self._list(self._linstor.storage_pool_list(
+                filter_by_nodes=args.node_name,
+                filter_by_stor_pools=[args.name]
+            ))
+            storpools = dict(
+                (x.node_name.lower(), x) for x in lstmsg.storage_pools if x.name.lower() == args.name.lower()
+            )
+            pending = []
+            for node_name in args.node_name:
+                desc = "storage pool {p} on {n}".format(p=args.name, n=node_name)
+                storpool = storpools.get(node_name.lower())
+                if storpool is None:
+                    pending.append(desc + ": not created")
+                elif any(x.is_error() for x in storpool.reports):
+                    pending.append(desc + ": " + "; ".join(x.message for x in storpool.reports if x.is_error()))
+            return pending, []
+        return self._poll(args, check)
@@ -1,3 +1,5 @@
+from linstor_client import cmdindex
+from linstor_client.consts import ExitCode
 from .commands import Commands
 
 _header = """#compdef linstor_client_main.py linstor
@@ -17,42 +19,30 @@ _header = """#compdef linstor_client_main.py linstor
 #
 # ------------------------------------------------------------------------------
 
-_linstor() {
-  local context curcontext="$curcontext" state line
-  typeset -A opt_args
-
-  local ret=1
-
-  _arguments -C '--no-utf8[No UTF8 characters in output]' '--no-color[Do not use color output]' \
-    '--machine-readable[Output in json format]' '--version[Show version]' '--disable-config[Disable config loading]' \
-    '--help[Show help]' '--timeout[Timeout in seconds]: :()' '--controllers[list of controllers to try]: :()' \
-    '1: :_linstor_cmds' \
-    '*::arg:->args' \
-  && ret=0
-
-  case $state in
-    (args)
-      curcontext="${curcontext%:*:*}:linstor-cmd-$words[1]:"
-      case $line[1] in
-"""
-
-_mid = """        *)
-          _call_function ret _linstor_cmd_$words[1] && ret=0
-          (( ret )) && _message 'no more arguments'
-        ;;
-      esac
-    ;;
-  esac
-}
-
-(( $+functions[_linstor_cmds] )) ||
-_linstor_cmds() {
-  local commands; commands=("""
-
-_footer = """  )
-  _describe -t commands 'linstor command' commands "$@"
+zmodload -F zsh/datetime p:EPOCHSECONDS
+
+typeset -gA _linstor_cache_time _linstor_cache_names
+typeset -ga _linstor_words
+typeset -g _linstor_current
+
+# Object names (nodes, resources, ...) are asked from the linstor completer of the argument and
+# kept for LINSTOR_COMPLETION_TTL seconds (default 30), so typing on does not ask the controller again.
+(( $+functions[_linstor_objects] )) ||
+_linstor_objects() {
+  local comp_line="${(j: :)_linstor_words[1,_linstor_current-1]} "
+  local key="$1 $comp_line" expl
+  if (( EPOCHSECONDS - ${_linstor_cache_time[$key]:-0} > ${LINSTOR_COMPLETION_TTL:-30} )); then
+    _linstor_cache_names[$key]="$(COMP_LINE="$comp_line" COMP_POINT=${#comp_line} _ARGCOMPLETE=1 \\
+      _ARGCOMPLETE_SUPPRESS_SPACE=1 $_linstor_words[1] 8>&1 9>/dev/null 1>/dev/null 2>/dev/null)"
+    _linstor_cache_time[$key]=$EPOCHSECONDS
+  fi
+  local -a names
+  names=( ${(ps:\\v:)_linstor_cache_names[$key]} )
+  _wanted linstor-objects expl "$2" compadd -a names
 }
+"""
 
+_footer = """
 _linstor "$@"
 
 # Local Variables:
@@ -65,81 +55,198 @@ _linstor "$@"
 """
 
 
+def _quote(value):
+    return "'" + value.replace("'", "'\\''") + "'"
+
+
+def _escape(text, special='[]:'):
+    text = text.replace('\\', '\\\\')
+    for char in special:
+        text = text.replace(char, '\\' + char)
+    return text
+
+
+def _short(text, shortlen=80):
+    text = ' '.join((text or '').split())
+    if '. ' in text:
+        text = text[:text.index('. ') + 1]
+    if len(text) > shortlen:
+        text = text[:shortlen - 3] + '...'
+    return text
+
+
 class ZshGenerator(object):
     def __init__(self, parser):
+        """
+        :param parser: the linstor main parser
+        """
         self._parser = parser
 
     def cmd_completer(self, args):
+        index = cmdindex.build_index(self._parser)
         print(_header)
-        for cmd in Commands.MainList:
-            print(self.cmd(cmd))
-        print(_mid)
-        print(self.cmds_list_str())
+        for entry in self.functions(index['root']):
+            print(entry)
+        print(self.cmds_list_str(index['root']))
         print(_footer)
+        return ExitCode.OK
 
-    def describe_cmds(self, cmd, indent=0):
-        argparse_cmd = self._parser._name_parser_map[cmd]
-        safe_str = cmd.replace('-', '_')
-        c = " " * indent + "local {cmd}_cmds;\n".format(cmd=safe_str)
-        c += " " * indent + "{cmd}_cmds=(\n".format(cmd=safe_str)
-        for action in argparse_cmd._actions:
-            subcmds = action.choices if action.choices else []
-            for subcmd in subcmds:
-                c += " " * indent + "  '{subcmd}:'\n".format(subcmd=subcmd)
-        c += " " * indent + ")\n"
-        c += " " * indent + "_describe -t {cmd}_cmds '{cmd} cmds' {cmd}_cmds \"$@\" && ret=0\n".format(cmd=safe_str)
-        return c
+    @staticmethod
+    def function_name(node):
+        words = node['prog'].split()[1:]
+        return '_linstor_cmd_' + '_'.join(words).replace('-', '_') if words else '_linstor'
+
+    @classmethod
+    def action_str(cls, arg):
+        """
+        :param dict arg: option or positional entry of the command index
+        :return: zsh completion action for the values of the argument
+        :rtype: str
+        """
+        completer = arg['completer']
+        choices = None
+        if completer is not None and 'choices' in completer:
+            choices = completer['choices']
+        elif arg['choices'] is not None and (completer is None or 'fallback' in completer):
+            choices = arg['choices']
+
+        if choices is not None:
+            return '(' + ' '.join(_escape(x, '[]: ()') for x in choices) + ')'
+        if completer is not None:
+            return '_linstor_objects {name} {dest}'.format(name=completer.get('method', arg['dest']), dest=arg['dest'])
+        return ' '
+
+    @classmethod
+    def option_strs(cls, node):
+        groups = {}
+        for option in node['options']:
+            if option['group'] is not None:
+                groups.setdefault(option['group'], []).extend(option['strings'])
+
+        specs = []
+        for option in node['options']:
+            if option['suppressed']:
+                continue
+            nargs = option['nargs']
+            desc = '[' + _escape(_short(option['help'])) + ']'
+            action = cls.action_str(option)
+            if nargs == 0:
+                values = ''
+            elif nargs is None:
+                values = ':{d}:{a}'.format(d=option['dest'], a=action)
+            elif nargs == '?':
+                values = '::{d}:{a}'.format(d=option['dest'], a=action)
+            elif isinstance(nargs, int):
+                values = ':{d}:{a}'.format(d=option['dest'], a=action) * nargs
+            else:
+                values = ':{d}:{a}'.format(d=option['dest'], a=action)
+
+            if nargs in ('*', '+'):
+                prefix = '*'  # list options, the flag may be given again for every value
+            else:
+                group = groups.get(option['group'], [])
+                exclusive = option['strings'] + [x for x in group if x not in option['strings']]
+                prefix = '(' + ' '.join(exclusive) + ')'
+            for opt_string in option['strings']:
+                specs.append(_quote(prefix + opt_string + desc + values))
+        return specs
 
     @classmethod
-    def arguments_str(cls, argparse_cmd):
-        c = ""
-        opts = []
-        for action in argparse_cmd._actions:
-            if action.option_strings:
-                # get longest option string
-                optstr = sorted(action.option_strings, key=len, reverse=True)[0]
-                helptxt = action.help.replace("'", "''") if action.help else ' '
-                helptxt = helptxt.replace(":", "\\:")
-                opt_data = [optstr, helptxt]
-                if action.choices:
-                    opt_data.append("(" + " ".join(action.choices) + ")")
-                opts.append("'" + ':'.join(opt_data) + "'")
-            else:  # positional
-                opt_data = ['', action.dest]
-                if action.choices:
-                    opt_data.append("(" + " ".join(action.choices) + ")")
-                else:
-                    opt_data.append("()")
-                opts.append("'" + ':'.join(opt_data) + "'")
-        if opts:
-            c += "_arguments " + " ".join(opts) + " && ret=0\n"
+    def positional_strs(cls, node):
+        specs = []
+        pos = 1
+        for positional in node['positionals']:
+            nargs = positional['nargs']
+            action = cls.action_str(positional)
+            if nargs is None or nargs == '?' or isinstance(nargs, int):
+                for _ in range(nargs if isinstance(nargs, int) else 1):
+                    optional = ':' if nargs == '?' else ''
+                    specs.append(_quote('{p}:{o}{d}:{a}'.format(p=pos, o=optional, d=positional['dest'], a=action)))
+                    pos += 1
+            else:
+                specs.append(_quote('*:{d}:{a}'.format(d=positional['dest'], a=action)))
+                break
+        return specs
+
+    @classmethod
+    def describe_cmds(cls, node, indent=0):
+        c = " " * indent + "local -a commands\n"
+        c += " " * indent + "commands=(\n"
+        for child in node['commands']:
+            desc = _escape(_short(child['description']), ':')
+            for name in child['names']:
+                c += " " * indent + "  " + _quote(name + ':' + desc) + "\n"
+        c += " " * indent + ")\n"
+        c += " " * indent + "_describe -t commands '{cmd} command' commands && ret=0\n".format(cmd=node['name'])
         return c
 
-    def cmd(self, cmd):
-        c = "        ({cmd})\n".format(cmd=cmd)
-        c += "          case $line[2] in\n"
-        # argparse_cmd = self._parser._name_parser_map[cmd]
-        # for action in argparse_cmd._actions:
-        #     subcmds = action.choices if action.choices else []
-        #     for subcmd in subcmds:
-        #         c += "            ({subcmd})\n".format(subcmd=subcmd)
-        #         c += "              " + self.arguments_str(action.choices[subcmd])
-        #         c += "            ;;\n"
-        c += "            *)\n"
-        c += self.describe_cmds(cmd, indent=14)
-        c += "            ;;\n"
-        c += "          esac\n"
-        # c += self.arguments_str(argparse_cmd)
-        c += "        ;;"
+    def cmd(self, node):
+        """
+        :param dict node: command index node
+        :return: the zsh function completing the command and dispatching to its subcommands
+        :rtype: str
+        """
+        name = self.function_name(node)
+        specs = self.option_strs(node)
+        is_root = name == '_linstor'
+        if node['commands'] is not None:
+            specs += ["'1: :_linstor_cmds'" if is_root else "'1: :->cmds'", "'*::arg:->args'"]
+        else:
+            specs += self.positional_strs(node)
+
+        c = "(( $+functions[{n}] )) ||\n{n}() {{\n".format(n=name)
+        c += "  local context curcontext=\"$curcontext\" state line\n"
+        c += "  typeset -A opt_args\n"
+        c += "  local ret=1\n\n"
+        if is_root:
+            c += "  _linstor_words=( \"${words[@]}\" )\n"
+            c += "  _linstor_current=$CURRENT\n\n"
+        c += "  _arguments -C"
+        for spec in specs:
+            c += " \\\n    " + spec
+        c += " \\\n  && ret=0\n"
+
+        if node['commands'] is not None:
+            c += "\n  case $state in\n"
+            if not is_root:
+                c += "    (cmds)\n"
+                c += self.describe_cmds(node, indent=6)
+                c += "    ;;\n"
+            c += "    (args)\n"
+            c += "      curcontext=\"${{curcontext%:*:*}}:{p}-$words[1]:\"\n".format(p=node['prog'].replace(' ', '-'))
+            c += "      case $words[1] in\n"
+            for child in node['commands']:
+                c += "        ({names})\n".format(names='|'.join(child['names']))
+                c += "          {f} && ret=0\n".format(f=self.function_name(child))
+                c += "        ;;\n"
+            c += "        *)\n"
+            c += "          _message 'no more arguments'\n"
+            c += "        ;;\n"
+            c += "      esac\n"
+            c += "    ;;\n"
+            c += "  esac\n"
+        c += "\n  return ret\n}\n"
         return c
 
-    def cmds_list_str(self):
+    def functions(self, node):
+        """
+        :param dict node: command index node
+        :return: generator of the zsh functions for the command and all its subcommands
+        """
+        yield self.cmd(node)
+        for child in node['commands'] or []:
+            for func in self.functions(child):
+                yield func
+
+    @classmethod
+    def cmds_list_str(cls, root):
         tuples = []
-        for x in Commands.MainList:
-            cmd = self._parser._name_parser_map[x]
-            desc = cmd.description if cmd.description else ""
-            shortlen = 40
-            if desc and len(desc) > shortlen:
-                desc = desc[:shortlen - 3] + '...'
-            tuples.append((x, desc))
-        return "\n    ".join(["'" + x[0] + ':' + x[1] + "'" for x in tuples])
+        for child in root['commands']:
+            if child['name'] in Commands.MainList:
+                tuples.append((child['name'], _short(child['description'], 40)))
+        c = "(( $+functions[_linstor_cmds] )) ||\n_linstor_cmds() {\n"
+        c += "  local commands; commands=(\n    "
+        c += "\n    ".join(_quote(x[0] + ':' + _escape(x[1], ':')) for x in sorted(tuples))
+        c += "\n  )\n"
+        c += "  _describe -t commands 'linstor command' commands \"$@\"\n}\n"
+        return c
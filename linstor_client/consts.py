@@ -24,7 +24,7 @@ Global constants for linstor
 VERSION = "1.0.1"
 
 try:
-    from linstor.consts_githash import GITHASH
+    from linstor_client.consts_githash import GITHASH
 except ImportError:
     GITHASH = 'GIT-hash: UNKNOWN'
 
@@ -0,0 +1,219 @@
+"""
+Selection of the controller the client talks to.
+
+All given controllers are connected concurrently with a short connect timeout, the first one
+answering is used for the command, the connections to the others are closed.
+
+The connect time and failures of every controller are kept in a small health cache in the user
+cache directory. The controllers are tried in the order of that cache: healthy ones by their
+round trip time, unknown ones, and finally the ones that failed recently. The best known controller
+gets a head start, the others are only connected if it does not answer within a few of its round trips.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+from linstor_client import apicompat
+from linstor_client.utils import cache_dir
+
+# seconds until a recorded result is forgotten, demoted controllers get tried first again afterwards
+HEALTH_TTL = 600
+
+# head start of the best known controller, in multiples of its round trip time and bounds in seconds
+HEAD_START_RTTS = 4
+HEAD_START_MIN = 0.05
+HEAD_START_MAX = 1.0
+
+
+class HealthCache(object):
+    """
+    Round trip times and failures of the controllers, stored in the user cache directory.
+    """
+    def __init__(self, path=None, ttl=HEALTH_TTL):
+        """
+        :param str path: cache file, defaults to <cache dir>/controllers
+        :param int ttl: seconds until a recorded result expires
+        """
+        self._path = path or os.path.join(cache_dir(), 'controllers')
+        self._ttl = ttl
+        self._entries = {}  # uri -> {'rtt': seconds, 'failures': count, 'time': last update}
+
+    def load(self):
+        try:
+            with open(self._path) as cache_file:
+                entries = json.load(cache_file)
+            if isinstance(entries, dict):
+                self._entries = entries
+        except (IOError, OSError, ValueError):  # missing or broken cache, start over
+            self._entries = {}
+        return self
+
+    def save(self):
+        now = time.time()
+        entries = dict((k, v) for k, v in self._entries.items() if now - v['time'] <= self._ttl)
+        try:
+            if not os.path.isdir(os.path.dirname(self._path)):
+                os.makedirs(os.path.dirname(self._path))
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self._path))
+            with os.fdopen(fd, 'w') as tmp_file:
+                json.dump(entries, tmp_file)
+            os.rename(tmp_path, self._path)
+        except (IOError, OSError):
+            pass  # cache is an optimization only, e.g. read-only home directories
+
+    def _entry(self, uri):
+        entry = self._entries.get(uri)
+        if entry is None or time.time() - entry['time'] > self._ttl:
+            return None
+        return entry
+
+    def record_success(self, uri, rtt):
+        entry = self._entry(uri)
+        if entry is not None and entry['rtt'] is not None:
+            rtt = (entry['rtt'] + rtt) / 2.0  # smooth out single slow connects
+        self._entries[uri] = {'rtt': rtt, 'failures': 0, 'time': time.time()}
+
+    def record_failure(self, uri):
+        entry = self._entry(uri)
+        self._entries[uri] = {
+            'rtt': entry['rtt'] if entry else None,
+            'failures': entry['failures'] + 1 if entry else 1,
+            'time': time.time()
+        }
+
+    def rtt(self, uri):
+        """
+        :return: round trip time of a healthy controller, None if it is unknown or failed recently
+        :rtype: float
+        """
+        entry = self._entry(uri)
+        return entry['rtt'] if entry is not None and not entry['failures'] else None
+
+    def rank(self, uris):
+        """
+        :param list[str] uris: controller uris in configured order
+        :return: the uris ordered by health, ties keep the configured order
+        :rtype: list[str]
+        """
+        def key(item):
+            idx, uri = item
+            entry = self._entry(uri)
+            if entry is None:
+                return 1, 0, idx
+            if entry['failures']:
+                return 2, entry['failures'], idx
+            return 0, entry['rtt'], idx
+        return [uri for _, uri in sorted(enumerate(uris), key=key)]
+
+    def describe(self, uri):
+        entry = self._entry(uri)
+        if entry is None:
+            return "unknown"
+        if entry['failures']:
+            return "failed {n} time(s), demoted".format(n=entry['failures'])
+        return "rtt {ms:.1f}ms".format(ms=entry['rtt'] * 1000)
+
+
+class _Probe(object):
+    def __init__(self, uri):
+        self.uri = uri
+        self.api = None
+        self.error = None
+        self.rtt = None
+        self.done = False
+
+
+def connect_first(uris, create_api, connect_timeout, timeout, health=None):
+    """
+    Connects to all controllers concurrently and returns the client of the first one answering.
+
+    :param list[str] uris: controller uris
+    :param create_api: function(uri, timeout) returning a not yet connected linstor.Linstor
+    :param float connect_timeout: seconds a controller has to answer the connect
+    :param float timeout: socket timeout of the returned client
+    :param HealthCache health: orders the controllers and records the results, None tries them all at once
+    :return: the connected client, or None and the (uri, exception) of all controllers in the order tried
+    :rtype: (linstor.Linstor, list[(str, Exception)])
+    """
+    import linstor
+
+    if health is not None:
+        uris = health.rank(uris)
+    probes = [_Probe(uri) for uri in uris]
+    cond = threading.Condition()
+    winner = []
+
+    def probe(entry):
+        try:
+            api = create_api(entry.uri, connect_timeout)
+            with cond:
+                entry.api = api
+            start = time.time()
+            api.connect()
+            entry.rtt = time.time() - start
+        except Exception as exc:
+            with cond:
+                entry.error = exc
+                entry.done = True
+                cond.notify()
+            return
+        with cond:
+            entry.done = True
+            if winner:  # another controller was faster
+                api.disconnect()
+            else:
+                winner.append(entry)
+            cond.notify()
+
+    def start(entries):
+        for entry in entries:
+            thread = threading.Thread(target=probe, args=(entry,))
+            thread.daemon = True
+            thread.start()
+
+    def wait(entries, seconds):
+        deadline = time.time() + seconds
+        while not winner and not all(x.done for x in entries):
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            cond.wait(min(remaining, 1.0))  # a timeout keeps ctrl-c working on python2
+
+    with cond:
+        best_rtt = health.rtt(uris[0]) if health is not None and uris else None
+        if best_rtt is not None and len(probes) > 1:
+            start(probes[:1])
+            wait(probes[:1], min(max(best_rtt * HEAD_START_RTTS, HEAD_START_MIN), HEAD_START_MAX, connect_timeout))
+            if not winner:
+                start(probes[1:])
+        else:
+            start(probes)
+        wait(probes, connect_timeout)
+
+        # cancel the probes still in flight, closing their socket aborts a blocked connect
+        for entry in probes:
+            if not entry.done:
+                if not winner:
+                    entry.error = linstor.LinstorNetworkError(
+                        "Unable to connect to {uri}: no answer within {t}s".format(uri=entry.uri, t=connect_timeout))
+                if entry.api is not None:
+                    entry.api.disconnect()
+        if not winner:
+            winner.append(None)
+
+        if health is not None:
+            for entry in probes:
+                if entry.rtt is not None:
+                    health.record_success(entry.uri, entry.rtt)
+                elif entry.error is not None and isinstance(entry.error, linstor.LinstorNetworkError):
+                    health.record_failure(entry.uri)
+            health.save()
+
+    if winner[0] is None:
+        return None, [(x.uri, x.error) for x in probes]
+    # the winner was connected with the connect timeout
+    apicompat.set_timeout(winner[0].api, timeout)
+    return winner[0].api, []
@@ -0,0 +1,499 @@
+"""
+Resident client daemon
+
+The daemon keeps a LinStorCLI with its built parser and a keep-alive controller connection
+and listens on a per user UNIX socket. scripts/linstor forwards its command line to it, if a
+daemon is running, and prints the streamed output. This saves interpreter start, parser
+setup and connect for each call, e.g. for provisioning scripts calling linstor in a loop.
+
+The daemon is opt-in:
+    python -m linstor_client.daemon start|stop|status [--idle-timeout SECONDS]
+
+Commands that need a terminal (interactive mode, password prompts) are handed back to the
+front-end, which then runs them in-process. The daemon runs one command at a time, as commands
+use the process wide environment, working directory and standard streams. Requests arriving while
+a command runs are handed back as well, so concurrent front-ends, e.g. parallel hooks, never wait
+for a slow command of another one.
+
+Protocol: the request is a length prefixed json object, the daemon answers with frames of a
+one byte type, a 4 byte length and the payload:
+    a: request accepted, o: stdout data, e: stderr data, x: exit code, f: run in-process instead
+The front-end only runs a command in-process if the daemon went away before accepting it or
+sent f, a command the daemon accepted may already have changed the cluster.
+"""
+
+from __future__ import print_function
+
+import errno
+import json
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+
+from linstor_client.consts import KEY_LS_CONTROLLERS, ENV_OUTPUT_VERSION, ExitCode
+
+FRAME_ACCEPTED = b'a'
+FRAME_STDOUT = b'o'
+FRAME_STDERR = b'e'
+FRAME_EXIT = b'x'
+FRAME_FALLBACK = b'f'
+
+# environment of the front-end applied to the daemon for each request
+FORWARDED_ENV = [KEY_LS_CONTROLLERS, ENV_OUTPUT_VERSION, 'COLUMNS', 'LINES']
+
+DEFAULT_IDLE_TIMEOUT = 900
+
+_HEADER = struct.Struct('!cI')
+_LENGTH = struct.Struct('!I')
+
+
+def socket_path():
+    """
+    Returns the path of the daemon socket of the current user.
+
+    :return: path in XDG_RUNTIME_DIR, or in a private directory in /tmp
+    :rtype: str
+    """
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return os.path.join(runtime_dir, 'linstor', 'client.sock')
+    return os.path.join('/tmp', 'linstor-client-{uid}'.format(uid=os.getuid()), 'client.sock')
+
+
+def _is_private_dir(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    return st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+
+def _recv_exactly(sock, size):
+    data = b''
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise EOFError()
+        data += chunk
+    return data
+
+
+def _send_message(sock, data):
+    sock.sendall(_LENGTH.pack(len(data)) + data)
+
+
+def _recv_message(sock):
+    size, = _LENGTH.unpack(_recv_exactly(sock, _LENGTH.size))
+    return _recv_exactly(sock, size)
+
+
+def _send_frame(sock, frame_type, payload=b''):
+    sock.sendall(_HEADER.pack(frame_type, len(payload)) + payload)
+
+
+def _recv_frame(sock):
+    frame_type, size = _HEADER.unpack(_recv_exactly(sock, _HEADER.size))
+    return frame_type, _recv_exactly(sock, size)
+
+
+def _connect(path):
+    if not _is_private_dir(os.path.dirname(path)):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except socket.error:
+        sock.close()
+        return None
+    return sock
+
+
+def _request(path, request):
+    sock = _connect(path)
+    if sock is None:
+        return None
+    try:
+        _send_message(sock, json.dumps(request).encode('utf-8'))
+    except socket.error:
+        sock.close()
+        return None
+    return sock
+
+
+def forward(argv, path=None):
+    """
+    Executes the command line in a running daemon.
+
+    :param list[str] argv: command line arguments without the program name
+    :param str path: daemon socket, defaults to socket_path()
+    :return: exit code of the command, None if no daemon accepted the command or it has to run in-process
+    :rtype: Optional[int]
+    """
+    if '_ARGCOMPLETE' in os.environ:
+        return None
+
+    from linstor_client.table import get_terminal_size
+    env = dict((key, os.environ[key]) for key in FORWARDED_ENV if key in os.environ)
+    if sys.stdout.isatty() and 'COLUMNS' not in env:
+        env['COLUMNS'], env['LINES'] = [str(x) for x in get_terminal_size()]
+
+    streams = {
+        FRAME_STDOUT: getattr(sys.stdout, 'buffer', sys.stdout),
+        FRAME_STDERR: getattr(sys.stderr, 'buffer', sys.stderr)
+    }
+    sock = _request(path or socket_path(), {
+        'type': 'run',
+        'argv': argv,
+        'env': env,
+        'cwd': os.getcwd(),
+        'isatty': {'stdin': sys.stdin.isatty(), 'stdout': sys.stdout.isatty(), 'stderr': sys.stderr.isatty()}
+    })
+    if sock is None:
+        return None
+
+    accepted = False
+    try:
+        while True:
+            frame_type, payload = _recv_frame(sock)
+            if frame_type == FRAME_ACCEPTED:
+                accepted = True
+            elif frame_type in streams:
+                streams[frame_type].write(payload)
+                streams[frame_type].flush()
+            elif frame_type == FRAME_EXIT:
+                return int(payload)
+            elif frame_type == FRAME_FALLBACK:
+                return None
+            else:
+                break
+    except (EOFError, socket.error):
+        if not accepted:
+            return None  # daemon went away before taking the request, e.g. idle shutdown
+    finally:
+        sock.close()
+    sys.stderr.write("Error: Lost connection to the linstor client daemon\n")
+    return ExitCode.UNKNOWN_ERROR
+
+
+class TerminalRequired(BaseException):
+    """
+    Raised if a command executed by the daemon reads from stdin.
+    """
+    pass
+
+
+class _NoTerminal(object):
+    encoding = 'utf-8'
+
+    def isatty(self):
+        return False
+
+    def fileno(self):
+        raise TerminalRequired()
+
+    def read(self, *args):
+        raise TerminalRequired()
+
+    readline = read
+    readlines = read
+
+
+class _FrameWriter(object):
+    """
+    File like object sending its data as frames of the given type, used as sys.stdout/stderr.
+
+    Data is sent once BUFFER_SIZE is reached and at the end of the command. flush() is ignored,
+    input() and getpass flush their prompt, which has to be dropped if the command gets handed
+    back to the front-end.
+    """
+    encoding = 'utf-8'
+    BUFFER_SIZE = 8192
+
+    def __init__(self, sock, frame_type, isatty):
+        self._sock = sock
+        self._frame_type = frame_type
+        self._isatty = isatty
+        self._buffer = []
+        self._buffered = 0
+        self.sent = False
+
+    def isatty(self):
+        return self._isatty
+
+    def write(self, data):
+        if not isinstance(data, bytes):
+            data = data.encode('utf-8')
+        self._buffer.append(data)
+        self._buffered += len(data)
+        if self._buffered >= self.BUFFER_SIZE:
+            self.send()
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        pass
+
+    def send(self):
+        if self._buffer:
+            data = b''.join(self._buffer)
+            self._buffer = []
+            self._buffered = 0
+            self.sent = True
+            try:
+                _send_frame(self._sock, self._frame_type, data)
+            except socket.error:
+                pass  # front-end is gone (e.g. ctrl-c), let the command finish
+
+
+class ClientDaemon(object):
+    """
+    Executes the commands of front-ends in a single LinStorCLI, in a worker thread. The main thread
+    keeps accepting requests, a command requested while another one runs is handed back.
+    """
+    # seconds between checks of the stop flag and the idle timeout
+    POLL_INTERVAL = 1.0
+    # seconds a front-end has to send its request
+    REQUEST_TIMEOUT = 10
+
+    def __init__(self, path=None, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        self._path = path or socket_path()
+        self._idle_timeout = idle_timeout
+        self._cli = None
+        self._running = False
+        self._worker = None  # thread running the last command
+        self._command_lock = threading.Lock()  # held while a command runs
+
+    def setup(self):
+        import linstor_client_main
+        self._cli = linstor_client_main.LinStorCLI(keep_alive=True)
+        self._cli.check_parser_commands()  # builds all command groups
+
+    def terminate(self, signum=None, frame=None):
+        """
+        Stops serving, used as SIGTERM handler. A running command is finished and answered first.
+        """
+        self._running = False
+
+    def serve_forever(self):
+        if self._cli is None:
+            self.setup()
+
+        sock_dir = os.path.dirname(self._path)
+        if not os.path.isdir(sock_dir):
+            os.makedirs(sock_dir, 0o700)
+        if not _is_private_dir(sock_dir):
+            raise RuntimeError("Socket directory '{d}' is not private to the user".format(d=sock_dir))
+        try:
+            os.remove(self._path)
+        except OSError as err:
+            if err.errno != errno.ENOENT:
+                raise
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self._path)
+        server.listen(16)
+        server.settimeout(self.POLL_INTERVAL)  # also lets SIGTERM stop the loop on python2
+
+        self._running = True
+        last_active = time.time()
+        try:
+            while self._running:
+                try:
+                    conn, _ = server.accept()
+                except socket.error as err:  # also socket.timeout
+                    if not isinstance(err, socket.timeout) and err.errno != errno.EINTR:  # EINTR: python2
+                        raise
+                    if self._worker is not None and self._worker.is_alive():
+                        last_active = time.time()
+                    elif self._idle_timeout and time.time() - last_active >= self._idle_timeout:
+                        break
+                    continue
+                last_active = time.time()
+                conn.settimeout(self.REQUEST_TIMEOUT)
+                try:
+                    if self._handle(conn):
+                        continue  # the worker answers and closes the connection
+                except (EOFError, ValueError, socket.error, OSError):
+                    pass  # broken request or front-end gone
+                conn.close()
+        finally:
+            server.close()
+            os.remove(self._path)
+            if self._worker is not None:
+                self._worker.join()
+            self._cli.disconnect()
+
+    def _handle(self, conn):
+        """
+        :return: True if a worker thread took over the connection
+        :rtype: bool
+        """
+        request = json.loads(_recv_message(conn).decode('utf-8'))
+        conn.settimeout(None)
+        if request.get('type') == 'status':
+            _send_frame(conn, FRAME_STDOUT, "linstor client daemon running, pid {p}\n".format(p=os.getpid()).encode())
+            _send_frame(conn, FRAME_EXIT, b'0')
+        elif request.get('type') == 'stop':
+            self._running = False
+            _send_frame(conn, FRAME_EXIT, b'0')
+        elif not self._command_lock.acquire(False):
+            _send_frame(conn, FRAME_FALLBACK)  # faster in-process than waiting for the running command
+        else:
+            self._worker = threading.Thread(target=self._work, args=(conn, request))
+            self._worker.daemon = True
+            self._worker.start()
+            return True
+        return False
+
+    def _work(self, conn, request):
+        try:
+            try:
+                frames = self._run(conn, request)
+            finally:
+                # released before the last frame, the front-end may send its next command right after it
+                self._command_lock.release()
+            for frame_type, payload in frames:
+                _send_frame(conn, frame_type, payload)
+        except (EOFError, ValueError, socket.error, OSError):
+            pass  # front-end gone
+        finally:
+            conn.close()
+
+    def _apply_request_env(self, request):
+        for key in FORWARDED_ENV:
+            if key in request['env']:
+                os.environ[key] = request['env'][key]
+            else:
+                os.environ.pop(key, None)
+        os.chdir(request['cwd'])
+        # parser defaults that got computed from the environment of the daemon
+        self._cli._parser.set_defaults(
+            no_utf8=not request['isatty']['stdout'],
+            output_version=os.environ.get(ENV_OUTPUT_VERSION, "v0")
+        )
+
+    def _run(self, conn, request):
+        """
+        Runs the command of a request, sending its output.
+
+        :return: the last frames to send, as (frame type, payload)
+        :rtype: list[(bytes, bytes)]
+        """
+        try:
+            self._apply_request_env(request)
+        except OSError as err:  # e.g. the working directory of the front-end got deleted
+            return [(FRAME_STDERR, "Error: {e}\n".format(e=err).encode('utf-8')),
+                    (FRAME_EXIT, str(ExitCode.UNKNOWN_ERROR).encode())]
+        _send_frame(conn, FRAME_ACCEPTED)
+
+        stdout = _FrameWriter(conn, FRAME_STDOUT, request['isatty']['stdout'])
+        stderr = _FrameWriter(conn, FRAME_STDERR, request['isatty']['stderr'])
+        saved_streams = sys.stdin, sys.stdout, sys.stderr
+        sys.stdin, sys.stdout, sys.stderr = _NoTerminal(), stdout, stderr
+        rc = ExitCode.OK
+        needs_terminal = False
+        try:
+            rc = self._cli.parse_and_execute(list(request['argv']), is_interactive=True)
+        except SystemExit as se:
+            rc = se.code if isinstance(se.code, int) or se.code is None else ExitCode.UNKNOWN_ERROR
+        except TerminalRequired:
+            needs_terminal = True
+        except Exception as exc:
+            sys.stderr.write("Error: {e}\n".format(e=exc))
+            rc = ExitCode.UNKNOWN_ERROR
+        finally:
+            sys.stdin, sys.stdout, sys.stderr = saved_streams
+            self._cli._state_service.clear_state()
+
+        if rc in (ExitCode.CONNECTION_ERROR, ExitCode.CONNECTION_TIMEOUT):
+            self._cli.disconnect()
+
+        if needs_terminal:
+            if not (stdout.sent or stderr.sent):
+                return [(FRAME_FALLBACK, b'')]
+            stderr.write("Error: Command needs a terminal, run it without the client daemon\n")
+            rc = ExitCode.UNKNOWN_ERROR
+        stdout.send()
+        stderr.send()
+        return [(FRAME_EXIT, str(rc or ExitCode.OK).encode())]
+
+
+def _daemonize():
+    pid = os.fork()
+    if pid:
+        os.waitpid(pid, 0)
+        return False
+    os.setsid()
+    if os.fork():
+        os._exit(0)
+    os.chdir('/')
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    return True
+
+
+def _control(request_type, path):
+    sock = _request(path, {'type': request_type})
+    if sock is None:
+        return None
+    try:
+        while True:
+            frame_type, payload = _recv_frame(sock)
+            if frame_type == FRAME_STDOUT:
+                sys.stdout.write(payload.decode('utf-8'))
+            elif frame_type == FRAME_EXIT:
+                return int(payload)
+    except (EOFError, socket.error):
+        return None
+    finally:
+        sock.close()
+
+
+def main(args=None):
+    import argparse
+    import signal
+    import time
+
+    parser = argparse.ArgumentParser(prog='python -m linstor_client.daemon',
+                                     description='Resident linstor client daemon, used by scripts/linstor if running.')
+    parser.add_argument('action', choices=['start', 'stop', 'status'])
+    parser.add_argument('--foreground', '-f', action='store_true', help='Do not detach from the terminal')
+    parser.add_argument('--idle-timeout', type=int, default=DEFAULT_IDLE_TIMEOUT,
+                        help='Exit after this many seconds without requests, 0 disables (default: %(default)s)')
+    parser.add_argument('--socket', default=socket_path(), help='Socket path (default: %(default)s)')
+    args = parser.parse_args(args)
+
+    if args.action == 'status':
+        if _control('status', args.socket) is None:
+            print("linstor client daemon not running")
+            return 1
+        return 0
+    if args.action == 'stop':
+        return 0 if _control('stop', args.socket) is not None else 1
+
+    if _control('status', args.socket) is not None:
+        return 0
+
+    daemon = ClientDaemon(args.socket, args.idle_timeout)
+    daemon.setup()  # report setup errors before detaching
+    if not args.foreground and not _daemonize():
+        for _ in range(50):
+            if _control('status', args.socket) is not None:
+                return 0
+            time.sleep(0.1)
+        sys.stderr.write("linstor client daemon did not start\n")
+        return 1
+
+    signal.signal(signal.SIGTERM, daemon.terminate)
+    daemon.serve_forever()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+Concurrent execution of the api calls of multi-target commands, see --parallel.
+
+Commands like resource delete issue one blocking call per target, every call waits for the
+satellites. The executor runs them on a pool of keep-alive connections of the session, the replies
+are returned in the order of the calls, so the output is the same as if they ran one after another.
+List commands use it to fetch one shard per node, the rows of a shard are added to the table as it arrives.
+"""
+
+import threading
+
+
+def iter_calls(session, calls, parallel=1):
+    """
+    Runs api calls, up to parallel at once, and yields their results as they arrive.
+
+    Results are yielded in the order of the calls, each one as soon as it and all calls before it
+    finished. Calls not yet started when the generator is closed are skipped.
+
+    :param linstor_client.session.Session session: connected session, provides the connections
+    :param list calls: functions taking a linstor.Linstor
+    :param int parallel: maximum number of concurrent calls
+    :return: generator of the results of the calls
+    """
+    parallel = min(parallel, len(calls))
+    if parallel <= 1:
+        for call in calls:
+            yield call(session.api)
+        return
+
+    apis = session.pool(parallel)
+    results = [None] * len(calls)  # (result, exception) per call
+    finished = [threading.Event() for _ in calls]
+    pending = iter(range(len(calls)))
+    lock = threading.Lock()
+
+    def worker(api):
+        while True:
+            with lock:
+                idx = next(pending, None)
+            if idx is None:
+                return
+            try:
+                results[idx] = (calls[idx](api), None)
+            except Exception as exc:  # raised by the consumer, in call order
+                results[idx] = (None, exc)
+            finally:
+                finished[idx].set()
+
+    threads = [threading.Thread(target=worker, args=(api,)) for api in apis]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+    try:
+        for idx in range(len(calls)):
+            while not finished[idx].wait(1.0):  # a timeout keeps ctrl-c working on python2
+                pass
+            result, exc = results[idx]
+            if exc is not None:
+                raise exc
+            yield result
+    finally:
+        with lock:
+            pending = iter(())  # the connections are reused afterwards, let the running calls finish only
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(1.0)
+
+
+def run_calls(session, calls, parallel=1):
+    """
+    Runs api calls, up to parallel at once.
+
+    :param linstor_client.session.Session session: connected session, provides the connections
+    :param list calls: functions taking a linstor.Linstor and returning a list of replies
+    :param int parallel: maximum number of concurrent calls
+    :return: the replies of all calls, in the order of the calls
+    :rtype: list[linstor.ApiCallResponse]
+    """
+    if min(parallel, len(calls)) <= 1:
+        return [reply for call in calls for reply in call(session.api)]
+
+    def guarded(call):
+        def run(api):
+            try:
+                return call(api), None
+            except Exception as exc:  # raised after all calls finished, in call order
+                return None, exc
+        return run
+
+    replies = []
+    for call_replies, exc in list(iter_calls(session, [guarded(call) for call in calls], parallel)):
+        if exc is not None:
+            raise exc
+        replies.extend(call_replies)
+    return replies
@@ -0,0 +1,232 @@
+"""
+Manual pages of the linstor commands, see "setup.py build_man".
+
+A page is written for every command and subcommand (e.g. linstor-node.8 and linstor-node-list.8). The
+content of the pages is taken from the parser tree in this process, rendering and compressing them is
+done in a process pool. A hash of every page source is kept in the output directory, so only pages of
+commands whose parser definition changed are written again.
+"""
+
+import gzip
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+
+import linstor_client.argparse.argparse as argparse
+from linstor_client.cmdindex import HELP_WIDTH
+
+HASH_FILE = 'manpage-hashes.json'
+
+
+def _formatter(parser):
+    return parser.formatter_class(prog=parser.prog, width=HELP_WIDTH)
+
+
+def _action_help(parser, action):
+    try:
+        return _formatter(parser)._expand_help(action)
+    except (ValueError, TypeError, KeyError):  # e.g. '%' in help strings
+        return action.help
+
+
+def _subparsers(parser):
+    """
+    :return: list of (names, subparser) of the direct subcommands, aliases share one entry
+    """
+    commands = []
+    for action in parser._actions:
+        if isinstance(action, argparse._SubParsersAction):
+            names = {}
+            for name, subparser in action.choices.items():
+                if id(subparser) not in names:
+                    names[id(subparser)] = []
+                    commands.append((names[id(subparser)], subparser))
+                names[id(subparser)].append(name)
+    return commands
+
+
+def page_name(prog):
+    return prog.replace(' ', '-')
+
+
+def page_source(parser, names, section, version):
+    """
+    Collects everything rendered into the page of one command, the returned dict only holds plain data
+    and is what the page hash is computed from.
+
+    :param argparse.ArgumentParser parser: parser of the command
+    :param list[str] names: command name and its aliases
+    :param str section: manual section
+    :param str version: client version
+    :return: page source
+    :rtype: dict
+    """
+    formatter = _formatter(parser)
+    formatter.add_usage(parser.usage, parser._actions, parser._mutually_exclusive_groups, prefix='')
+    groups = []
+    for group in parser._action_groups:
+        entries = []
+        for action in group._group_actions:
+            if action.help == argparse.SUPPRESS or isinstance(action, argparse._SubParsersAction):
+                continue
+            entries.append([_formatter(parser)._format_action_invocation(action), _action_help(parser, action)])
+        if entries:
+            groups.append([group.title, entries])
+
+    commands = []
+    for sub_names, subparser in _subparsers(parser):
+        commands.append([sub_names[0], sub_names[1:], subparser.description, page_name(subparser.prog)])
+
+    return {
+        'name': page_name(parser.prog),
+        'prog': parser.prog,
+        'aliases': names[1:],
+        'section': section,
+        'version': version,
+        'usage': formatter.format_help().strip(),
+        'description': parser.description,
+        'groups': groups,
+        'commands': sorted(commands)
+    }
+
+
+def page_sources(parser, section, version):
+    """
+    :param argparse.ArgumentParser parser: the linstor main parser, lazily registered groups get built
+    :return: page sources of all commands and subcommands below the parser
+    :rtype: list[dict]
+    """
+    sources = []
+    for names, subparser in _subparsers(parser):
+        sources.append(page_source(subparser, names, section, version))
+        sources += page_sources(subparser, section, version)
+    return sources
+
+
+def page_hash(source):
+    return hashlib.sha1(json.dumps(source, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _roff(text):
+    text = text.replace('\\', '\\e').replace('-', '\\-')
+    return re.sub(r"^([.'])", r'\\&\1', text, flags=re.M)
+
+
+def _paragraphs(text):
+    return [' '.join(x.split()) for x in re.split(r'\n\s*\n', text or '') if x.strip()]
+
+
+def _summary(source):
+    if not source['description']:
+        return source['prog']
+    summary = _paragraphs(source['description'])[0]
+    return summary[:summary.index('. ') + 1] if '. ' in summary else summary
+
+
+def render(source):
+    """
+    :param dict source: page source from page_source()
+    :return: the page as roff
+    :rtype: str
+    """
+    lines = [
+        '.TH {n} "{s}" "" "linstor {v}" "System Administration"'.format(
+            n=_roff(source['name'].upper()), s=source['section'], v=source['version']),
+        '.SH NAME',
+        '{n} \\- {d}'.format(n=_roff(source['name']), d=_roff(_summary(source))),
+        '.SH SYNOPSIS',
+        '.nf'
+    ]
+    lines += [_roff(x) for x in source['usage'].splitlines()]
+    lines.append('.fi')
+
+    if source['description']:
+        lines.append('.SH DESCRIPTION')
+        for paragraph in _paragraphs(source['description']):
+            lines += ['.PP', _roff(paragraph)]
+    if source['aliases']:
+        lines += ['.PP', 'Aliases: ' + _roff(', '.join(source['aliases']))]
+
+    if source['commands']:
+        lines.append('.SH COMMANDS')
+        for name, aliases, description, page in source['commands']:
+            lines += ['.TP', '\\fB{n}\\fR'.format(n=_roff(name)) +
+                      (' ({a})'.format(a=_roff(', '.join(aliases))) if aliases else '')]
+            if description:
+                lines.append(_roff(' '.join(description.split())))
+            lines.append('See \\fB{p}\\fR({s}).'.format(p=_roff(page), s=source['section']))
+
+    for title, entries in source['groups']:
+        lines.append('.SH "{t}"'.format(t=_roff(title.upper())))
+        for invocation, text in entries:
+            lines += ['.TP', '\\fB{i}\\fR'.format(i=_roff(invocation))]
+            if text:
+                lines.append(_roff(' '.join(text.split())))
+
+    parent = source['prog'].rsplit(' ', 1)[0]
+    lines += ['.SH "SEE ALSO"', '\\fB{p}\\fR({s})'.format(p=_roff(page_name(parent)), s=source['section'])]
+    return '\n'.join(lines) + '\n'
+
+
+def write_page(job):
+    """
+    Renders and compresses one page, runs in the worker processes.
+
+    :param tuple job: (page source, output path)
+    :return: the output path
+    :rtype: str
+    """
+    source, path = job
+    tmp_path = path + '.tmp'
+    # mtime 0 keeps the compressed pages identical between builds
+    with open(tmp_path, 'wb') as raw_file:
+        with gzip.GzipFile(os.path.basename(path)[:-3], 'wb', 9, raw_file, 0) as page_file:
+            page_file.write(render(source).encode('utf-8'))
+    os.rename(tmp_path, path)
+    return path
+
+
+def build_pages(parser, outdir, section, version, jobs=None, force=False):
+    """
+    Writes the pages of all commands whose source changed since the last build.
+
+    :param argparse.ArgumentParser parser: the linstor main parser
+    :param str outdir: output directory of the pages and the hash file
+    :param str section: manual section
+    :param str version: client version
+    :param int jobs: number of worker processes, defaults to the number of CPUs
+    :param bool force: write all pages
+    :return: paths of the written pages
+    :rtype: list[str]
+    """
+    hash_path = os.path.join(outdir, HASH_FILE)
+    try:
+        with open(hash_path) as hash_file:
+            hashes = json.load(hash_file)
+    except (IOError, ValueError):
+        hashes = {}
+
+    todo = []
+    for source in page_sources(parser, section, version):
+        path = os.path.join(outdir, '{n}.{s}.gz'.format(n=source['name'], s=section))
+        digest = page_hash(source)
+        if force or hashes.get(source['name']) != digest or not os.path.isfile(path):
+            todo.append((source, path))
+        hashes[source['name']] = digest
+
+    jobs = jobs or multiprocessing.cpu_count()
+    if jobs > 1 and len(todo) > 1:
+        pool = multiprocessing.Pool(min(jobs, len(todo)))
+        try:
+            written = pool.map(write_page, todo)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        written = [write_page(job) for job in todo]
+
+    with open(hash_path, 'w') as hash_file:
+        json.dump(hashes, hash_file, indent=1, sort_keys=True)
+    return written
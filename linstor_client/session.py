@@ -0,0 +1,361 @@
+"""
+The controller connection of a client.
+
+A LinStorCLI owns one session, it is handed to every command object, so commands and argument
+completers share a single connection and the same controller selection, see linstor_client.controllers.
+"""
+
+from __future__ import print_function
+
+import os
+import threading
+
+from linstor_client import controllers, tlscache
+from linstor_client.cache import CachedApi, ResponseCache
+from linstor_client.consts import KEY_LS_CONTROLLERS
+
+# global options that select and configure the controller connection
+CONNECTION_OPTIONS = [
+    'controllers', 'timeout', 'connect_timeout', 'user', 'password', 'allow_insecure_auth', 'curl', 'no_tls_cache'
+]
+
+
+class _WarmUp(object):
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+        self.discarded = False
+        self.settings = None
+        self.result = None  # (api, failed) of controllers.connect_first
+
+
+class Session(object):
+    def __init__(self, parse_global_args, keep_alive=False, env_controllers=True):
+        """
+        :param parse_global_args: function(pargs) returning the namespace of the global options in pargs,
+            including the ones from the config file unless --disable-config is given
+        :param bool keep_alive: always use a keep-alive connection
+        :param bool env_controllers: also connect to the controllers of LS_CONTROLLERS
+        """
+        self._parse_global_args = parse_global_args
+        self._keep_alive = keep_alive
+        self._env_controllers = env_controllers
+        self._settings = None
+        self._create_api = None
+        self._tls_resume = True
+        self._uri = None  # controller and socket timeout of the connection, used by pool()
+        self._timeout = None
+        self._pool = []  # additional keep-alive clients for concurrent calls, see pool()
+        self._api = None  # type: linstor.Linstor
+        self._cached_api = None
+        self._warm_up = None  # type: _WarmUp
+        self._warm_up_thread = None  # also kept once the warm-up is adopted or discarded, see join_warm_up()
+        self.cache = None  # type: ResponseCache
+
+    @property
+    def api(self):
+        """
+        :return: the connected client, answering list calls from the cache if it is enabled
+        :rtype: linstor.Linstor
+        """
+        if self.cache is None or self._api is None or self._api.curl:
+            return self._api
+        if self._cached_api is None or self._cached_api.uncached is not self._api:
+            self._cached_api = CachedApi(self._api, self.cache)
+        return self._cached_api
+
+    @property
+    def connected(self):
+        return self._api is not None
+
+    def enable_cache(self, cache=None):
+        """
+        Caches the answers of list calls until modifying calls invalidate them, see linstor_client.cache.
+
+        :param ResponseCache cache: cache to use, e.g. of another session of the same batch
+        """
+        self.cache = cache or self.cache or ResponseCache()
+
+    def disable_cache(self):
+        self.cache = None
+        self._cached_api = None
+
+    def controller_uris(self, args):
+        """
+        :return: the LS_CONTROLLERS, unless disabled for the session, and --controllers entries as uris
+        :rtype: list[str]
+        """
+        import linstor
+        env_controllers = os.environ.get(KEY_LS_CONTROLLERS, "") if self._env_controllers else ""
+        return linstor.MultiLinstor.controller_uri_list(env_controllers + ',' + (args.controllers or ''))
+
+    @staticmethod
+    def _connection_settings(args, contrl_list, keep_alive):
+        """
+        :return: the options a connection was made with, a connection is only reused for the same ones
+        """
+        return (contrl_list, args.timeout, args.user, args.password, args.allow_insecure_auth, args.curl,
+                args.no_tls_cache, keep_alive)
+
+    @staticmethod
+    def _api_factory(args, username, password, keep_alive):
+        """
+        :return: function(uri, timeout, pooled=False) creating a not yet connected client
+        """
+        import linstor
+
+        def create_api(contrl, timeout, pooled=False):
+            linstorapi = linstor.Linstor(contrl, timeout=timeout, keep_alive=keep_alive or pooled)
+            linstorapi.username = username
+            linstorapi.password = password
+            linstorapi.allow_insecure = args.allow_insecure_auth
+            linstorapi.curl = args.curl
+            return linstorapi
+        return create_api
+
+    @staticmethod
+    def _connect_first(args, contrl_list, create_api):
+        """
+        Connects to the first answering controller, known HTTPS controllers are connected to their
+        HTTPS port right away, see linstor_client.tlscache.
+
+        :return: the result of controllers.connect_first
+        :rtype: (linstor.Linstor, list[(str, Exception)])
+        """
+        health = None if args.curl else controllers.HealthCache().load()
+        connect_timeout = min(args.connect_timeout, args.timeout)
+        tls = None if args.curl or args.no_tls_cache else tlscache.TlsCache().load()
+        if tls is None:
+            return controllers.connect_first(contrl_list, create_api, connect_timeout, args.timeout, health)
+
+        resolved = dict((x, tls.resolve(x)) for x in contrl_list)
+        result = None
+        if any(k != v for k, v in resolved.items()):
+            result = controllers.connect_first(
+                contrl_list,
+                lambda contrl, timeout: create_api(resolved[contrl], timeout),
+                connect_timeout,
+                args.timeout,
+                health
+            )
+            if result[0] is None:  # maybe outdated, e.g. HTTPS got disabled, try the configured uris
+                for contrl in contrl_list:
+                    tls.forget(contrl)
+                result = None
+        if result is None:
+            result = controllers.connect_first(contrl_list, create_api, connect_timeout, args.timeout, health)
+
+        if result[0] is not None:
+            contrl = next(k for k, v in resolved.items() if result[0].controller_host() in (k, v))
+            tls.record(contrl, result[0])
+        tls.save()
+        return result
+
+    def warm_up(self, pargs):
+        """
+        Starts connecting to the controller of a command line in a background thread, so the connection
+        is set up while the parser is built and the command line is parsed. connect() adopts the result
+        if it is called with the same connection options, local commands call discard_warm_up().
+
+        Command lines with a user (password prompt), --curl, --batch or --clusters are not warmed up.
+
+        :param list[str] pargs: command line arguments
+        """
+        warm_up = _WarmUp()
+
+        def run():
+            try:
+                args = self._parse_global_args(pargs, quiet=True)
+                if not (args.user or args.curl or args.batch or args.clusters):
+                    contrl_list = self.controller_uris(args)
+                    create_api = self._api_factory(args, None, None, self._keep_alive)
+                    result = self._connect_first(args, contrl_list, create_api)
+                    with warm_up.lock:
+                        if warm_up.discarded:
+                            if result[0] is not None:
+                                result[0].disconnect()
+                        else:
+                            warm_up.settings = self._connection_settings(args, contrl_list, self._keep_alive)
+                            warm_up.result = result
+            except Exception:  # e.g. invalid options, the real parse reports them
+                pass
+            finally:
+                warm_up.done.set()
+
+        self._warm_up = warm_up
+        thread = threading.Thread(target=run)
+        thread.daemon = True
+        thread.start()
+        self._warm_up_thread = thread
+
+    def join_warm_up(self, timeout=None):
+        """
+        Waits for the thread of the last warm-up, also of a discarded one, which still writes the caches
+        of linstor_client.controllers and linstor_client.tlscache when its connect finishes.
+
+        :param float timeout: seconds to wait at most, None waits until it finished
+        :return: True if no warm-up is running anymore
+        :rtype: bool
+        """
+        thread = self._warm_up_thread
+        if thread is None:
+            return True
+        if timeout is None:
+            while thread.is_alive():
+                thread.join(1.0)  # a timeout keeps ctrl-c working on python2
+        else:
+            thread.join(timeout)
+        if thread.is_alive():
+            return False
+        self._warm_up_thread = None
+        return True
+
+    def _adopt_warm_up(self, settings):
+        """
+        :return: the connect_first() result of the warm-up if it used the same options, otherwise None
+        """
+        warm_up = self._warm_up
+        if warm_up is None:
+            return None
+        self._warm_up = None
+        while not warm_up.done.wait(1.0):  # a timeout keeps ctrl-c working on python2
+            pass
+        with warm_up.lock:
+            warm_up.discarded = True
+            result, warm_up.result = warm_up.result, None
+        if result is not None and warm_up.settings != settings:
+            if result[0] is not None:
+                result[0].disconnect()
+            return None
+        return result
+
+    def discard_warm_up(self):
+        """
+        Drops the connection of the warm-up, e.g. for commands without controller access.
+        """
+        warm_up = self._warm_up
+        self._warm_up = None
+        if warm_up is not None:
+            with warm_up.lock:
+                warm_up.discarded = True
+                result, warm_up.result = warm_up.result, None
+            if result is not None and result[0] is not None:
+                result[0].disconnect()
+
+    def connect(self, args, keep_alive=False, ask_password=True):
+        """
+        Connects to the first answering controller, an existing connection is kept if it was made
+        with the same options.
+
+        :param args: parsed arguments with the global options
+        :param bool keep_alive: use a keep-alive connection, e.g. for interactive mode
+        :param bool ask_password: prompt for the password if only a user is given
+        :return: the network errors of all controllers if none answered, otherwise an empty list
+        :rtype: list[linstor.LinstorNetworkError]
+        """
+        import linstor
+
+        contrl_list = self.controller_uris(args)
+        settings = self._connection_settings(args, contrl_list, self._keep_alive or keep_alive)
+        if self._api is not None:
+            if settings == self._settings:
+                return []
+            self.disconnect()  # reused client (interactive mode, daemon) got other connection options
+
+        self._settings = settings
+        username = None
+        password = None
+        if args.user:
+            username = args.user
+            if args.password:
+                password = args.password
+            elif ask_password:
+                import getpass
+                password = getpass.getpass("Enter Linstor password:")
+
+        self._create_api = self._api_factory(args, username, password, self._keep_alive or keep_alive)
+        self._tls_resume = not args.no_tls_cache
+        if args.verbose and not args.curl:
+            health = controllers.HealthCache().load()
+            print("Controller ranking:")
+            for pos, contrl in enumerate(health.rank(contrl_list), 1):
+                print("  {p}. {c} ({s})".format(p=pos, c=contrl, s=health.describe(contrl)))
+        result = self._adopt_warm_up(settings)
+        if result is None:
+            result = self._connect_first(args, contrl_list, self._create_api)
+        self._api, failed = result
+        if self._api is not None:
+            self._uri = self._api.controller_host()
+            self._timeout = args.timeout
+
+        conn_errors = []
+        for _, error in failed:
+            if not isinstance(error, linstor.LinstorNetworkError):
+                raise error  # e.g. unsupported controller version
+            conn_errors.append(error)
+        if self._api is None and not conn_errors:  # no controllers given
+            conn_errors.append(linstor.LinstorNetworkError("No controller given"))
+        return conn_errors
+
+    def connect_completer(self, parsed_args=None):
+        """
+        Connects for argument completion, unless already connected.
+
+        The completion only parses the command line, so the options of the config file are merged
+        here, options given on the command line win.
+
+        :param parsed_args: arguments parsed so far by the completion
+        :return: the connected client
+        :rtype: linstor.Linstor
+        """
+        if self._api is not None:
+            return self.api
+
+        disable_config = parsed_args is not None and getattr(parsed_args, 'disable_config', False)
+        args = self._parse_global_args(['--disable-config'] if disable_config else [])
+        defaults = self._parse_global_args(['--disable-config'])
+        for key in CONNECTION_OPTIONS:
+            value = getattr(parsed_args, key, None)
+            if value is not None and value != getattr(defaults, key):
+                setattr(args, key, value)
+        args.verbose = False
+
+        conn_errors = self.connect(args, ask_password=False)
+        if conn_errors:
+            raise conn_errors[0]
+        return self.api
+
+    def pool(self, size):
+        """
+        Returns connected clients for concurrent calls, the additional connections go to the controller
+        of the session and are kept until it disconnects.
+
+        :param int size: number of clients
+        :return: the client of the session and size - 1 keep-alive clients
+        :rtype: list[linstor.Linstor]
+        """
+        while len(self._pool) < size - 1:
+            linstorapi = self._create_api(self._uri, self._timeout, pooled=True)
+            if not (self._tls_resume and tlscache.connect_resumed(linstorapi, self._api, self._timeout)):
+                linstorapi.connect()
+            self._pool.append(linstorapi)
+        pool = self._pool[:size - 1]
+        if self.cache is not None and not self._api.curl:
+            pool = [CachedApi(x, self.cache) for x in pool]
+        return [self.api] + pool
+
+    def disconnect(self):
+        """
+        Closes the controller connections, the next command connects again.
+        """
+        self.discard_warm_up()
+        for linstorapi in [self._api] + self._pool:
+            if linstorapi is not None:
+                linstorapi.disconnect()
+        self._api = None
+        self._cached_api = None
+        self._pool = []
+        self._create_api = None
+        self._settings = None
+        self._uri = None
+        self._timeout = None
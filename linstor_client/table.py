@@ -4,8 +4,9 @@ import os
 import sys
 import fcntl
 import errno
-import operator
 import locale
+import re
+import threading
 from linstor_client.consts import (
     DEFAULT_TERM_HEIGHT,
     DEFAULT_TERM_WIDTH,
@@ -25,6 +26,12 @@ class SyntaxException(Exception):
 
 
 def get_terminal_size():
+    # like shutil.get_terminal_size(), explicit dimensions win (e.g. forwarded by the client daemon)
+    try:
+        return int(os.environ['COLUMNS']), int(os.environ['LINES'])
+    except (KeyError, ValueError):
+        pass
+
     def ioctl_GWINSZ(term_fd):
         term_dim = None
         try:
@@ -53,6 +60,126 @@ def get_terminal_size():
     return term_width, term_height
 
 
+# lines of a page besides its rows: table frame, header, status line and the prompt below it
+PAGE_OVERHEAD = 6
+
+DEFERRED_PAGE_HINT = "press Enter at the prompt for the next page"
+TERMINAL_PAGE_HINT = "Enter for the next page, q to quit"
+
+_local = threading.local()
+
+
+def defer_pages(enabled):
+    """
+    Lets tables shown with --page leave their further pages to the interactive prompt, see pending_pager().
+
+    :param bool enabled:
+    """
+    _local.defer_pages = enabled
+
+
+def pending_pager():
+    """
+    :return: the pager of the last paged table if it has pages left and they were deferred, otherwise None
+    :rtype: Pager
+    """
+    return getattr(_local, 'pager', None)
+
+
+def set_pending_pager(pager):
+    _local.pager = pager
+
+
+# digit runs of natural sort keys, see _natural_key()
+_DIGITS = re.compile(r'(\d+)')
+
+# the line boundaries of str.splitlines()
+_LINE_BREAK = re.compile(u'[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+
+_FRAME_CHARS = {
+    'utf8': {
+        'tl': u'╭',   # top left
+        'tr': u'╮',   # top right
+        'bl': u'╰',   # bottom left
+        'br': u'╯',   # bottom right
+        'mr': u'╡',   # middle right
+        'ml': u'╞',   # middle left
+        'mdc': u'┄',  # middle dotted connector
+        'msc': u'─',  # middle straight connector
+        'pipe': u'┊',
+        'hr': u'═'
+    },
+    'ascii': {
+        'tl': u'+',
+        'tr': u'+',
+        'bl': u'+',
+        'br': u'+',
+        'mr': u'|',
+        'ml': u'|',
+        'mdc': u'-',
+        'msc': u'-',
+        'pipe': u'|',
+        'hr': u'='
+    }
+}
+
+
+def _natural_key(text):
+    """
+    Natural sort key of an ASCII text, e.g. "node10" sorts after "node9".
+
+    :param str text:
+    :return: the text parts, digit runs as int, in alternating order starting with a str
+    :rtype: tuple
+    """
+    parts = _DIGITS.split(text)
+    parts[1::2] = [int(x) for x in parts[1::2]]
+    return tuple(parts)
+
+
+def _is_ascii(text):
+    try:
+        text.encode('ascii')
+    except UnicodeError:
+        return False
+    return True
+
+
+class _LineWriter(object):
+    """
+    Writes lines to a stream in blocks instead of one write per line.
+    """
+    BLOCK_LINES = 512
+
+    def __init__(self, stream, keep=False):
+        """
+        :param stream: file object to write to
+        :param bool keep: keep the written blocks for getvalue()
+        """
+        self._stream = stream
+        self._keep = keep
+        self._lines = []
+        self._blocks = []
+
+    def write_line(self, line):
+        self._lines.append(line)
+        if len(self._lines) >= self.BLOCK_LINES:
+            self.flush()
+
+    def flush(self):
+        if self._lines:
+            self._lines.append(u'')
+            block = u'\n'.join(self._lines)
+            self._lines = []
+            self._stream.write(block)
+            if self._keep:
+                self._blocks.append(block)
+        self._stream.flush()
+
+    def getvalue(self):
+        return u''.join(self._blocks)
+
+
 class TableHeader(object):
     ALIGN_LEFT = '<'
     ALIGN_RIGHT = '>'
@@ -94,11 +221,18 @@ class Table(object):
         self.got_column = False
         self.got_row = False
         self.groups = []
+        self.sortby = []  # (column name, descending), see set_sortby()
+        self.offset = 0  # shown rows, see set_window()
+        self.limit = None
+        self.page = False
         self.header = []
         self.table = []
         self.coloroverride = []
         self._header_colors = False
         self.view = None
+        self.columns = None  # shown columns, see set_columns()
+        self._projection = None  # indices of the kept cells of added rows
+        self._row_len = 0
         self.showseps = False
         self.maxwidth = 0  # if 0, determine terminal width automatically
         if pastable:
@@ -163,11 +297,48 @@ class Table(object):
             else:
                 return str(t)
 
+    def set_columns(self, columns):
+        """
+        Restricts the table to the given columns and the group by columns. Unlike set_view() the cells of
+        the other columns are dropped as rows are added, show functions skip computing them, see shows().
+
+        :param list[str] columns: names of the shown columns, None for all
+        """
+        if self.got_row:
+            raise SyntaxException("Not allowed to set columns after rows")
+        self.columns = columns
+
+    def shows(self, name):
+        """
+        :param str name: column name
+        :return: True if the cells of the column are shown
+        :rtype: bool
+        """
+        return not self.columns or name in self.columns or name in self.groups or name in self.sort_names
+
+    def project_header(self):
+        """
+        Drops the columns not shown, see set_columns(), from the header. Done by the first add_row() and
+        before rendering, so tables without rows get the same header; does nothing once done.
+        """
+        if not self.columns or self._projection is not None:
+            return
+        self._row_len = len(self.header)
+        self._projection = [idx for idx, h in enumerate(self.header) if self.shows(h['name'])]
+        self.header = [self.header[idx] for idx in self._projection]
+        self.r_just = any(h['align_column'] == TableHeader.ALIGN_RIGHT for h in self.header)
+
     def add_row(self, row):
-        self.got_row = True
         if not self.got_column:
             raise SyntaxException("Not allowed to define rows before columns")
-        if len(row) != len(self.header):
+        if not self.got_row:
+            self.got_row = True
+            self.project_header()
+        if self._projection is not None:
+            if len(row) != self._row_len:
+                raise SyntaxException("Row len does not match headers")
+            row = [row[idx] for idx in self._projection]
+        elif len(row) != len(self.header):
             raise SyntaxException("Row len does not match headers")
 
         coloroverride = [None] * len(row)
@@ -197,6 +368,33 @@ class Table(object):
             assert(isinstance(groups, list))
             self.groups = groups
 
+    def set_sortby(self, keys):
+        """
+        Sorts the rows by the given columns, within the groups if group by columns are set.
+        Like group by columns the sort columns are always shown.
+
+        :param list[(str, bool)] keys: column names and whether to sort descending, most significant first
+        """
+        if self.got_row:
+            raise SyntaxException("Not allowed to set sort columns after rows")
+        self.sortby = keys or []
+
+    def set_window(self, offset=0, limit=None, page=False):
+        """
+        Restricts the output to a window of the sorted rows, only the rows in it are formatted.
+
+        :param int offset: number of rows to skip
+        :param int limit: maximum number of rows, None for all
+        :param bool page: show the window page by page, each page as high as the terminal, see Pager
+        """
+        self.offset = max(offset or 0, 0)
+        self.limit = None if limit is None else max(limit, 0)
+        self.page = page
+
+    @property
+    def sort_names(self):
+        return [name for name, _ in self.sortby]
+
     @classmethod
     def _determine_column_width(cls, column_text):
         """
@@ -207,22 +405,10 @@ class Table(object):
         :rtype: int
         """
         maxline = 0
-        for line in str(column_text).splitlines():
+        for line in column_text.splitlines():
             maxline = max(len(line), maxline)
         return maxline
 
-    @classmethod
-    def _str_print(cls, output):
-        """
-        Print and return output with attached new line.
-
-        :param str output:
-        :return: output + '\n'
-        :rtype: str
-        """
-        print(output)
-        return output + '\n'
-
     @classmethod
     def _row_expand(cls, row):
         """
@@ -257,185 +443,347 @@ class Table(object):
 
         return multirow
 
-    def show(self, row_separator=True):
-        output_table_str = ''
-        # no view set, use all headers
-        if not self.view:
-            self.view = [h['name'] for h in self.header]
-
-        if self.groups:
-            self.view += [g for g in self.groups if g not in self.view]
-
-        pcnt = 0
-        for idx, c in enumerate(self.header[:]):
-            if c['name'] not in self.view:
-                pidx = idx - pcnt
-                pcnt += 1
-                self.header.pop(pidx)
-                for row in self.table:
-                    row.pop(pidx)
-                for row in self.coloroverride:
-                    row.pop(pidx)
-
-        columnmax = [0] * len(self.header)
+    def _sort_keys(self, idx, normalize=False):
+        """
+        Computes the sort keys of a column once per distinct cell. Columns of integers are sorted as numbers,
+        other ASCII columns by a natural sort key, only the remaining ones need natsort.
+
+        :param int idx: column index
+        :param bool normalize: replace numeric cells by their number, e.g. for group by columns
+        :return: sort key per row index, None for separators
+        :rtype: list
+        """
+        cache = {}
+        numeric = True
+        for row in self.table:
+            if row[0] is None or row[idx] in cache:
+                continue
+            try:
+                cache[row[idx]] = int(row[idx])
+            except ValueError:
+                cache[row[idx]] = None
+                numeric = False
+
+        if normalize:
+            shown = dict((cell, self.to_unicode(value)) for cell, value in cache.items() if value is not None)
+            for row in self.table:
+                if row[0] is not None and row[idx] in shown:
+                    row[idx] = shown[row[idx]]
+            cache = dict((shown.get(cell, cell), value) for cell, value in cache.items())
+
+        if not numeric:
+            if all(_is_ascii(cell) for cell in cache):
+                keygen = _natural_key
+            else:
+                try:
+                    from natsort import natsort_keygen
+                    keygen = natsort_keygen()
+                except ImportError:
+                    keygen = _natural_key
+            cache = dict((cell, keygen(cell)) for cell in cache)
+        return [None if row[0] is None else cache[row[idx]] for row in self.table]
+
+    def _row_order(self, columns):
+        """
+        Sorts the rows by the group by columns and then by the sort columns. Numeric cells of group by columns
+        are shown as numbers.
+
+        :param list[int] columns: indices of the shown columns
+        :return: the row indices in sorted order and the positions of the group separators in it
+        :rtype: (list[int], set[int])
+        """
+        names = [self.header[idx]['name'] for idx in columns]
+        group_bys = [columns[names.index(g)] for g in self.groups if g in names]
+        sort_bys = [(columns[names.index(n)], desc) for n, desc in self.sortby if n in names]
+
+        # stable sorts from the least significant column on
+        order = [ridx for ridx, row in enumerate(self.table) if row[0] is not None]
+        for idx, desc in reversed(sort_bys):
+            order.sort(key=self._sort_keys(idx).__getitem__, reverse=desc)
+        for idx in reversed(group_bys):
+            order.sort(key=self._sort_keys(idx, normalize=True).__getitem__)
+
+        seps = set()
+        for idx in group_bys if order else []:
+            cur = self.table[order[0]][idx]
+            for pos, ridx in enumerate(order[1:], 1):
+                if self.table[ridx][idx] != cur:
+                    cur = self.table[ridx][idx]
+                    seps.add(pos)
+        return order, seps
+
+    @classmethod
+    def _window(cls, rows, offset, limit):
+        """
+        :param list rows: row indices, None for separators
+        :param int offset: number of rows to skip
+        :param int limit: maximum number of rows, None for all
+        :return: the rows of the window, without leading and trailing separators
+        :rtype: list
+        """
+        if not offset and limit is None:
+            return rows
+        end = None if limit is None else offset + limit
+        window = []
+        count = 0
+        for ridx in rows:
+            if end is not None and count >= end:
+                break
+            if ridx is None:
+                if window and window[-1] is not None:
+                    window.append(None)
+                continue
+            if count >= offset:
+                window.append(ridx)
+            count += 1
+        if window and window[-1] is None:
+            window.pop()
+        return window
+
+    def window_rows(self):
+        """
+        :return: the shown rows in order, as indices into self.table and None for separators
+        :rtype: list
+        """
+        view_names = self.view_names
+        columns = [idx for idx, h in enumerate(self.header) if h['name'] in view_names]
+        if (self.groups or self.sortby) and self.table:
+            order, seps = self._row_order(columns)
+            if self.showseps:
+                rows = []
+                for pos, ridx in enumerate(order):
+                    if pos in seps:
+                        rows.append(None)
+                    rows.append(ridx)
+            else:
+                rows = order
+        else:
+            rows = [None if row[0] is None else ridx for ridx, row in enumerate(self.table)]
+        return self._window(rows, self.offset, self.limit)
+
+    def show(self, row_separator=True, keep=False):
+        """
+        Prints the table to stdout, streamed in blocks of lines.
+
+        :param bool row_separator: draw separators between multi line rows
+        :param bool keep: keep the printed table in memory and return it
+        :return: the printed table if keep is set, None otherwise
+        :rtype: str
+        """
+        from linstor_client import clusters
+        cluster_collector = clusters.collector()
+        if cluster_collector is not None:  # merged with the tables of the other clusters, see --clusters
+            cluster_collector.tables.append(self)
+            return '' if keep else None
+
+        if self.page:
+            return self._show_pages(row_separator, keep)
+
+        writer = _LineWriter(sys.stdout, keep=keep)
+        try:
+            self.write(writer, row_separator)
+            writer.flush()
+        except IOError as e:
+            if e.errno == errno.EPIPE:
+                return
+            else:
+                raise e
+        return writer.getvalue() if keep else None
+
+    def _show_pages(self, row_separator, keep):
+        """
+        Prints the table page by page. In interactive mode the first page is printed and the others are left
+        to the prompt, on a terminal the next page is printed once Enter is pressed, otherwise all pages.
+
+        :param bool row_separator: draw separators between multi line rows
+        :param bool keep: keep the printed pages in memory and return them
+        :return: the printed pages if keep is set, None otherwise
+        :rtype: str
+        """
+        pager = Pager(self, row_separator)
+        try:
+            if getattr(_local, 'defer_pages', False):
+                output = pager.show_page(DEFERRED_PAGE_HINT, keep)
+                set_pending_pager(None if pager.done else pager)
+                return output
+
+            if not (sys.stdin.isatty() and sys.stdout.isatty()):
+                pages = [pager.show_page(keep=keep)]
+                while not pager.done:
+                    pages.append(pager.show_page(keep=keep))
+                return u''.join(pages) if keep else None
+
+            pages = [pager.show_page(TERMINAL_PAGE_HINT, keep)]
+            while not pager.done:
+                answer = sys.stdin.readline()
+                if not answer or answer.strip().lower() == 'q':
+                    break
+                pages.append(pager.show_page(TERMINAL_PAGE_HINT, keep))
+            return u''.join(pages) if keep else None
+        except IOError as e:
+            if e.errno == errno.EPIPE:
+                return
+            else:
+                raise e
+
+    @property
+    def view_names(self):
+        """
+        :return: names of the shown columns, all of them if no view is set, plus the group by and sort columns
+        :rtype: list[str]
+        """
+        view = self.view or [h['name'] for h in self.header]
+        extra = []
+        for name in self.groups + self.sort_names:
+            if name not in view and name not in extra:
+                extra.append(name)
+        return view + extra
+
+    def write(self, writer, row_separator=True, rows=None):
+        """
+        Renders the table line by line, the column widths are determined in one pass over the shown cells.
+
+        :param writer: object with a write_line(str) method, e.g. a _LineWriter
+        :param bool row_separator: draw separators between multi line rows
+        :param list rows: the rows to render as indices into self.table, None for separators,
+                          defaults to window_rows()
+        """
+        self.project_header()
+        view_names = self.view_names
+        columns = [idx for idx, h in enumerate(self.header) if h['name'] in view_names]
+        headers = [self.header[idx] for idx in columns]
+        header_size = len(headers)
+
         if self.maxwidth:
             maxwidth = self.maxwidth
         else:
             term_width, _ = get_terminal_size()
             maxwidth = 110 if term_width > 110 else term_width
 
-        hdrnames = [h['name'] for h in self.header]
-        if self.groups and self.table:
-            group_bys = [hdrnames.index(g) for g in self.groups if g in hdrnames]
-            for row in self.table:
-                for idx in group_bys:
-                    try:
-                        row[idx] = int(row[idx])
-                    except ValueError:
-                        pass
-            for idx, row in enumerate(self.table):
-                row += [idx]  # add table index for remap coloroverrides later
-            orig_coloroverride = self.coloroverride[:]
-            try:
-                from natsort import natsorted
-                self.table = natsorted(self.table, key=operator.itemgetter(*group_bys))
-            except ImportError:
-                self.table.sort(key=operator.itemgetter(*group_bys))
-
-            # restore color overrides after sort
-            for idx, row in enumerate(self.table):
-                self.coloroverride[idx] = orig_coloroverride[row[-1]]
-                # maybe remove the additional table index column, but it doesn't do harm
-
-            lstlen = len(self.table)
-            seps = set()
-            for c in range(len(self.header)):
-                if c not in group_bys:
-                    continue
-                cur = self.table[0][c]
-                for idx, l in enumerate(self.table):
-                    if idx < lstlen - 1:
-                        if self.table[idx + 1][c] != cur:
-                            cur = self.table[idx + 1][c]
-                            seps.add(idx + 1)
+        if rows is None:
+            rows = self.window_rows()
 
-            if self.showseps:
-                for c, pos in enumerate(sorted(seps)):
-                    self.table.insert(c + pos, [None])
-
-        # calc max width per column and set final strings (with color codes)
-        self.table.insert(0, [h.replace('_', ' ') for h in hdrnames])
-        self.coloroverride.insert(0, [None] * len(self.header))
-
-        # precalculate maximum column width
+        hdr_row = [h['name'].replace('_', ' ') for h in headers]
+        data_rows = [self.table[ridx] for ridx in rows if ridx is not None]
+        columnmax = []
         multi_line_row = False
-        for ridx, row in enumerate(self.table):
-            if row[0] is None:
-                continue
-            for idx, col in enumerate(self.header):
-                if not multi_line_row:
-                    multi_line_row = str(row[idx]).find("\n") >= 0
-                columnmax[idx] = max(self._determine_column_width(row[idx]), columnmax[idx])
-
-        # insert frames
-        self.table.insert(0, [None])
-        self.table.insert(2, [None])
-        self.table.append([None])
-
-        # build format string
-        ctbl = {
-            'utf8': {
-                'tl': u'╭',   # top left
-                'tr': u'╮',   # top right
-                'bl': u'╰',   # bottom left
-                'br': u'╯',   # bottom right
-                'mr': u'╡',   # middle right
-                'ml': u'╞',   # middle left
-                'mdc': u'┄',  # middle dotted connector
-                'msc': u'─',  # middle straight connector
-                'pipe': u'┊',
-                'hr': u'═'
-            },
-            'ascii': {
-                'tl': u'+',
-                'tr': u'+',
-                'bl': u'+',
-                'br': u'+',
-                'mr': u'|',
-                'ml': u'|',
-                'mdc': u'-',
-                'msc': u'-',
-                'pipe': u'|',
-                'hr': u'='
-            }
-        }
+        for pos, idx in enumerate(columns):
+            width = 0
+            for cell in [hdr_row[pos]] + [row[idx] for row in data_rows]:
+                if _LINE_BREAK.search(cell) is None:
+                    if len(cell) > width:
+                        width = len(cell)
+                else:
+                    multi_line_row = multi_line_row or '\n' in cell
+                    width = max(width, self._determine_column_width(cell))
+            columnmax.append(width)
 
         enc = 'ascii'
         if self.utf8:
             locales = locale.getdefaultlocale()
             if len(locales) > 1 and locales[1] and isinstance(locales[1], str) and locales[1].lower() == 'utf-8':
                 enc = 'utf8'
-
-        try:
-            data_idx = 0  # index of the actual data table, self.table was inserted with table separators
-            space = maxwidth - sum(columnmax)
-            header_size = len(self.header)
-            table_size = len(self.table)
-            for ridx, row in enumerate(self.table):
-                if row[0] is None:  # print a separator
-                    if ridx == 0:  # top line
-                        l, m, r = ctbl[enc]['tl'], ctbl[enc]['msc'], ctbl[enc]['tr']
-                    elif ridx == table_size - 1:  # bottom line
-                        l, m, r = ctbl[enc]['bl'], ctbl[enc]['msc'], ctbl[enc]['br']
-                    elif ridx == 2:
-                        l, m, r = ctbl[enc]['ml'], ctbl[enc]['hr'], ctbl[enc]['mr']
-                    else:  # mid separators
-                        l, m, r = ctbl[enc]['ml'], ctbl[enc]['mdc'], ctbl[enc]['mr']
-                    row_sep = l + m * (sum(columnmax) + (3 * header_size) - 1) + r
-
-                    if self.r_just and len(row_sep) < maxwidth:
-                        output_table_str += self._str_print(l + m * (maxwidth - 2) + r)
-                    else:
-                        output_table_str += self._str_print(row_sep)
+        chars = _FRAME_CHARS[enc]
+        pipe = chars['pipe']
+
+        sep_width = sum(columnmax) + (3 * header_size) - 1
+
+        def separator(left, middle, right):
+            if self.r_just and sep_width + 2 < maxwidth:
+                return left + middle * (maxwidth - 2) + right
+            return left + middle * sep_width + right
+
+        # format parts per column: padding of right aligned columns, format spec of the cell, default color
+        space_and_overhead = maxwidth - sum(columnmax) - (header_size * 3) - 2
+        right_pad = u' ' * space_and_overhead + pipe if space_and_overhead >= 0 else u''
+        col_parts = []
+        for pos, col in enumerate(headers):
+            pad = right_pad if col['align_column'] == TableHeader.ALIGN_RIGHT else u''
+            col_parts.append((pad, u'{0:' + col['just_txt'] + str(columnmax[pos]) + u'}', col['color']))
+
+        def format_line(cells, overrides, default_colors):
+            parts = [pipe]
+            for pos, (pad, field_format, color) in enumerate(col_parts):
+                parts.append(pad + u' ')
+                override = overrides[pos] if overrides else None
+                if override or color and default_colors:
+                    parts.append((override or color) + field_format.format(cells[pos]) + Color.NONE)
                 else:
-                    fstr = ctbl[enc]['pipe']  # prepare the format string per row, this allows colors per cell
-                    for idx, col in enumerate(self.header):  # loop columns
-                        if col['align_column'] == TableHeader.ALIGN_RIGHT:
-                            space_and_overhead = space - (header_size * 3) - 2
-                            if space_and_overhead >= 0:
-                                fstr += u' ' * space_and_overhead + ctbl[enc]['pipe']
-
-                        field_format = u'{' + str(idx) + u':' + col['just_txt'] + str(columnmax[idx]) + u'}'
-
-                        fstr += u' '
-                        # add color, if set
-                        if self.coloroverride[data_idx][idx] or col['color'] and (self._header_colors or data_idx > 0):
-                            if self.coloroverride[data_idx][idx]:
-                                color = self.coloroverride[data_idx][idx]
-                            else:
-                                color = col['color']
-                            fstr += color + field_format + Color.NONE
-                        else:
-                            fstr += field_format
-                        fstr += u' ' + ctbl[enc]['pipe']
-
-                    data_idx += 1  # we wrote a data row, so increase the data_idx
-                    # split rows into row lines (for multiline support)
-                    for singlerow in self._row_expand(row):
-                        output_table_str += self._str_print(fstr.format(*singlerow))
-
-                    # if multiline rows and not disabled draw row separators between real rows
-                    if 2 < ridx < table_size - 2:
-                        if multi_line_row and row_separator:
-                            row_sep = ctbl[enc]['ml'] + ctbl[enc]['mdc']\
-                                      * (sum(columnmax) + (3 * header_size) - 1) + ctbl[enc]['mr']
-                            output_table_str += self._str_print(row_sep)
-            return output_table_str
-        except IOError as e:
-            if e.errno == errno.EPIPE:
+                    parts.append(field_format.format(cells[pos]))
+                parts.append(u' ' + pipe)
+            return u''.join(parts)
+
+        def write_row(cells, overrides, default_colors):
+            if not multi_line_row:
+                writer.write_line(format_line(cells, overrides, default_colors))
                 return
-            else:
-                raise e
+            for singlerow in self._row_expand(cells):
+                writer.write_line(format_line(singlerow, overrides, default_colors))
+
+        writer.write_line(separator(chars['tl'], chars['msc'], chars['tr']))
+        write_row(hdr_row, None, self._header_colors)
+        writer.write_line(separator(chars['ml'], chars['hr'], chars['mr']))
+
+        # color overrides belong to the data rows in the order they were added
+        override_idx = {}
+        for ridx, row in enumerate(self.table):
+            if row[0] is not None:
+                override_idx[ridx] = len(override_idx)
+        mid_separator = separator(chars['ml'], chars['mdc'], chars['mr'])
+        row_sep = chars['ml'] + chars['mdc'] * sep_width + chars['mr']
+        last = len(rows) - 1
+        for pos, ridx in enumerate(rows):
+            if ridx is None:
+                writer.write_line(mid_separator)
+                continue
+            row = self.table[ridx]
+            overrides = self.coloroverride[override_idx[ridx]]
+            write_row([row[idx] for idx in columns], [overrides[idx] for idx in columns], True)
+            if pos < last and multi_line_row and row_separator:
+                writer.write_line(row_sep)
+
+        writer.write_line(separator(chars['bl'], chars['msc'], chars['br']))
 
     def color_cell(self, text, color):
         return (color, text) if self.colors else text
+
+
+class Pager(object):
+    """
+    Shows the window of a table page by page, a page is only formatted once it is shown.
+    """
+    def __init__(self, table, row_separator=True):
+        """
+        :param Table table: table with all rows added
+        :param bool row_separator: draw separators between multi line rows
+        """
+        self._table = table
+        self._row_separator = row_separator
+        self._rows = table.window_rows()
+        self._total = len([x for x in self._rows if x is not None])
+        self._shown = 0
+
+    @property
+    def done(self):
+        return self._shown >= self._total
+
+    def show_page(self, hint=None, keep=False):
+        """
+        Prints the next page, its height fits the current terminal.
+
+        :param str hint: how to get the next page, shown below the page if there are pages left
+        :param bool keep: keep the printed page in memory and return it
+        :return: the printed page if keep is set, None otherwise
+        :rtype: str
+        """
+        _, term_height = get_terminal_size()
+        size = max(term_height - PAGE_OVERHEAD, 1)
+        first = self._shown
+        writer = _LineWriter(sys.stdout, keep=keep)
+        self._table.write(writer, self._row_separator, Table._window(self._rows, first, size))
+        self._shown = min(first + size, self._total)
+        if hint and not self.done:
+            writer.write_line(u"-- rows {f}-{l} of {t}, {h} --".format(
+                f=first + 1, l=self._shown, t=self._total, h=hint))
+        writer.flush()
+        return writer.getvalue() if keep else None
@@ -0,0 +1,151 @@
+"""
+Shortcuts for the TLS connections to HTTPS controllers, see --no-tls-cache.
+
+python-linstor finds the HTTPS port of a linstor:// controller with a plain HTTP request that gets
+redirected, on every connect. The redirect target of every controller is kept in a cache file only
+readable by the user, later invocations connect to the HTTPS port right away.
+
+Additional connections of a session, e.g. the ones of --parallel, share the SSL context of the first
+connection and resume its TLS session instead of a full handshake. This needs python 3.6 or later, older
+ones connect them like the first. The standard library can not export TLS sessions, so they do not outlive
+the process; the client daemon keeps the whole connection instead.
+"""
+
+import json
+import os
+import ssl
+import tempfile
+import time
+
+try:
+    from urllib.parse import urlparse
+    from http.client import HTTPConnection, HTTPSConnection
+except ImportError:
+    from urlparse import urlparse
+    from httplib import HTTPConnection, HTTPSConnection
+
+from linstor_client import apicompat
+from linstor_client.utils import cache_dir
+
+# seconds until a recorded HTTPS endpoint is verified by a redirect again
+TLS_TTL = 86400
+
+# TLS sessions can be resumed since python 3.6
+RESUMPTION = hasattr(ssl.SSLSocket, 'session')
+
+_SSL_SCHEMES = ('linstor+ssl', 'https')
+
+
+class TlsCache(object):
+    """
+    HTTPS ports of the controllers, stored in the user cache directory.
+    """
+    def __init__(self, path=None, ttl=TLS_TTL):
+        """
+        :param str path: cache file, defaults to <cache dir>/tls
+        :param int ttl: seconds until a recorded endpoint expires
+        """
+        self._path = path or os.path.join(cache_dir(), 'tls')
+        self._ttl = ttl
+        self._entries = {}  # configured uri -> {'port': https port, 'time': last use}
+        self._changed = False
+
+    def load(self):
+        try:
+            with open(self._path) as cache_file:
+                entries = json.load(cache_file)
+            if isinstance(entries, dict):
+                self._entries = entries
+        except (IOError, OSError, ValueError):  # missing or broken cache, start over
+            self._entries = {}
+        return self
+
+    def save(self):
+        if not self._changed:
+            return
+        now = time.time()
+        entries = dict((k, v) for k, v in self._entries.items() if now - v['time'] <= self._ttl)
+        try:
+            cache_path = os.path.dirname(self._path)
+            if not os.path.isdir(cache_path):
+                os.makedirs(cache_path, 0o700)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_path)  # created with mode 0600
+            with os.fdopen(fd, 'w') as tmp_file:
+                json.dump(entries, tmp_file)
+            os.rename(tmp_path, self._path)
+            self._changed = False
+        except (IOError, OSError):
+            pass  # cache is an optimization only, e.g. read-only home directories
+
+    def resolve(self, uri):
+        """
+        :param str uri: configured controller uri
+        :return: the uri of the known HTTPS endpoint of the controller, otherwise uri
+        :rtype: str
+        """
+        entry = self._entries.get(uri)
+        if entry is None or time.time() - entry['time'] > self._ttl:
+            return uri
+        host = urlparse(uri).hostname
+        if ':' in host:  # ipv6 address
+            host = '[' + host + ']'
+        return "linstor+ssl://{h}:{p}".format(h=host, p=entry['port'])
+
+    def record(self, uri, api):
+        """
+        Remembers the HTTPS endpoint a controller was connected to.
+
+        :param str uri: configured controller uri
+        :param linstor.Linstor api: client connected to it, possibly to the resolved uri
+        """
+        if urlparse(uri).scheme in _SSL_SCHEMES:
+            return
+        if api.is_secure_connection:
+            self._entries[uri] = {'port': apicompat.rest_connection(api).port, 'time': time.time()}
+            self._changed = True
+        else:
+            self.forget(uri)
+
+    def forget(self, uri):
+        if self._entries.pop(uri, None) is not None:
+            self._changed = True
+
+
+class _ResumingHTTPSConnection(HTTPSConnection):
+    """
+    HTTPS connection resuming a TLS session, also on reconnects.
+    """
+    def __init__(self, host, port, timeout, context, session):
+        HTTPSConnection.__init__(self, host=host, port=port, timeout=timeout, context=context)
+        self._ssl_context = context
+        self._session = session
+
+    def connect(self):
+        HTTPConnection.connect(self)
+        self.sock = self._ssl_context.wrap_socket(self.sock, server_hostname=self.host, session=self._session)
+        if self.sock.session is not None:
+            self._session = self.sock.session
+
+
+def connect_resumed(api, template, timeout):
+    """
+    Connects a client to the controller of another, connected one, resuming its TLS session.
+
+    :param linstor.Linstor api: not yet connected client
+    :param linstor.Linstor template: connected client of the same controller
+    :param float timeout: socket timeout of the connection
+    :return: False if template is no TLS connection or sessions can not be resumed, api has to be
+        connected by its connect() then
+    :rtype: bool
+    """
+    if not RESUMPTION or not template.is_secure_connection:
+        return False
+    rest_conn = apicompat.rest_connection(template)
+    if rest_conn is None or rest_conn.sock is None:
+        return False
+    context = apicompat.ssl_context(rest_conn)
+    if context is None:
+        return False
+    apicompat.connect_through(
+        api, _ResumingHTTPSConnection(rest_conn.host, rest_conn.port, timeout, context, rest_conn.sock.session))
+    return True
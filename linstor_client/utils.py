@@ -18,6 +18,7 @@
     See <http://www.gnu.org/licenses/>.
 """
 
+import os
 import subprocess
 import sys
 
@@ -29,9 +30,11 @@ from linstor_client.consts import (
 
 class Output(object):
     @staticmethod
-    def handle_ret(answer, no_color, warn_as_error, outstream=sys.stdout):
+    def handle_ret(answer, no_color, warn_as_error, outstream=None):
         from linstor.sharedconsts import (MASK_ERROR, MASK_WARN, MASK_INFO)
 
+        outstream = outstream or sys.stdout  # not bound at import time, sys.stdout might get replaced
+
         rc = answer.ret_code
         ret = 0
         message = answer.message
@@ -119,6 +122,41 @@ class Output(object):
         return msg
 
 
+def cache_dir():
+    """
+    Returns the directory for client side caches, honoring XDG_CACHE_HOME.
+
+    :return: path of the linstor cache directory, it might not exist yet
+    :rtype: str
+    """
+    return os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'linstor')
+
+
+def config_section(section):
+    """
+    Reads a section of the client config file, the same one linstor.Config.get_section() reads:
+    ~/.config/linstor/linstor-client.conf, otherwise /etc/linstor/linstor-client.conf. Unlike that one
+    it does not import python-linstor, which local commands do not need otherwise.
+
+    :param str section: section name, e.g. 'global'
+    :return: the entries of the section, empty if there is no config file or no such section
+    :rtype: dict[str, str]
+    """
+    try:
+        from configparser import ConfigParser
+    except ImportError:
+        from ConfigParser import SafeConfigParser as ConfigParser
+
+    config_file = "linstor-client.conf"
+    for path in (os.path.join(os.path.expanduser("~"), ".config", "linstor", config_file),
+                 os.path.join('/etc', 'linstor', config_file)):
+        if os.path.exists(path):
+            cp = ConfigParser()
+            cp.read(path)
+            return dict(cp.items(section)) if cp.has_section(section) else {}
+    return {}
+
+
 # a wrapper for subprocess.check_output
 def check_output(*args, **kwargs):
     def _wrapcall_2_6(*args, **kwargs):
@@ -181,7 +219,9 @@ def filter_new_args(unsetprefix, args):
     reserved_keys = [
         "func", "optsobj", "common", "command",
         "controllers", "warn_as_error", "no_utf8", "no_color",
-        "machine_readable", "disable_config", "timeout", "verbose", "output_version", "curl", "allow_insecure_auth"
+        "machine_readable", "disable_config", "timeout", "connect_timeout", "verbose", "output_version", "curl",
+        "allow_insecure_auth",
+        "batch", "jobs", "clusters", "no_cache", "no_tls_cache"
     ]
     for k, v in args.__dict__.items():
         if v is not None and k not in reserved_keys:
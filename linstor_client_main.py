@@ -20,35 +20,19 @@
 
 import sys
 import os
-import traceback
 import itertools
-import getpass
+import importlib
 
-import linstor
 import linstor_client.argparse.argparse as argparse
-import linstor_client.argcomplete as argcomplete
 import linstor_client.utils as utils
 from linstor_client.commands import (
-    ControllerCommands,
-    VolumeDefinitionCommands,
-    StoragePoolDefinitionCommands,
-    StoragePoolCommands,
-    ResourceDefinitionCommands,
-    ResourceGroupCommands,
-    VolumeGroupCommands,
-    ResourceCommands,
-    ResourceConnectionCommands,
-    VolumeCommands,
-    NodeCommands,
-    SnapshotCommands,
-    DrbdProxyCommands,
-    MigrateCommands,
-    ZshGenerator,
-    MiscCommands,
     Commands,
     DefaultState,
     ArgumentError
 )
+from linstor_client.commands.zsh_completer import ZshGenerator
+from linstor_client.commands.bash_completer import BashGenerator
+from linstor_client.session import Session
 
 from linstor_client.consts import (
     GITHASH,
@@ -58,6 +42,41 @@ from linstor_client.consts import (
     ExitCode
 )
 
+# top level command groups: command name and aliases, module in linstor_client.commands and class
+# implementing them. The modules (and python-linstor) only get imported if one of their commands is used.
+COMMAND_GROUPS = [
+    ([Commands.CONTROLLER, 'c'], 'controller_cmds', 'ControllerCommands'),
+    ([Commands.NODE, 'n'], 'node_cmds', 'NodeCommands'),
+    ([Commands.RESOURCE_DEF, 'rd'], 'rsc_dfn_cmds', 'ResourceDefinitionCommands'),
+    ([Commands.RESOURCE_GRP, 'rg'], 'rsc_grp_cmds', 'ResourceGroupCommands'),
+    ([Commands.VOLUME_GRP, 'vg'], 'vlm_grp_cmds', 'VolumeGroupCommands'),
+    ([Commands.RESOURCE, 'r'], 'rsc_cmds', 'ResourceCommands'),
+    ([Commands.RESOURCE_CONN, 'rc'], 'rsc_conn_cmds', 'ResourceConnectionCommands'),
+    ([Commands.VOLUME, 'v'], 'vlm_cmds', 'VolumeCommands'),
+    ([Commands.SNAPSHOT, 's'], 'snapshot_cmds', 'SnapshotCommands'),
+    ([Commands.DRBD_PROXY, 'proxy'], 'drbd_proxy_cmds', 'DrbdProxyCommands'),
+    ([Commands.STORAGE_POOL_DEF, 'spd'], 'storpool_dfn_cmds', 'StoragePoolDefinitionCommands'),
+    ([Commands.STORAGE_POOL, 'sp'], 'storpool_cmds', 'StoragePoolCommands'),
+    ([Commands.VOLUME_DEF, 'vd'], 'vlm_dfn_cmds', 'VolumeDefinitionCommands'),
+    ([Commands.CRYPT, 'e'], 'commands', 'MiscCommands'),
+    ([Commands.ERROR_REPORTS, 'err'], 'commands', 'MiscCommands'),
+    ([Commands.WAIT, 'w'], 'wait_cmds', 'WaitCommands'),
+]
+
+
+class _QuietArgumentParser(argparse.ArgumentParser):
+    """
+    Parser for a background parse of the command line, errors and --version are left to the real parse.
+    """
+    def _print_message(self, message, file=None):
+        pass
+
+    def exit(self, status=0, message=None):
+        raise ValueError(message)
+
+    def error(self, message):
+        raise ValueError(message)
+
 
 class StateService(object):
     def __init__(self, linstor_cli):
@@ -85,6 +104,105 @@ class StateService(object):
         return self._current_state[-1] if self._current_state else DefaultState()
 
 
+class LazyParserMap(dict):
+    """
+    Name to parser map of the top level subparsers action.
+
+    Command groups are registered with their names and a setup function and only
+    get built once one of their names is looked up. Walking the map (items, keys, ...)
+    builds all pending groups, so help, completion and the command listings
+    still see the complete parser tree.
+    """
+    def __init__(self):
+        super(LazyParserMap, self).__init__()
+        self._pending = []  # list of (names, setup_func)
+
+    def register(self, names, setup_func):
+        self._pending.append((names, setup_func))
+
+    def pending_names(self):
+        return [names for names, _ in self._pending]
+
+    def build(self, name):
+        for names, setup_func in self._pending:
+            if name in names:
+                self._run_setup(setup_func)
+                break
+
+    def build_all(self):
+        while self._pending:
+            self._run_setup(self._pending[0][1])
+
+    def _run_setup(self, setup_func):
+        # a setup function may provide more than one command group, e.g. MiscCommands
+        self._pending = [x for x in self._pending if x[1] is not setup_func]
+        setup_func()
+
+    def __contains__(self, name):
+        if not dict.__contains__(self, name):
+            self.build(name)
+        return dict.__contains__(self, name)
+
+    def __getitem__(self, name):
+        if not dict.__contains__(self, name):
+            self.build(name)
+        return dict.__getitem__(self, name)
+
+    def get(self, name, default=None):
+        return self[name] if name in self else default
+
+    def __iter__(self):
+        self.build_all()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self.build_all()
+        return dict.__len__(self)
+
+    def keys(self):
+        self.build_all()
+        return dict.keys(self)
+
+    def values(self):
+        self.build_all()
+        return dict.values(self)
+
+    def items(self):
+        self.build_all()
+        return dict.items(self)
+
+
+class LazySubParsersAction(argparse._SubParsersAction):
+    """
+    Subparsers action that builds command groups on demand, see LazyParserMap.
+    """
+    def __init__(self, *args, **kwargs):
+        super(LazySubParsersAction, self).__init__(*args, **kwargs)
+        self._name_parser_map = LazyParserMap()
+        self.choices = self._name_parser_map
+
+    def add_lazy_parsers(self, names, setup_func):
+        """
+        Registers a command group that is set up by calling setup_func(self) on first use.
+
+        :param list[str] names: main command name followed by its aliases
+        :param setup_func: function adding the command group to the given subparsers action
+        """
+        self._name_parser_map.register(names, lambda: setup_func(self))
+
+    def parser_names(self):
+        """
+        Returns the command names grouped by parser, without building pending groups.
+
+        :return: list of name lists
+        :rtype: list[list[str]]
+        """
+        cmds = dict()
+        for choice, subparser in dict.items(self._name_parser_map):
+            cmds.setdefault(id(subparser), []).append(choice)
+        return list(cmds.values()) + self._name_parser_map.pending_names()
+
+
 class LinStorCLI(object):
     """
     linstor command line client
@@ -92,31 +210,67 @@ class LinStorCLI(object):
 
     readline_history_file = "~/.config/linstor/client.history"
 
-    def __init__(self):
+    def __init__(self, keep_alive=False, warm_up_args=None, env_controllers=True):
+        """
+        :param bool keep_alive: always use a keep-alive controller connection, not only in interactive mode
+        :param list[str] warm_up_args: command line to connect for in the background while the parser is built
+        :param bool env_controllers: also connect to the controllers of LS_CONTROLLERS, cluster profiles
+            name their own
+        """
         self._state_service = StateService(self)
         self._all_commands = None
+        self._keep_alive = keep_alive
 
-        self._controller_commands = ControllerCommands()
-        self._node_commands = NodeCommands()
-        self._storage_pool_dfn_commands = StoragePoolDefinitionCommands()
-        self._storage_pool_commands = StoragePoolCommands()
-        self._resource_dfn_commands = ResourceDefinitionCommands()
-        self._resource_grp_commands = ResourceGroupCommands()
-        self._volume_grp_commands = VolumeGroupCommands()
-        self._volume_dfn_commands = VolumeDefinitionCommands()
-        self._resource_commands = ResourceCommands(self._state_service)
-        self._resource_conn_commands = ResourceConnectionCommands()
-        self._volume_commands = VolumeCommands()
-        self._snapshot_commands = SnapshotCommands()
-        self._drbd_proxy_commands = DrbdProxyCommands()
-        self._misc_commands = MiscCommands()
+        self._command_objects = {}  # class name -> command object of the already used command groups
+        self._session = Session(self.parse_global_args, keep_alive, env_controllers)
         self._zsh_generator = None
+        self._bash_generator = None
+        self._command_index = None
+        self._parser = None
+        if '_ARGCOMPLETE' in os.environ:
+            from linstor_client import cmdindex
+            cmdindex.autocomplete(self)  # answers from the command index and exits
+        if warm_up_args is not None:
+            self._session.warm_up(warm_up_args)
         self._parser = self.setup_parser()
-        self._all_commands = self.parser_cmds(self._parser)
-        self._linstorapi = None  # type: linstor.Linstor
+        self._all_commands = self.sort_cmds(self._parser._actions[-1].parser_names())
 
-    def setup_parser(self):
-        parser = argparse.ArgumentParser(prog="linstor")
+    def command_object(self, module_name, class_name):
+        """
+        Returns the command object implementing a command group, its module is imported on first use.
+
+        :param str module_name: module in linstor_client.commands
+        :param str class_name: name of the Commands subclass
+        :return: the command object, it uses the session of the client
+        :rtype: Commands
+        """
+        if class_name not in self._command_objects:
+            module = importlib.import_module('linstor_client.commands.' + module_name)
+            cmd_class = getattr(module, class_name)
+            if class_name == 'ResourceCommands':
+                command_object = cmd_class(self._state_service, self._session)
+            else:
+                command_object = cmd_class(self._session)
+            self._command_objects[class_name] = command_object
+        return self._command_objects[class_name]
+
+    def command_index(self):
+        """
+        Returns the serialized command tree, built from the parser if the cached one is outdated.
+
+        :return: the command index, see linstor_client.cmdindex
+        :rtype: dict
+        """
+        if self._command_index is None:
+            from linstor_client import cmdindex
+            self._command_index = cmdindex.load_index(
+                lambda: self._parser or self.setup_parser(),
+                [os.path.abspath(__file__)]
+            )
+        return self._command_index
+
+    @staticmethod
+    def add_global_arguments(parser):
         """
         ATTENTION! ATTENTION!
         If you add a new global option here, don't forget to update:
@@ -135,10 +289,13 @@ class LinStorCLI(object):
         parser.add_argument('--curl',
                             action="store_true",
                             help="Do not execute the action, only output a curl equivalent command.")
-        parser.add_argument('--controllers', default='localhost:%d' % linstor.Linstor.REST_PORT,
+        parser.add_argument('--controllers', default='localhost',
                             help='Comma separated list of controllers (e.g.: "host1:port,host2:port"). '
                             'If the environment variable %s is set, '
                             'the ones set via this argument get appended.' % KEY_LS_CONTROLLERS)
+        parser.add_argument('--clusters', metavar='NAME[,NAME...]',
+                            help="Run a list command on the clusters of the [cluster.NAME] config sections "
+                                 "and merge their output, with the cluster as additional column.")
         parser.add_argument('-m', '--machine-readable', action="store_true")
         parser.add_argument(
             '--output-version',
@@ -150,6 +307,9 @@ class LinStorCLI(object):
         parser.add_argument('--verbose', '-V', action='store_true')
         parser.add_argument('-t', '--timeout', default=300, type=int,
                             help="Connection/Command timeout value in seconds.")
+        parser.add_argument('--connect-timeout', default=10, type=float,
+                            help="Seconds a controller has to answer the connect, all controllers are tried at "
+                                 "the same time and the first answering one is used. Default: %(default)s")
         parser.add_argument('--disable-config', action="store_true",
                             help="Disable config loading and only use commandline arguments.")
         parser.add_argument('--user', '-u', help="Linstor username to use")
@@ -159,7 +319,24 @@ class LinStorCLI(object):
             action='store_true',
             help="Allow password authentication with HTTP"
         )
+        parser.add_argument('--no-tls-cache', action="store_true",
+                            help="Do not remember the HTTPS port of controllers across invocations and do not "
+                                 "resume TLS sessions for additional connections.")
+        parser.add_argument('--batch', metavar='FILE',
+                            help="Execute the commands in FILE, one per line, '-' reads them from stdin. "
+                                 "Output and exit code are reported per line.")
+        parser.add_argument('--jobs', '-j', type=int, default=1,
+                            help="Number of --batch lines executed concurrently, output stays in order. "
+                                 "Default: %(default)s")
+        parser.add_argument('--no-cache', action="store_true",
+                            help="Fetch fresh data from the controller, instead of the list responses cached "
+                                 "in interactive and batch mode.")
+
+    def setup_parser(self):
+        parser = argparse.ArgumentParser(prog="linstor")
+        self.add_global_arguments(parser)
 
+        parser.register('action', 'parsers', LazySubParsersAction)
         subp = parser.add_subparsers(title='subcommands',
                                      description='valid subcommands',
                                      help='Use the list command to print a '
@@ -187,42 +364,15 @@ class LinStorCLI(object):
                                  description='Only useful in interactive mode')
         p_exit.set_defaults(func=self.cmd_exit, always_allowed=True)
 
-        # controller commands
-        self._controller_commands.setup_commands(subp)
-
-        # add all node commands
-        self._node_commands.setup_commands(subp)
-
-        # new-resource definition
-        self._resource_dfn_commands.setup_commands(subp)
-
-        self._resource_grp_commands.setup_commands(subp)
-        self._volume_grp_commands.setup_commands(subp)
+        # refresh
+        p_refresh = subp.add_parser(Commands.REFRESH,
+                                    description='Drop the list responses cached in interactive and batch mode, '
+                                                'following commands fetch fresh data')
+        p_refresh.set_defaults(func=self.cmd_refresh, always_allowed=True)
 
-        # add all resource commands
-        self._resource_commands.setup_commands(subp)
-
-        self._resource_conn_commands.setup_commands(subp)
-
-        self._volume_commands.setup_commands(subp)
-
-        # add all snapshot commands
-        self._snapshot_commands.setup_commands(subp)
-
-        # add all DRBD proxy commands
-        self._drbd_proxy_commands.setup_commands(subp)
-
-        # add all storage pool definition commands
-        self._storage_pool_dfn_commands.setup_commands(subp)
-
-        # add all storage pools commands
-        self._storage_pool_commands.setup_commands(subp)
-
-        # add all volume definition commands
-        self._volume_dfn_commands.setup_commands(subp)
-
-        # misc commands
-        self._misc_commands.setup_commands(subp)
+        # command groups, their parsers get built on first use
+        for names, module_name, class_name in COMMAND_GROUPS:
+            subp.add_lazy_parsers(names, self._group_setup(module_name, class_name))
 
         # dm-migrate
         c_dmmigrate = subp.add_parser(
@@ -231,40 +381,114 @@ class LinStorCLI(object):
         )
         c_dmmigrate.add_argument('ctrlvol', help='json dump generated by "drbdmanage export-ctrlvol"')
         c_dmmigrate.add_argument('script', help='file name of the generated migration shell script')
-        c_dmmigrate.set_defaults(func=MigrateCommands.cmd_dmmigrate)
+        c_dmmigrate.set_defaults(func=self.cmd_dmmigrate)
 
         # zsh completer
-        self._zsh_generator = ZshGenerator(subp)
+        self._zsh_generator = ZshGenerator(parser)
         zsh_compl = subp.add_parser(
             Commands.GEN_ZSH_COMPLETER,
             description='Generate a zsh completion script'
         )
         zsh_compl.set_defaults(func=self._zsh_generator.cmd_completer)
 
-        argcomplete.autocomplete(parser)
+        # bash completer
+        self._bash_generator = BashGenerator(parser)
+        bash_compl = subp.add_parser(
+            Commands.GEN_BASH_COMPLETER,
+            description='Generate a bash completion script'
+        )
+        bash_compl.set_defaults(func=self._bash_generator.cmd_completer)
 
         subp.metavar = "{%s}" % ", ".join(sorted(Commands.MainList))
 
         return parser
 
+    def _group_setup(self, module_name, class_name):
+        def setup_commands(subp):
+            return self.command_object(module_name, class_name).setup_commands(subp)
+        return setup_commands
+
     @staticmethod
     def merge_config_arguments(pargs):
-        global_entries = linstor.Config.get_section('global')
+        global_entries = utils.config_section('global')
         for key, val in global_entries.items():
             pargs.insert(0, "--" + key)
             if val:
                 pargs.insert(1, val)
         return pargs
 
+    def parse_global_args(self, pargs, quiet=False):
+        """
+        Parses the global options in pargs and the ones from the config file, other arguments are ignored.
+
+        :param list[str] pargs: command line arguments
+        :param bool quiet: raise ValueError on invalid options, instead of printing usage and exiting
+        :return: namespace of the global options
+        """
+        pargs = list(pargs)
+        if '--disable-config' not in pargs:
+            pargs = LinStorCLI.merge_config_arguments(pargs)
+        global_parser = (_QuietArgumentParser if quiet else argparse.ArgumentParser)(prog="linstor", add_help=False)
+        self.add_global_arguments(global_parser)
+        return global_parser.parse_known_args(pargs)[0]
+
     def parse(self, pargs):
         # read global options from config file
         if '--disable-config' not in pargs:
-            pargs = LinStorCLI.merge_config_arguments(pargs)
+            pargs = LinStorCLI.merge_config_arguments(list(pargs))
         # very basic way to default into interactive if no options or commands are specified
         # only python 3.4+ argparse supports default subparsers
         if not pargs:
             pargs.append("interactive")
-        return self._parser.parse_args(pargs)
+        if '--batch' in pargs or any(x.startswith('--batch=') for x in pargs):
+            batch_args = self._parse_batch(pargs)
+            if batch_args:
+                return batch_args
+        args = self._parser.parse_args(pargs)
+        if args.batch is not None:
+            self._parser.error("argument --batch: not allowed with a command")
+        return args
+
+    def _parse_batch(self, pargs):
+        """
+        Parses a command line consisting of global options only, as argparse requires a subcommand.
+
+        :return: parsed arguments running cmd_batch, None if there are other arguments
+        """
+        global_parser = argparse.ArgumentParser(prog="linstor", add_help=False)
+        self.add_global_arguments(global_parser)
+        args, rest = global_parser.parse_known_args(pargs)
+        if rest:
+            return None
+        # global options are passed on to every line, config entries are already merged
+        args.global_pargs = ['--disable-config']
+        skip_value = False
+        for arg in pargs:
+            if skip_value:
+                skip_value = False
+            elif arg in ('--batch', '--jobs', '-j'):
+                skip_value = True
+            elif not arg.startswith(('--batch=', '--jobs=')):
+                args.global_pargs.append(arg)
+        args.func = self.cmd_batch
+        return args
+
+    @staticmethod
+    def _remove_global_option(pargs, option):
+        """
+        :return: pargs without the given option and its value
+        :rtype: list[str]
+        """
+        result = []
+        skip_value = False
+        for arg in pargs:
+            if skip_value:
+                skip_value = False
+            elif arg == option:
+                skip_value = True
+            elif not arg.startswith(option + '='):
+                result.append(arg)
+        return result
 
     @classmethod
     def _report_linstor_error(cls, le):
@@ -272,69 +496,54 @@ class LinStorCLI(object):
         for err in le.all_errors():
             sys.stderr.write(' ' * 2 + err.message + '\n')
 
+    def _report_argument_error(self, pargs, ae):
+        try:
+            self.parse(list(itertools.takewhile(lambda x: not x.startswith('-'), pargs)) + ['-h'])
+        except SystemExit:
+            pass
+        sys.stderr.write(ae.message + '\n')
+        return ExitCode.ARGPARSE_ERROR
+
     def parse_and_execute(self, pargs, is_interactive=False):
         rc = ExitCode.OK
         try:
             args = self.parse(pargs)
 
             local_only_cmds = [
+                self.cmd_batch,
                 self.cmd_list,
-                MigrateCommands.cmd_dmmigrate,
+                self.cmd_dmmigrate,
                 self._zsh_generator.cmd_completer,
-                self.cmd_help
+                self._bash_generator.cmd_completer,
+                self.cmd_help,
+                self.cmd_refresh
             ]
 
+            if args.clusters and args.func not in local_only_cmds:
+                from linstor_client import clusters
+                if getattr(args.func, '__name__', None) not in clusters.LIST_COMMANDS:
+                    raise utils.LinstorClientError(
+                        "Error: --clusters is only supported by list commands", ExitCode.ARGPARSE_ERROR)
+                return clusters.ClusterRunner(self.__class__, [x for x in args.clusters.split(',') if x]).run(
+                    self._remove_global_option(pargs, '--clusters'))
+
             # only connect if not already connected or a local only command was executed
             conn_errors = []
-            contrl_list = linstor.MultiLinstor.controller_uri_list(
-                os.environ.get(KEY_LS_CONTROLLERS, "") + ',' + args.controllers)
-            if self._linstorapi is None and args.func not in local_only_cmds:
-                username = None
-                password = None
-                if args.user:
-                    username = args.user
-                    if args.password:
-                        password = args.password
-                    else:
-                        password = getpass.getpass("Enter Linstor password:")
-
-                for contrl in contrl_list:
-                    try:
-                        self._linstorapi = linstor.Linstor(
-                            contrl,
-                            timeout=args.timeout,
-                            keep_alive=args.func == self.cmd_interactive
-                        )
-                        self._linstorapi.username = username
-                        self._linstorapi.password = password
-                        self._linstorapi.allow_insecure = args.allow_insecure_auth
-                        self._linstorapi.curl = args.curl
-                        self._controller_commands._linstor = self._linstorapi
-                        self._node_commands._linstor = self._linstorapi
-                        self._storage_pool_dfn_commands._linstor = self._linstorapi
-                        self._storage_pool_commands._linstor = self._linstorapi
-                        self._resource_dfn_commands._linstor = self._linstorapi
-                        self._resource_grp_commands._linstor = self._linstorapi
-                        self._volume_grp_commands._linstor = self._linstorapi
-                        self._volume_dfn_commands._linstor = self._linstorapi
-                        self._resource_commands._linstor = self._linstorapi
-                        self._resource_conn_commands._linstor = self._linstorapi
-                        self._volume_commands._linstor = self._linstorapi
-                        self._snapshot_commands._linstor = self._linstorapi
-                        self._drbd_proxy_commands._linstor = self._linstorapi
-                        self._misc_commands._linstor = self._linstorapi
-                        self._linstorapi.connect()
-                        break
-                    except linstor.LinstorNetworkError as le:
-                        conn_errors.append(le)
-
-            if len(conn_errors) == len(contrl_list):
+            if args.func not in local_only_cmds:
+                conn_errors = self._session.connect(
+                    args, keep_alive=args.func == self.cmd_interactive)
+                if args.no_cache and self._session.cache is not None:
+                    self._session.cache.clear()
+            else:
+                self._session.discard_warm_up()
+
+            if conn_errors:
                 for x in conn_errors:
                     self._report_linstor_error(x)
                 rc = ExitCode.CONNECTION_ERROR
             else:
-                if args.verbose and args.func != self.cmd_interactive:
-                    print("Connected to {h}".format(h=self._linstorapi.controller_host()))
+                if args.verbose and args.func != self.cmd_interactive and args.func not in local_only_cmds:
+                    print("Connected to {h}".format(h=self._session.api.controller_host()))
                 current_state = self._state_service.get_state()
                 allowed_states = vars(args).get('allowed_states', [DefaultState])
                 always_allowed = vars(args).get('always_allowed', False)
@@ -343,31 +552,56 @@ class LinStorCLI(object):
                 else:
                     sys.stderr.write("Error: Command not allowed in state '{state.name}'\n".format(state=current_state))
                     rc = ExitCode.ILLEGAL_STATE
-        except (ArgumentError, argparse.ArgumentTypeError, linstor.LinstorArgumentError) as ae:
-            try:
-                self.parse(list(itertools.takewhile(lambda x: not x.startswith('-'), pargs)) + ['-h'])
-            except SystemExit:
-                pass
-            sys.stderr.write(ae.message + '\n')
-            return ExitCode.ARGPARSE_ERROR
+        except (ArgumentError, argparse.ArgumentTypeError) as ae:
+            return self._report_argument_error(pargs, ae)
         except utils.LinstorClientError as lce:
             sys.stderr.write(lce.message + '\n')
             return lce.exit_code
-        except linstor.LinstorNetworkError as le:
-            self._report_linstor_error(le)
-            rc = ExitCode.CONNECTION_ERROR
-        except linstor.LinstorTimeoutError as le:
+        except Exception as le:
+            # python-linstor is only imported here, local commands do not need it otherwise
+            import linstor
+            if isinstance(le, linstor.LinstorArgumentError):
+                return self._report_argument_error(pargs, le)
+            if not isinstance(le, linstor.LinstorError):
+                raise
             self._report_linstor_error(le)
-            rc = ExitCode.CONNECTION_TIMEOUT
-        except linstor.LinstorError as le:
-            self._report_linstor_error(le)
-            rc = ExitCode.UNKNOWN_ERROR
+            if isinstance(le, linstor.LinstorNetworkError):
+                rc = ExitCode.CONNECTION_ERROR
+            elif isinstance(le, linstor.LinstorTimeoutError):
+                rc = ExitCode.CONNECTION_TIMEOUT
+            else:
+                rc = ExitCode.UNKNOWN_ERROR
         finally:
-            if self._linstorapi and not is_interactive:
-                self._linstorapi.disconnect()
+            if not is_interactive:
+                self._session.disconnect()  # also closes the pooled connections
 
         return rc
 
+    def disconnect(self):
+        """
+        Closes the controller connection, the next executed command connects again.
+        """
+        self._session.disconnect()
+
+    def join_warm_up(self, timeout=None):
+        """
+        Waits until the background connect of warm_up_args finished, see Session.join_warm_up().
+
+        :param float timeout: seconds to wait at most, None waits until it finished
+        :return: True if no warm-up is running anymore
+        :rtype: bool
+        """
+        return self._session.join_warm_up(timeout)
+
+    def share_cache(self, other):
+        """
+        Uses the response cache of another client, so modifications through either client invalidate it.
+
+        :param LinStorCLI other: client with an enabled cache
+        """
+        if other._session.cache is not None:
+            self._session.enable_cache(other._session.cache)
+
     @staticmethod
     def parser_cmds(parser):
         # AFAIK there is no other way to get the subcommands out of argparse.
@@ -382,11 +616,15 @@ class LinStorCLI(object):
                     cmds[parser_hash] = list()
                 cmds[parser_hash].append(choice)
 
+        return LinStorCLI.sort_cmds(cmds.values())
+
+    @staticmethod
+    def sort_cmds(cmd_groups):
         # sort subcommands and their aliases,
         # subcommand dictates sortorder, not its alias (assuming alias is
         # shorter than the subcommand itself)
         cmds_sorted = [sorted(cmd, key=len, reverse=True) for cmd in
-                       cmds.values()]
+                       cmd_groups]
 
         # "add" and "new" have the same length (as well as "delete" and
         # "remove), therefore prefer one of them to group commands for the
@@ -432,6 +670,9 @@ class LinStorCLI(object):
             if cmd not in all_cmds:
                 raise AssertionError("defined command not used in argparse: " + str(cmd))
 
+        if parser_cmds != self._all_commands:
+            raise AssertionError("lazy command registration does not match argparse: " + str(self._all_commands))
+
         return True
 
     @staticmethod
@@ -490,11 +731,9 @@ class LinStorCLI(object):
         # pp.pprint(self._all_commands)
 
         if tree:
-            subp = self._parser._actions[-1]
-            assert (isinstance(subp, argparse._SubParsersAction))
-            cmd_map = LinStorCLI.gen_cmd_tree(subp)
-            LinStorCLI.print_cmd_tree(
-                {k: v for k, v in cmd_map.items() if k[k.rindex(' '):].strip() in Commands.MainList}
+            from linstor_client import cmdindex
+            cmdindex.print_tree(
+                [x for x in self.command_index()['root']['commands'] if x['name'] in Commands.MainList]
             )
         else:
             for cmd in sorted(Commands.MainList):
@@ -512,6 +751,8 @@ class LinStorCLI(object):
         else:
             self.print_cmds()
             sys.stdout.write("\n")
+            if not args.no_cache:
+                self._session.enable_cache()
             self._state_service.enter_state(DefaultState(), verbose=args.verbose)
 
     def run_interactive(self, verbose):
@@ -556,6 +797,7 @@ class LinStorCLI(object):
             except KeyboardInterrupt:
                 pass
             except BaseException:
+                import traceback
                 traceback.print_exc(file=sys.stdout)
 
             if rc == ExitCode.CONNECTION_ERROR:
@@ -573,6 +815,7 @@ class LinStorCLI(object):
         abs_readline_hist_path = None
         try:
             import readline
+            import linstor_client.argcomplete as argcomplete
             # seems after importing readline it is not possible to output to sys.stderr
             completer = argcomplete.CompletionFinder(self._parser)
             readline.set_completer_delims("")
@@ -584,16 +827,24 @@ class LinStorCLI(object):
         except ImportError:
             pass
 
+        from linstor_client import table
+        table.defer_pages(True)  # tables shown with --page continue when Enter is pressed at the prompt
+
         last_rc = ExitCode.OK
         while self._state_service.has_state():
             try:
                 cmds = my_input('{state.prompt}{h} ==> '.format(
                     state=self._state_service.get_state(),
-                    h='(' + self._linstorapi.controller_host() + ')' if verbose else ""
+                    h='(' + self._session.api.controller_host() + ')' if verbose else ""
                 )).strip()
 
                 cmds = [cmd.strip() for cmd in cmds.split()]
-                if not cmds:
+                pager = table.pending_pager()
+                table.set_pending_pager(None)
+                if not cmds and pager is not None:
+                    pager.show_page(table.DEFERRED_PAGE_HINT)
+                    table.set_pending_pager(None if pager.done else pager)
+                elif not cmds:
                     self.print_cmds()
                 else:
                     last_rc = parsecatch(cmds)
@@ -606,6 +857,8 @@ class LinStorCLI(object):
             except KeyboardInterrupt:  # raised by ctrl-c
                 self._state_service.clear_state()
             sys.stdout.write("\n")
+        table.defer_pages(False)
+        table.set_pending_pager(None)
 
         if abs_readline_hist_path:
             try:
@@ -617,11 +870,50 @@ class LinStorCLI(object):
         return last_rc
 
     def cmd_help(self, args):
-        return self.parse_and_execute(args.command + ["-h"])
+        from linstor_client import cmdindex
+        node = cmdindex.find_command(self.command_index(), args.command)
+        if node is None or node['help'] is None or cmdindex.help_width() != cmdindex.HELP_WIDTH:
+            return self.parse_and_execute(args.command + ["-h"])
+        sys.stdout.write(node['help'])
+        sys.exit(ExitCode.OK)  # like argparse after printing help, interactive mode relies on it
+
+    def cmd_batch(self, args):
+        from linstor_client.batch import BatchRunner
+
+        if args.batch == '-':
+            lines = sys.stdin.readlines()
+        else:
+            try:
+                with open(args.batch) as batch_file:
+                    lines = batch_file.readlines()
+            except (IOError, OSError) as err:
+                raise utils.LinstorClientError("Unable to read batch file: " + str(err), ExitCode.ARGPARSE_ERROR)
+
+        keep_alive = self._keep_alive
+        self._keep_alive = True
+        if not args.no_cache:
+            self._session.enable_cache()
+        try:
+            runner = BatchRunner(self, args.global_pargs, args.jobs, args.machine_readable)
+            return runner.run(lines)
+        finally:
+            self._keep_alive = keep_alive
+            self._session.disable_cache()
+            self.disconnect()
+
+    @staticmethod
+    def cmd_dmmigrate(args):
+        from linstor_client.commands.migrate_cmds import MigrateCommands
+        return MigrateCommands.cmd_dmmigrate(args)
 
     def cmd_exit(self, _):
         sys.exit(ExitCode.OK)
 
+    def cmd_refresh(self, _):
+        if self._session.cache is not None:
+            self._session.cache.clear()
+        return ExitCode.OK
+
     def run(self):
         # TODO(rck): try/except
         rc = self.parse_and_execute(sys.argv[1:])
@@ -659,7 +951,7 @@ class LinStorCLI(object):
 
 def main():
     try:
-        LinStorCLI().run()
+        LinStorCLI(warm_up_args=sys.argv[1:]).run()
     except KeyboardInterrupt:
         sys.stderr.write("\nlinstor: Client exiting (received SIGINT)\n")
         return 1
@@ -76,13 +76,21 @@ class BuildManCommand(Command):
     """
 
     description = "Build manual pages"
-    user_options = []
+    user_options = [
+        ('jobs=', 'j', "number of processes rendering the command pages (default: number of CPUs)"),
+        ('force', 'f', "regenerate all command pages, not only the changed ones")
+    ]
+    boolean_options = ['force']
 
     def initialize_options(self):
         self.cwd = None
+        self.jobs = None
+        self.force = False
 
     def finalize_options(self):
         self.cwd = os.getcwd()
+        if self.jobs is not None:
+            self.jobs = int(self.jobs)
 
     def run(self):
         assert os.getcwd() == self.cwd, "Must be in package root: %s" % self.cwd
@@ -128,45 +136,10 @@ class BuildManCommand(Command):
                       "http://docbook.sourceforge.net/release/xsl/current/manpages/docbook.xsl "
                       "linstor.xml; gzip -f -9 linstor.8")
         # subcommands
-        import gzip
-        if "__enter__" not in dir(gzip.GzipFile):  # duck punch it in!
-            def __enter(self):
-                if self.fileobj is None:
-                    raise ValueError("I/O operation on closed GzipFile object")
-                return self
-
-            def __exit(self, *args):
-                self.close()
-
-            gzip.GzipFile.__enter__ = __enter
-            gzip.GzipFile.__exit__ = __exit
-
-        from linstor_client.utils import check_output
-
-        replace = ("linstor_client_main.py", "linstor")
-
-        for cmd in client._all_commands:
-            toplevel = cmd[0]
-            # aliases = cmd[1:]
-            # we could use the aliases to symlink them to the toplevel cmd
-            outfile = os.path.join('.', outdir, name + '-' + toplevel + '.' +
-                                   mansection + ".gz")
-            if os.path.isfile(outfile):
-                continue
-            sys.stdout.write("Generating %s ...\n" % (outfile))
-            mangen = ["help2man", "-n", toplevel, '-s', mansection,
-                      '--version-string=%s' % (get_version()), "-N",
-                      '"./linstor_client_main.py %s"' % (toplevel)]
-
-            toexec = " ".join(mangen)
-            manpage = check_output(toexec, shell=True)
-            manpage = manpage.replace(replace[0], replace[1])
-            manpage = manpage.replace(replace[0].upper(), replace[1].upper())
-            manpage = manpage.replace(toplevel.upper(), mansection)
-            manpage = manpage.replace("%s %s" % (replace[1], toplevel),
-                                      "%s_%s" % (replace[1], toplevel))
-            with gzip.open(outfile, 'wb') as f:
-                f.write(manpage)
+        from linstor_client.manpage import build_pages
+
+        for outfile in build_pages(client._parser, outdir, mansection, get_version(), self.jobs, self.force):
+            sys.stdout.write("Generated %s\n" % (outfile))
 
 
 def gen_data_files():
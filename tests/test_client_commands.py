@@ -1,12 +1,602 @@
+import gzip
+import os
+import shutil
+import socket
+import io
+import json
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 import unittest
 import linstor_client_main
+from linstor_client import cmdindex, daemon, manpage
+from linstor_client.commands import drbd_setup_cmds
 
 
 class TestClientCommands(unittest.TestCase):
+    def setUp(self):
+        self._saved_env = {}
+        self._temp_dirs = []
+        self._set_env('XDG_CACHE_HOME', self._temp_dir())  # the caches of the client start empty
+
+    def tearDown(self):
+        for key, value in self._saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        for path in self._temp_dirs:
+            shutil.rmtree(path)
+
+    def _set_env(self, key, value):
+        """
+        Sets an environment variable until the end of the test.
+        """
+        self._saved_env.setdefault(key, os.environ.get(key))
+        os.environ[key] = value
+
+    def _temp_dir(self):
+        """
+        :return: a new directory, removed at the end of the test
+        """
+        path = tempfile.mkdtemp()
+        self._temp_dirs.append(path)
+        return path
+
     def test_main_commands(self):
         cli = linstor_client_main.LinStorCLI()
         cli.check_parser_commands()
 
+    def test_lazy_command_groups(self):
+        cli = linstor_client_main.LinStorCLI()
+        cli.parse(['--disable-config', 'node', 'list'])
+        built = dict.keys(cli._parser._actions[-1].choices)
+        self.assertIn('node', built)
+        self.assertNotIn('resource', built)
+
+    def test_deferred_command_modules(self):
+        # needs a fresh interpreter, other tests already imported the command modules
+        script = (
+            "import sys, linstor_client_main\n"
+            "cli = linstor_client_main.LinStorCLI()\n"
+            "cli.parse(['--disable-config', 'node', 'list'])\n"
+            "print(' '.join(sorted(m for m in sys.modules if m.startswith('linstor_client.commands.'))))\n"
+        )
+        modules = subprocess.check_output([sys.executable, '-c', script]).decode().split()
+        self.assertIn('linstor_client.commands.node_cmds', modules)
+        self.assertNotIn('linstor_client.commands.rsc_cmds', modules)
+        self.assertNotIn('linstor_client.commands.migrate_cmds', modules)
+
+    def test_local_commands_skip_linstor(self):
+        # needs a fresh interpreter, python-linstor is only imported by commands talking to a controller
+        script = (
+            "import os, sys, linstor_client_main\n"
+            "stdout, sys.stdout = sys.stdout, open(os.devnull, 'w')\n"
+            "rc = linstor_client_main.LinStorCLI().parse_and_execute(['list-commands'])\n"
+            "sys.stdout = stdout\n"
+            "print(rc, 'linstor' in sys.modules)\n"
+        )
+        self.assertEqual(['0', 'False'], subprocess.check_output([sys.executable, '-c', script]).decode().split())
+
+    def test_drbd_option_specs_cache(self):
+        compiled = drbd_setup_cmds._load_option_specs()
+        self.assertTrue(os.path.exists(drbd_setup_cmds._option_specs_path()))
+        self.assertEqual(compiled, drbd_setup_cmds._load_option_specs())
+        self.assertIsNotNone(compiled['version'][-1])  # edits of the properties module rebuild the specs
+
+    def test_command_index(self):
+        cli = linstor_client_main.LinStorCLI()
+        index = cli.command_index()
+        self.assertTrue(os.path.exists(cmdindex._index_path()))
+        self.assertEqual(index, cmdindex.load_index(None, [os.path.abspath(linstor_client_main.__file__)]))
+
+        _, tree = self._capture_output(cli.print_cmds, True)
+        cmd_map = linstor_client_main.LinStorCLI.gen_cmd_tree(cli._parser._actions[-1])
+        _, expected = self._capture_output(
+            linstor_client_main.LinStorCLI.print_cmd_tree,
+            {k: v for k, v in cmd_map.items() if k.split()[-1] in linstor_client_main.Commands.MainList}
+        )
+        self.assertTrue(tree.endswith(expected))
+
+        rsc_list = cli._parser._actions[-1].choices['resource']._actions[-1].choices['list']
+        self.assertEqual(cmdindex.format_help(rsc_list), cmdindex.find_command(index, ['r', 'l'])['help'])
+        self.assertIsNone(cmdindex.find_command(index, ['r', 'bogus']))
+
+        finder = cmdindex.IndexCompletionFinder(cli)
+        self.assertEqual(
+            ['l', 'list', 'list-properties', 'lo', 'lost', 'lp'],
+            sorted(finder._index_completions(['node'], 'l'))
+        )
+        self.assertEqual(['v0', 'v1'], finder._index_completions(['--output-version'], ''))
+        self.assertEqual(['--pastable', '--page'], finder._index_completions(['node', 'list'], '--pa'))
+        self.assertIsNone(finder._index_completions(['node', 'list', '-g'], ''))  # closure completer
+
+    def test_bash_completer(self):
+        cli = linstor_client_main.LinStorCLI()
+        rc, output = self._capture_output(cli.parse_and_execute, ['--disable-config', 'gen-bash-completer'])
+        self.assertEqual(0, rc)
+        self.assertIn(b"_linstor_sub['linstor|n']='linstor node'\n", output)
+        self.assertIn(b"_linstor_optval['linstor resource list|-g']='=ResourceName Node Port Usage State'\n", output)
+        self.assertIn(b"_linstor_posval['linstor node describe|0']='@'\n", output)  # node names from python
+
+    def test_zsh_completer(self):
+        cli = linstor_client_main.LinStorCLI()
+        rc, output = self._capture_output(cli.parse_and_execute, ['--disable-config', 'gen-zsh-completer'])
+        self.assertEqual(0, rc)
+        self.assertIn(b"\n_linstor_cmd_node_list() {\n", output)
+        self.assertIn(b"'*--groupby[]:groupby:(Node NodeType Addresses State)'", output)
+        self.assertIn(b"'1:node_name:_linstor_objects node_completer node_name'", output)
+        self.assertIn(b"--al-updates[yes/no (Default\\: True)]:al_updates:(yes no)", output)
+
+    def test_manpages(self):
+        cli = linstor_client_main.LinStorCLI()
+        outdir = tempfile.mkdtemp()
+        try:
+            written = manpage.build_pages(cli._parser, outdir, '8', '1.0', jobs=1)
+            self.assertIn(os.path.join(outdir, 'linstor-node-list.8.gz'), written)
+            with gzip.open(os.path.join(outdir, 'linstor-node.8.gz')) as page_file:
+                page = page_file.read().decode('utf-8')
+            self.assertIn('\\fBlist\\fR (l)\n', page)
+            self.assertIn('See \\fBlinstor\\-node\\-list\\fR(8).\n', page)
+            self.assertEqual([], manpage.build_pages(cli._parser, outdir, '8', '1.0', jobs=1))  # nothing changed
+            self.assertEqual(len(written), len(manpage.build_pages(cli._parser, outdir, '8', '1.1', jobs=1)))
+        finally:
+            shutil.rmtree(outdir)
+
+    def test_controller_failover(self):
+        from benchmarks.controller import StandInController
+        from linstor_client.controllers import HealthCache
+        # accepts connections, but never answers
+        blackhole = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        blackhole.bind(('127.0.0.1', 0))
+        blackhole.listen(5)
+        dead = '127.0.0.1:{p}'.format(p=blackhole.getsockname()[1])
+        try:
+            with StandInController(count=2) as controller:
+                cli = linstor_client_main.LinStorCLI()
+                start = time.time()
+                rc, _ = self._capture_output(cli.parse_and_execute, [
+                    '--disable-config', '--controllers', dead + ',' + controller.uri, '-m', 'node', 'list'
+                ])
+                self.assertEqual(0, rc)
+                self.assertLess(time.time() - start, 2)
+
+                start = time.time()
+                rc, _ = self._capture_output(cli.parse_and_execute, [
+                    '--disable-config', '--controllers', dead, '--connect-timeout', '0.5', 'node', 'list'
+                ])
+                self.assertEqual(20, rc)  # ExitCode.CONNECTION_ERROR
+                self.assertLess(time.time() - start, 2)
+
+                health = HealthCache().load()
+                dead_uri = 'linstor://' + dead
+                self.assertEqual([controller.uri, dead_uri], health.rank([dead_uri, controller.uri]))
+                self.assertIsNotNone(health.rtt(controller.uri))
+                self.assertIsNone(health.rtt(dead_uri))
+
+                rc, output = self._capture_output(cli.parse_and_execute, [
+                    '--disable-config', '--controllers', dead + ',' + controller.uri, '--verbose', 'node', 'list'
+                ])
+                self.assertEqual(0, rc)
+                self.assertIn('  2. linstor://{d} (failed 1 time(s), demoted)\n'.format(d=dead), output.decode())
+
+                # completers connect the session of the client once, all command objects share it
+                cli = linstor_client_main.LinStorCLI()
+                node_cmds = cli.command_object('node_cmds', 'NodeCommands')
+                rsc_cmds = cli.command_object('rsc_cmds', 'ResourceCommands')
+                parsed_args = cli.parse_global_args(['--disable-config', '--controllers', dead + ',' + controller.uri])
+                node_names = node_cmds.node_completer('', parsed_args=parsed_args)
+                self.assertEqual({'node0000', 'node0001', 'node0002'}, set(node_names))
+                linstorapi = node_cmds.get_linstorapi()
+                self.assertIsNotNone(linstorapi)
+                rsc_cmds.resource_completer('', parsed_args=parsed_args)
+                self.assertIs(linstorapi, rsc_cmds.get_linstorapi())
+                cli.disconnect()
+        finally:
+            blackhole.close()
+
+    def test_clusters(self):
+        from benchmarks.controller import StandInController
+        home = self._temp_dir()
+        self._set_env('HOME', home)
+        os.makedirs(os.path.join(home, '.config', 'linstor'))
+        with StandInController(count=2, node_count=2) as ctrl_a, StandInController(count=3) as ctrl_b:
+            with open(os.path.join(home, '.config', 'linstor', 'linstor-client.conf'), 'w') as config:
+                config.write("[cluster.a]\ncontrollers={a}\n[cluster.b]\ncontrollers={b}\n".format(
+                    a=ctrl_a.uri, b=ctrl_b.uri))
+            self._set_env('LS_CONTROLLERS', ctrl_a.uri)  # not used by the profiles
+            cli = linstor_client_main.LinStorCLI()
+            rc, output = self._capture_output(
+                cli.parse_and_execute, ['--disable-config', '--clusters', 'a,b', '--no-color', 'node', 'list'])
+            self.assertEqual(0, rc)
+            lines = output.decode().splitlines()
+            self.assertEqual(['Cluster', 'Node'], lines[1].split()[1:5:2])
+            self.assertIn('| a       | node0000 |', output.decode())
+            self.assertIn('| b       | node0000 |', output.decode())
+            self.assertIn('| b       | node0002 |', output.decode())  # only cluster b has 3 nodes
+            self.assertNotIn('| a       | node0002 |', output.decode())
+
+            rc, output = self._capture_output(cli.parse_and_execute, [
+                '--disable-config', '--clusters', 'a,b', '-m', '--output-version', 'v1', 'node', 'list'
+            ])
+            self.assertEqual(0, rc)
+            nodes = json.loads(output.decode())[0]
+            self.assertEqual({'a', 'b'}, set(x['cluster'] for x in nodes))
+
+            rc, _ = self._capture_output(
+                cli.parse_and_execute, ['--disable-config', '--clusters', 'a,c', 'node', 'list'])
+            self.assertEqual(2, rc)  # no profile for c
+            rc, _ = self._capture_output(
+                cli.parse_and_execute, ['--disable-config', '--clusters', 'a', 'node', 'create', 'x', '1.2.3.4'])
+            self.assertEqual(2, rc)  # not a list command
+
+            class FailingCLI(linstor_client_main.LinStorCLI):
+                def parse_and_execute(self, pargs, is_interactive=False):
+                    if '--controllers' in pargs and ctrl_b.uri in pargs:
+                        raise RuntimeError("boom")
+                    return super(FailingCLI, self).parse_and_execute(pargs, is_interactive)
+
+            def run_failing():
+                from linstor_client import clusters
+                runner = clusters.ClusterRunner(FailingCLI, ['a', 'b'])
+                rc = runner.run(['--disable-config', '--no-color', 'node', 'list'])
+                return rc, sys.stderr.buffer.getvalue()
+
+            (rc, errors), output = self._capture_output(run_failing)
+            self.assertEqual(1, rc)  # ExitCode.UNKNOWN_ERROR
+            self.assertIn('| a       | node0001 |', output.decode())
+            self.assertIn('[b] Error: boom', errors.decode())
+
+    def test_parallel_delete(self):
+        from benchmarks.controller import StandInController
+        with StandInController(count=2, delay=0.3) as controller:
+            cli = linstor_client_main.LinStorCLI()
+            nodes = ['node{n:04d}'.format(n=n) for n in range(6)]
+            start = time.time()
+            rc, output = self._capture_output(cli.parse_and_execute, [
+                '--disable-config', '--controllers', controller.uri, '--no-color',
+                'resource', 'delete', '--parallel', '6'
+            ] + nodes + ['rsc0'])
+            self.assertEqual(0, rc)
+            self.assertLess(time.time() - start, 1.2)  # serialized would take 1.8s
+            output = output.decode()
+            positions = [output.index('/v1/resource-definitions/rsc0/resources/' + node + ' ') for node in nodes]
+            self.assertEqual(sorted(positions), positions)  # replies in the order of the nodes
+
+    def test_sharded_list(self):
+        from benchmarks.controller import StandInController
+        with StandInController(count=6, node_count=4) as controller:
+            base = ['--disable-config', '--controllers', controller.uri, '--no-color']
+            for cmd in (['resource', 'list'], ['volume', 'list'], ['storage-pool', 'list']):
+                rc, serial = self._capture_output(linstor_client_main.LinStorCLI().parse_and_execute, base + cmd)
+                self.assertEqual(0, rc)
+                del controller.requests[:]
+                rc, sharded = self._capture_output(
+                    linstor_client_main.LinStorCLI().parse_and_execute, base + cmd + ['--parallel', '3'])
+                self.assertEqual(0, rc)
+                self.assertEqual(sorted(serial.decode().splitlines()), sorted(sharded.decode().splitlines()))
+                self.assertEqual(4, len([x for x in controller.requests if x[1].startswith('/v1/view/')]))
+
+            rc, output = self._capture_output(
+                linstor_client_main.LinStorCLI().parse_and_execute,
+                base + ['-m', 'volume', 'list', '--parallel', '2', '--nodes', 'node0001', 'node0003'])
+            self.assertEqual(0, rc)
+            data = json.loads(output.decode())
+            self.assertEqual(1, len(data))
+            self.assertEqual({'node0001', 'node0003'}, set(x['node_name'] for x in data[0]['resources']))
+
+            rc, output = self._capture_output(
+                linstor_client_main.LinStorCLI().parse_and_execute,
+                base + ['-m', '--output-version', 'v1', 'resource', 'list', '--parallel', '2'])
+            self.assertEqual(0, rc)
+            data = json.loads(output.decode())
+            self.assertEqual(1, len(data))
+            self.assertEqual(['node0000', 'node0001', 'node0002', 'node0003'],
+                             sorted(set(x['node_name'] for x in data[0])))
+
+    def test_sharded_list_errors(self):
+        import argparse
+        from linstor.linstorapi import ApiCallResponse
+        from linstor_client.commands.commands import Commands
+
+        class Session(object):
+            api = None
+
+            def pool(self, size):
+                return [None] * size
+
+        class ListResponse(object):
+            data_v0 = data_v1 = [{'node_name': 'node0001'}]
+
+        def list_call(api, nodes):
+            if nodes == ['node0000']:
+                return [ApiCallResponse.from_json({'ret_code': -4611686018427387904, 'message': 'shard failed'})]
+            return [ListResponse()]
+
+        for machine_readable in [False, True]:
+            args = argparse.Namespace(
+                curl=False, parallel=2, nodes=['node0000', 'node0001'], machine_readable=machine_readable,
+                output_version='v1', warn_as_error=False, no_color=True)
+            rc, output = self._capture_output(
+                Commands(Session()).output_sharded_list, args, list_call, lambda output_args, lstmsgs: list(lstmsgs))
+            self.assertEqual(10, rc)  # ExitCode.API_ERROR
+            self.assertIn(b'shard failed', output)
+        data = json.loads(output.decode())
+        self.assertEqual([[{'node_name': 'node0001'}], 'shard failed'], [data[0], data[1]['message']])
+
+    def test_list_columns(self):
+        from benchmarks.controller import StandInController
+        with StandInController(count=3) as controller:
+            base = ['--disable-config', '--controllers', controller.uri, '--no-color']
+            rc, output = self._capture_output(
+                linstor_client_main.LinStorCLI().parse_and_execute, base + ['resource', 'list', '-c', 'Node', 'State'])
+            self.assertEqual(0, rc)
+            header = output.decode().splitlines()[1]
+            self.assertEqual(['ResourceName', 'Node', 'State'], header.replace('|', ' ').split())
+            self.assertNotIn(('GET', '/v1/resource-definitions'), controller.requests)  # only needed for Port
+
+            rc, output = self._capture_output(
+                linstor_client_main.LinStorCLI().parse_and_execute,
+                base + ['resource', 'list', '-c', 'Port', '--nodes', 'nosuch'])
+            self.assertEqual(0, rc)
+            self.assertEqual(['ResourceName', 'Port'], output.decode().splitlines()[1].replace('|', ' ').split())
+
+            del controller.requests[:]
+            rc, output = self._capture_output(
+                linstor_client_main.LinStorCLI().parse_and_execute,
+                base + ['resource-group', 'list', '--columns', 'ResourceGroup'])
+            self.assertEqual(0, rc)
+            self.assertIn(b'DfltRscGrp', output)
+            self.assertFalse([x for x in controller.requests if x[1].endswith('/volume-groups')])
+
+    def test_wait(self):
+        from benchmarks.controller import StandInController
+        with StandInController(count=3) as controller:
+            cli = linstor_client_main.LinStorCLI()
+            base = ['--disable-config', '--controllers', controller.uri, 'wait']
+            rc, _ = self._capture_output(cli.parse_and_execute, base + ['resource', 'rsc000000', 'rsc000001'])
+            self.assertEqual(0, rc)
+            rc, _ = self._capture_output(cli.parse_and_execute, base + ['node', 'node0000', 'node0002'])
+            self.assertEqual(0, rc)
+            rc, _ = self._capture_output(cli.parse_and_execute, base + ['snapshot', 'rsc000001', 'snap000001'])
+            self.assertEqual(0, rc)
+            rc, _ = self._capture_output(cli.parse_and_execute, base + ['rdd', 'bogus'])
+            self.assertEqual(0, rc)
+
+            start = time.time()
+            rc, output = self._capture_output(
+                cli.parse_and_execute, ['-V'] + base + ['r', '--deadline', '0.6', '--interval', '0.2', 'rsc000002'])
+            self.assertEqual(5, rc)  # ExitCode.ILLEGAL_STATE, one volume stays Inconsistent
+            self.assertLess(time.time() - start, 1.5)
+            self.assertEqual(3, output.decode().count('waiting for resource rsc000002 volume 0 on node0001'))
+
+    def test_wait_batch(self):
+        from benchmarks.controller import StandInController
+        with StandInController(count=3) as controller:
+            fd, batch_path = tempfile.mkstemp()
+            with os.fdopen(fd, 'w') as batch_file:
+                batch_file.write("volume list\nwait resource --deadline 0.6 --interval 0.2 rsc000002\n")
+            try:
+                cli = linstor_client_main.LinStorCLI()
+                rc, _ = self._capture_output(
+                    cli.parse_and_execute, ['--disable-config', '--controllers', controller.uri, '--batch', batch_path])
+                self.assertEqual(5, rc)  # the wait timed out
+                # the polls are not answered by the response cache of the batch
+                self.assertEqual(4, controller.requests.count(('GET', '/v1/view/resources')))
+            finally:
+                os.remove(batch_path)
+
+    def test_response_cache(self):
+        from benchmarks.controller import StandInController
+        with StandInController(count=3) as controller:
+            fd, batch_path = tempfile.mkstemp()
+            with os.fdopen(fd, 'w') as batch_file:
+                batch_file.write(
+                    "resource list\nresource list\nvolume list\n"
+                    "resource create node0000 rsc000001\nresource list\n"
+                    "refresh\nresource list\n--no-cache resource list\n"
+                )
+            try:
+                # volume list fetches the resources as well, under its own cache entry
+                for jobs, no_cache, expected in [('1', [], 5), ('1', ['--no-cache'], 6), ('2', [], None)]:
+                    del controller.requests[:]
+                    cli = linstor_client_main.LinStorCLI()
+                    rc, _ = self._capture_output(cli.parse_and_execute, [
+                        '--disable-config', '--controllers', controller.uri, '--batch', batch_path, '--jobs', jobs
+                    ] + no_cache)
+                    self.assertEqual(0, rc)
+                    rsc_lists = controller.requests.count(('GET', '/v1/view/resources'))
+                    if expected is not None:
+                        self.assertEqual(expected, rsc_lists)
+                    else:
+                        self.assertLessEqual(rsc_lists, 6)
+            finally:
+                os.remove(batch_path)
+
+    def test_connection_warm_up(self):
+        from benchmarks.controller import StandInController
+        with StandInController(count=2) as controller:
+            pargs = ['--disable-config', '--controllers', controller.uri, 'node', 'list']
+            cli = linstor_client_main.LinStorCLI(warm_up_args=pargs)
+            rc, output = self._capture_output(cli.parse_and_execute, pargs)
+            self.assertEqual(0, rc)
+            self.assertIn(b'node0000', output)
+            # the connection of the warm-up was adopted: one version call by its connect, one by node list
+            self.assertEqual(2, controller.requests.count(('GET', '/v1/controller/version')))
+
+            # other options than the ones warmed up for get a new connection
+            del controller.requests[:]
+            cli = linstor_client_main.LinStorCLI(warm_up_args=pargs)
+            rc, _ = self._capture_output(cli.parse_and_execute, ['--timeout', '30'] + pargs)
+            self.assertEqual(0, rc)
+            self.assertEqual(4, controller.requests.count(('GET', '/v1/controller/version')))
+
+            cli = linstor_client_main.LinStorCLI(warm_up_args=['--controllers', controller.uri, 'list-commands'])
+            rc, _ = self._capture_output(cli.parse_and_execute, ['--disable-config', 'list-commands'])
+            self.assertEqual(0, rc)
+            self.assertFalse(cli._session.connected)
+            self.assertTrue(cli.join_warm_up(5))  # the discarded warm-up still writes the cache directory
+
+    def test_tls_cache(self):
+        from linstor_client.tlscache import TlsCache, connect_resumed
+
+        class Api(object):
+            def __init__(self, port):
+                self.is_secure_connection = port is not None
+                self._rest_conn = type('Conn', (object,), {'port': port})
+
+        cache_home = self._temp_dir()
+        path = os.path.join(cache_home, 'linstor', 'tls')
+        cache = TlsCache(path)
+        cache.record('linstor://ctrl-a', Api(3371))
+        cache.record('linstor://[fe80::1]:3370', Api(3371))
+        cache.record('linstor+ssl://ctrl-b', Api(3371))  # configured as HTTPS already
+        cache.save()
+        self.assertEqual(0o600, os.stat(path).st_mode & 0o777)
+
+        cache = TlsCache(path).load()
+        self.assertEqual('linstor+ssl://ctrl-a:3371', cache.resolve('linstor://ctrl-a'))
+        self.assertEqual('linstor+ssl://[fe80::1]:3371', cache.resolve('linstor://[fe80::1]:3370'))
+        self.assertEqual('linstor+ssl://ctrl-b', cache.resolve('linstor+ssl://ctrl-b'))
+        cache.record('linstor://ctrl-a', Api(None))  # HTTPS got disabled
+        self.assertEqual('linstor://ctrl-a', cache.resolve('linstor://ctrl-a'))
+
+        # plain HTTP connections have no TLS session to resume, the caller connects instead
+        self.assertFalse(connect_resumed(None, Api(None), 5))
+        # neither without the SSL context of the connection
+        template = Api(3371)
+        template._rest_conn.sock = object()
+        self.assertFalse(connect_resumed(None, template, 5))
+
+    def test_batch(self):
+        fd, batch_path = tempfile.mkstemp()
+        with os.fdopen(fd, 'w') as batch_file:
+            batch_file.write("# comment\nlinstor node list\n\nnode bogus\nresource-definition create 'r 1'\n")
+        cli = linstor_client_main.LinStorCLI()
+        try:
+            for jobs in ['1', '2']:
+                rc, output = self._capture_output(
+                    cli.parse_and_execute, ['--disable-config', '--curl', '--batch', batch_path, '--jobs', jobs]
+                )
+                self.assertEqual(2, rc)  # first failed line
+                output = output.decode()
+                self.assertLess(output.index('[2] exit code 0'), output.index('[4] node bogus'))
+                self.assertIn('[4] exit code 2', output)
+                self.assertIn('[5] exit code 0', output)
+        finally:
+            os.remove(batch_path)
+
+    @staticmethod
+    def _capture_output(func, *args):
+        class Stream(object):
+            def __init__(self):
+                self.buffer = io.BytesIO()
+
+            def write(self, data):
+                self.buffer.write(data if isinstance(data, bytes) else data.encode('utf-8'))
+
+            def flush(self):
+                pass
+
+            def isatty(self):
+                return False
+
+        old_streams = sys.stdout, sys.stderr
+        sys.stdout, sys.stderr = Stream(), Stream()
+        try:
+            return func(*args), sys.stdout.buffer.getvalue()
+        finally:
+            sys.stdout, sys.stderr = old_streams
+
+    def test_client_daemon(self):
+        sock_dir = tempfile.mkdtemp()
+        sock_path = os.path.join(sock_dir, 'client.sock')
+        self.assertIsNone(daemon.forward(['list-commands'], sock_path))  # no daemon running
+
+        client_daemon = daemon.ClientDaemon(sock_path, idle_timeout=0)
+        client_daemon.setup()
+        server = threading.Thread(target=client_daemon.serve_forever)
+        server.start()
+        try:
+            for _ in range(100):
+                if os.path.exists(sock_path):
+                    break
+                server.join(0.05)
+            rc, output = self._capture_output(daemon.forward, ['--disable-config', 'list-commands'], sock_path)
+            self.assertEqual(0, rc)
+            self.assertIn(b'- resource-definition (rd)', output)
+            rc, _ = self._capture_output(daemon.forward, ['--disable-config', 'node', 'bogus'], sock_path)
+            self.assertEqual(2, rc)
+            # reading from stdin hands the command back to the front-end
+            rc, _ = self._capture_output(daemon.forward, ['--disable-config', '--curl', 'interactive'], sock_path)
+            self.assertIsNone(rc)
+
+            # a missing working directory is reported, the daemon keeps serving
+            sock = daemon._request(sock_path, {
+                'type': 'run', 'argv': ['list-commands'], 'env': {}, 'cwd': os.path.join(sock_dir, 'gone'),
+                'isatty': {'stdin': False, 'stdout': False, 'stderr': False}
+            })
+            frames = [daemon._recv_frame(sock), daemon._recv_frame(sock)]
+            sock.close()
+            self.assertEqual([daemon.FRAME_STDERR, daemon.FRAME_EXIT], [x[0] for x in frames])
+            self.assertEqual(b'1', frames[1][1])
+            rc, _ = self._capture_output(daemon.forward, ['--disable-config', 'list-commands'], sock_path)
+            self.assertEqual(0, rc)
+
+            # while a command runs, other ones are handed back to their front-end instead of waiting
+            from benchmarks.controller import StandInController
+
+            def run_request(argv):
+                return daemon._request(sock_path, {
+                    'type': 'run', 'argv': ['--disable-config'] + argv, 'env': {}, 'cwd': os.getcwd(),
+                    'isatty': {'stdin': False, 'stdout': False, 'stderr': False}
+                })
+
+            with StandInController(count=3, delay=0.5) as controller:
+                slow = run_request(['--controllers', controller.uri, 'node', 'list'])
+                self.assertEqual(daemon.FRAME_ACCEPTED, daemon._recv_frame(slow)[0])
+                other = run_request(['list-commands'])  # not forward(), the daemon shares sys.stdout of the test
+                self.assertEqual((daemon.FRAME_FALLBACK, b''), daemon._recv_frame(other))
+                other.close()
+                frames = []
+                while not frames or frames[-1][0] != daemon.FRAME_EXIT:
+                    frames.append(daemon._recv_frame(slow))
+                slow.close()
+                self.assertEqual(b'0', frames[-1][1])
+                self.assertIn(b'node0000', b''.join(x[1] for x in frames if x[0] == daemon.FRAME_STDOUT))
+        finally:
+            daemon._control('stop', sock_path)
+            server.join()
+            shutil.rmtree(sock_dir)
+
+    def test_client_daemon_lost(self):
+        sock_dir = tempfile.mkdtemp()
+        sock_path = os.path.join(sock_dir, 'client.sock')
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(sock_path)
+        listener.listen(2)
+
+        def serve(accept):
+            conn, _ = listener.accept()
+            daemon._recv_message(conn)
+            if accept:
+                daemon._send_frame(conn, daemon.FRAME_ACCEPTED)
+            conn.close()
+
+        try:
+            for accept, expected_rc in ((False, None), (True, 1)):
+                server = threading.Thread(target=serve, args=(accept,))
+                server.start()
+                # only a command the daemon never accepted may run in-process
+                rc, _ = self._capture_output(daemon.forward, ['--disable-config', 'list-commands'], sock_path)
+                server.join()
+                self.assertEqual(expected_rc, rc)
+        finally:
+            listener.close()
+            shutil.rmtree(sock_dir)
+
 
 if __name__ == '__main__':
     unittest.main()
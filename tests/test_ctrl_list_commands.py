@@ -138,14 +138,15 @@ class TestCompleters(LinstorTestCaseWithData):
         nodes = self.get_list('nodes', jout)
 
         linstor_cli = linstor_client_main.LinStorCLI()
-        linstor_cli._node_commands.get_linstorapi(parsed_args=_FakeArgs(self.host() + ':' + str(self.port())))
-        cmpl_nodes = linstor_cli._node_commands.node_completer("")
+        node_cmds = linstor_cli.command_object('node_cmds', 'NodeCommands')
+        node_cmds.get_linstorapi(parsed_args=_FakeArgs(self.host() + ':' + str(self.port())))
+        cmpl_nodes = node_cmds.node_completer("")
         self.assertEqual(len(nodes), len(cmpl_nodes))
 
-        cmpl_nodes = linstor_cli._node_commands.node_completer("fakem")
+        cmpl_nodes = node_cmds.node_completer("fakem")
         self.assertEqual(1, len(cmpl_nodes))
 
-        cmpl_nodes = linstor_cli._node_commands.node_completer("fakeh")
+        cmpl_nodes = node_cmds.node_completer("fakeh")
         self.assertEqual(3, len(cmpl_nodes))
 
     def test_netifs_completer(self):
@@ -154,13 +155,14 @@ class TestCompleters(LinstorTestCaseWithData):
         netifs = [x for n in nodes if n['name'] == 'fakehost1' for x in n['net_interfaces']]
 
         linstor_cli = linstor_client_main.LinStorCLI()
+        node_cmds = linstor_cli.command_object('node_cmds', 'NodeCommands')
         args = _FakeArgs(self.host() + ':' + str(self.port()))
         args.node_name = 'fakehost1'
-        linstor_cli._node_commands.get_linstorapi(parsed_args=args)
-        cmpl_netifs = linstor_cli._node_commands.netif_completer("", parsed_args=args)
+        node_cmds.get_linstorapi(parsed_args=args)
+        cmpl_netifs = node_cmds.netif_completer("", parsed_args=args)
         self.assertEqual(len(netifs), len(cmpl_netifs))
 
-        cmpl_netifs = linstor_cli._node_commands.netif_completer("def", parsed_args=args)
+        cmpl_netifs = node_cmds.netif_completer("def", parsed_args=args)
         self.assertEqual(1, len(cmpl_netifs))
 
     def test_storpool_dfn_completer(self):
@@ -168,11 +170,12 @@ class TestCompleters(LinstorTestCaseWithData):
         stor_pools = self.get_list('stor_pool_dfns', jout)
 
         linstor_cli = linstor_client_main.LinStorCLI()
-        linstor_cli._node_commands.get_linstorapi(parsed_args=_FakeArgs(self.host() + ':' + str(self.port())))
-        cmpl_stor_pools = linstor_cli._node_commands.storage_pool_dfn_completer("")
+        node_cmds = linstor_cli.command_object('node_cmds', 'NodeCommands')
+        node_cmds.get_linstorapi(parsed_args=_FakeArgs(self.host() + ':' + str(self.port())))
+        cmpl_stor_pools = node_cmds.storage_pool_dfn_completer("")
         self.assertEqual(len(stor_pools), len(cmpl_stor_pools))
 
-        cmpl_stor_pools = linstor_cli._node_commands.storage_pool_dfn_completer("zfs")
+        cmpl_stor_pools = node_cmds.storage_pool_dfn_completer("zfs")
         self.assertEqual(1, len(cmpl_stor_pools))
 
     def test_storpool_completer(self):
@@ -180,11 +183,12 @@ class TestCompleters(LinstorTestCaseWithData):
         stor_pools = self.get_list('stor_pool_dfns', jout)
 
         linstor_cli = linstor_client_main.LinStorCLI()
-        linstor_cli._node_commands.get_linstorapi(parsed_args=_FakeArgs(self.host() + ':' + str(self.port())))
-        cmpl_stor_pools = linstor_cli._node_commands.storage_pool_completer("")
+        node_cmds = linstor_cli.command_object('node_cmds', 'NodeCommands')
+        node_cmds.get_linstorapi(parsed_args=_FakeArgs(self.host() + ':' + str(self.port())))
+        cmpl_stor_pools = node_cmds.storage_pool_completer("")
         self.assertEqual(len(stor_pools), len(cmpl_stor_pools))
 
-        cmpl_stor_pools = linstor_cli._node_commands.storage_pool_completer("zfs")
+        cmpl_stor_pools = node_cmds.storage_pool_completer("zfs")
         self.assertEqual(1, len(cmpl_stor_pools))
 
     def test_resource_dfn_completer(self):
@@ -192,11 +196,12 @@ class TestCompleters(LinstorTestCaseWithData):
         resources = self.get_list('rsc_dfns', jout)
 
         linstor_cli = linstor_client_main.LinStorCLI()
-        linstor_cli._node_commands.get_linstorapi(parsed_args=_FakeArgs(self.host() + ':' + str(self.port())))
-        cmpl_resources = linstor_cli._node_commands.resource_dfn_completer("")
+        node_cmds = linstor_cli.command_object('node_cmds', 'NodeCommands')
+        node_cmds.get_linstorapi(parsed_args=_FakeArgs(self.host() + ':' + str(self.port())))
+        cmpl_resources = node_cmds.resource_dfn_completer("")
         self.assertEqual(len(resources), len(cmpl_resources))
 
-        cmpl_resources = linstor_cli._node_commands.resource_dfn_completer("rsc-")
+        cmpl_resources = node_cmds.resource_dfn_completer("rsc-")
         self.assertEqual(1, len(cmpl_resources))
 
     def test_resource_completer(self):
@@ -204,8 +209,9 @@ class TestCompleters(LinstorTestCaseWithData):
         resources = self.get_list('rsc_dfns', jout)
 
         linstor_cli = linstor_client_main.LinStorCLI()
-        linstor_cli._node_commands.get_linstorapi(parsed_args=_FakeArgs(self.host() + ':' + str(self.port())))
-        cmpl_resources = linstor_cli._node_commands.resource_completer("")
+        node_cmds = linstor_cli.command_object('node_cmds', 'NodeCommands')
+        node_cmds.get_linstorapi(parsed_args=_FakeArgs(self.host() + ':' + str(self.port())))
+        cmpl_resources = node_cmds.resource_completer("")
         self.assertEqual(len(resources), len(cmpl_resources))
 """
 
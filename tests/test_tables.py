@@ -1,3 +1,4 @@
+import os
 import unittest
 from linstor_client import TableHeader, Table
 from linstor_client.consts import Color
@@ -46,7 +47,7 @@ class TestUtils(unittest.TestCase):
             "in a house with no mouse.",
             "PlaceCount: 2\nDisklessOnRemaining: True\nStoragePool: DfltStorPool\nLayerList: storage,drbd"]
         )
-        table_out = tbl.show()
+        table_out = tbl.show(keep=True)
 
         self.assertEqual(
             """+---------------------------------------------------------------------------------------+
@@ -80,7 +81,7 @@ class TestUtils(unittest.TestCase):
             "bla"
         ])
 
-        table_out = tbl.show()
+        table_out = tbl.show(keep=True)
 
         self.assertEqual(
             """+------------------------------------------------------------------+
@@ -94,3 +95,97 @@ class TestUtils(unittest.TestCase):
 """,
             table_out
         )
+
+    def test_groupby_view(self):
+        tbl = Table()
+        tbl.add_header(TableHeader("Node"))
+        tbl.add_header(TableHeader("Resource"))
+        tbl.add_header(TableHeader("MinorNr"))
+        tbl.add_header(TableHeader("State", alignment_text=TableHeader.ALIGN_RIGHT))
+        tbl.add_row(["node2", "rsc10", "1010", "UpToDate"])
+        tbl.add_row(["node1", "rsc2", "1002", "Diskless"])
+        tbl.add_row(["node1", "rsc10", "1010", "UpToDate"])
+        tbl.set_groupby(["Node"])
+        tbl.set_show_separators(True)
+        tbl.set_view(["Resource", "State"])
+        table_out = tbl.show(keep=True)
+
+        self.assertEqual(
+            """+-----------------------------+
+| Node  | Resource |    State |
+|=============================|
+| node1 | rsc2     | Diskless |
+| node1 | rsc10    | UpToDate |
+|-----------------------------|
+| node2 | rsc10    | UpToDate |
++-----------------------------+
+""",
+            table_out
+        )
+
+    def test_sortby(self):
+        tbl = Table()
+        tbl.add_header(TableHeader("Node"))
+        tbl.add_header(TableHeader("Resource"))
+        tbl.add_header(TableHeader("MinorNr"))
+        tbl.set_groupby(["Node"])
+        tbl.set_sortby([("MinorNr", True), ("Resource", False)])
+        tbl.add_row(["node2", "rsc10", "1010"])
+        tbl.add_row(["node1", "rsc2", "1002"])
+        tbl.add_row(["node10", "rsc10", "999"])
+        tbl.add_row(["node1", "rsc10", "1010"])
+        tbl.add_row(["node1", "rsc9", "1002"])
+        table_out = tbl.show(keep=True)
+
+        self.assertEqual(
+            """+-----------------------------+
+| Node   | Resource | MinorNr |
+|=============================|
+| node1  | rsc10    | 1010    |
+| node1  | rsc2     | 1002    |
+| node1  | rsc9     | 1002    |
+| node2  | rsc10    | 1010    |
+| node10 | rsc10    | 999     |
++-----------------------------+
+""",
+            table_out
+        )
+
+    def test_window_pages(self):
+        from linstor_client import table
+        tbl = Table()
+        tbl.add_header(TableHeader("Resource"))
+        for nr in range(6):
+            tbl.add_row(["rsc" + str(nr)])
+        tbl.set_window(1, 4)
+        self.assertEqual(
+            """+----------+
+| Resource |
+|==========|
+| rsc1     |
+| rsc2     |
+| rsc3     |
+| rsc4     |
++----------+
+""",
+            tbl.show(keep=True)
+        )
+        self.assertIsNone(tbl.show())  # printed without keeping it
+
+        old_env = os.environ.copy()
+        os.environ.update({'COLUMNS': '80', 'LINES': str(table.PAGE_OVERHEAD + 3)})
+        table.defer_pages(True)
+        try:
+            tbl.set_window(1, None, page=True)
+            self.assertIn("rsc3 ", tbl.show(keep=True))
+            pager = table.pending_pager()
+            self.assertFalse(pager.done)
+            page = pager.show_page(table.DEFERRED_PAGE_HINT, keep=True)
+            self.assertTrue(page.endswith("| rsc5     |\n+----------+\n"))
+            self.assertNotIn("rsc3", page)
+            self.assertTrue(pager.done)
+        finally:
+            table.defer_pages(False)
+            table.set_pending_pager(None)
+            os.environ.clear()
+            os.environ.update(old_env)